@@ -10,27 +10,55 @@
 #     0.1.0: 2025/03/07
 #          - Scatter with distane of X, Y, Z
 #          - Scatter with rotation by X, Y, Z-axis
+#     0.2.0: 2026/10/18
+#          - Bulk transform engine with NumPy (per-object fallback)
+#          - Random seed
+#          - Counter-based random numbers with per-object streams
+#          - Minimum distance scattering with a spatial hash grid
+#          - Instance mode (linked data objects or collection instances)
+#          - Surface placement on a target mesh
+#          - Base transform snapshot (no accumulation, reset to base)
+#          - Density map (image or vertex group) by rejection sampling
+#          - Time-sliced modal scattering with progress and cancel
+#          - Settings in one property group of the scene, presets
+#          - Animated scattering keyed to F-curves in bulk, with smoothing
+#          - Overlap relaxation of the bounding spheres on a grid
+#          - World space scattering with batched matrices (parents, rotation modes)
+#          - Binary layouts (.npz) export and memory-mapped import
+#          - Curve placement with a cached arc-length table
 ##############################################################
 import bpy
 from bpy.props import (
-    FloatProperty,
+    IntProperty,
     FloatProperty,
     FloatVectorProperty,
     EnumProperty,
     BoolProperty,
+    StringProperty,
+    PointerProperty,
 )
 
 from bpy.types import Operator
+from bpy.app.handlers import persistent
 from bpy_extras.object_utils import AddObjectHelper, object_data_add
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+from bl_operators.presets import AddPresetBase
 from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+import hashlib, math, struct, time, zipfile
 
-import random, math
+# NumPy is bundled with Blender, the per-object path is used without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Addon information
 bl_info = {
     "name": "Objects Scatter",
     "author": "Shunsuke Ohira",
-    "version": (0, 1, 0),
+    "version": (0, 2, 0),
     "blender": (4, 3, 2),
     "location": "3Dビューポート > サイドバー > ツール",
     "description": "Objects Random scattering",
@@ -41,14 +69,874 @@ bl_info = {
     "category": "Object",
 }
 
-# Addon class
-class OBJSCATTER_OT_ObjectsRandomScatter(bpy.types.Operator):
-    bl_idname = "objects.random_scattering"
-    bl_label = "Scattering"
-    bl_description = "Objects Random Scattering"
-    bl_options = {"REGISTER", "UNDO"}
-    
-    # Class properties
+# Counter-based random numbers
+# A value only depends on (seed, stream key, axis, counter), so any subset of
+# objects can be scattered alone, in any order, and gets the same values.
+# random_value() and random_values() give bit-identical results.
+MASK64 = 0xFFFFFFFFFFFFFFFF
+GOLDEN64 = 0x9E3779B97F4A7C15
+MIX64_1 = 0xBF58476D1CE4E5B9
+MIX64_2 = 0x94D049BB133111EB
+
+# SplitMix64 finalizer
+def mix64(x):
+    x = ((x ^ (x >> 30)) * MIX64_1) & MASK64
+    x = ((x ^ (x >> 27)) * MIX64_2) & MASK64
+    return x ^ (x >> 31)
+
+# Random value in [0, 1) for one object and axis
+def random_value(seed, key, axis, counter = 0):
+    x = mix64(((seed & MASK64) + GOLDEN64) & MASK64)
+    x = mix64(x ^ key)
+    x = mix64((x + ((axis << 32) + counter + 1) * GOLDEN64) & MASK64)
+    return (x >> 11) * (1.0 / 9007199254740992.0)
+
+# SplitMix64 finalizer on an uint64 array (wraps around like "& MASK64")
+def mix64_array(x):
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(MIX64_1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(MIX64_2)
+    return x ^ (x >> np.uint64(31))
+
+# Random values in [0, 1) for an uint64 array of stream keys
+def random_values(seed, keys, axis, counter = 0):
+    x = np.full(1, ((seed & MASK64) + GOLDEN64) & MASK64, dtype=np.uint64)
+    x = mix64_array(mix64_array(x) ^ keys)
+    x = mix64_array(x + np.uint64((((axis << 32) + counter + 1) * GOLDEN64) & MASK64))
+    return (x >> np.uint64(11)).astype(np.float64) * (1.0 / 9007199254740992.0)
+
+# Stream key of an object name
+def name_key(name):
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size = 8).digest(), "little")
+
+# Stream keys of objects, by object name or by index in the list
+def stream_keys(objs, key_type):
+    if key_type == "INDEX":
+        return list(range(len(objs)))
+    return [name_key(obj.name) for obj in objs]
+
+# Scatter ranges: (minus property, plus property, is rotation)
+# The order is the order of the random values drawn for each object.
+SCATTER_AXES = (
+    ("scatter_xm",  "scatter_xp",  False),
+    ("scatter_ym",  "scatter_yp",  False),
+    ("scatter_zm",  "scatter_zp",  False),
+    ("scatter_rxm", "scatter_rxp", True),
+    ("scatter_rym", "scatter_ryp", True),
+    ("scatter_rzm", "scatter_rzp", True),
+)
+
+# Location and rotation of many objects read and written in bulk
+class BulkTransforms:
+    # Use bpy.data.objects.foreach_get/set when the objects are at least
+    # this fraction of all objects, otherwise read/write object by object.
+    collection_ratio = 0.125
+
+    # indices: indices of the objects in bpy.data.objects when they are known
+    def __init__(self, objs, indices = None):
+        self.objs = list(objs)
+        all_objs = bpy.data.objects
+        self.use_collection = len(self.objs) >= len(all_objs) * self.collection_ratio
+        if self.use_collection:
+            if indices is None:
+                lookup = {obj.as_pointer(): idx for idx, obj in enumerate(all_objs)}
+                indices = np.fromiter((lookup[obj.as_pointer()] for obj in self.objs), dtype=np.int64, count=len(self.objs))
+            self.indices = np.asarray(indices, dtype=np.int64)
+            self.all_location = np.empty(len(all_objs) * 3, dtype=np.float32)
+            self.all_rotation = np.empty(len(all_objs) * 3, dtype=np.float32)
+            all_objs.foreach_get("location", self.all_location)
+            all_objs.foreach_get("rotation_euler", self.all_rotation)
+            self.all_location.shape = (-1, 3)
+            self.all_rotation.shape = (-1, 3)
+            self.location = self.all_location[self.indices]
+            self.rotation = self.all_rotation[self.indices]
+        else:
+            self.location = np.array([obj.location[:] for obj in self.objs], dtype=np.float32).reshape(-1, 3)
+            self.rotation = np.array([obj.rotation_euler[:] for obj in self.objs], dtype=np.float32).reshape(-1, 3)
+
+    # Write locations and rotations, (N, 3) arrays in the order of the objects
+    def write(self, location, rotation):
+        if self.use_collection:
+            self.all_location[self.indices] = location
+            self.all_rotation[self.indices] = rotation
+            all_objs = bpy.data.objects
+            all_objs.foreach_set("location", self.all_location.ravel())
+            all_objs.foreach_set("rotation_euler", self.all_rotation.ravel())
+            # foreach_set does not tag the depsgraph
+            for obj in self.objs:
+                obj.update_tag(refresh = {"OBJECT"})
+        else:
+            for obj, loc, rot in zip(self.objs, location.tolist(), rotation.tolist()):
+                obj.location = loc
+                obj.rotation_euler = rot
+
+        self.location = np.asarray(location, dtype=np.float32)
+        self.rotation = np.asarray(rotation, dtype=np.float32)
+
+# Bulk transforms with the world and basis matrices, and the rotations of all rotation modes
+class WorldTransforms(BulkTransforms):
+    def __init__(self, objs):
+        super().__init__(objs)
+        self.buffers = {}
+        self.matrix_world = self.read_matrix("matrix_world")
+        self.matrix_basis = self.read_matrix("matrix_basis")
+        self.scale = self.read("scale", 3)
+        self.quaternion = self.read("rotation_quaternion", 4)
+        self.axis_angle = self.read("rotation_axis_angle", 4)
+        self.rotation_modes = np.array([obj.rotation_mode for obj in self.objs])
+        # matrix_basis has the delta transforms in it, they are not written
+        self.delta_location = self.read("delta_location", 3)
+        self.delta_rotation = self.read("delta_rotation_euler", 3)
+        self.delta_quaternion = self.read("delta_rotation_quaternion", 4)
+        self.delta_scale = self.read("delta_scale", 3)
+        for name in ("delta_location", "delta_rotation_euler", "delta_rotation_quaternion", "delta_scale"):
+            self.buffers.pop(name, None)
+
+    # (N, width) values of a float array property, the buffer of all objects is kept for writing
+    def read(self, name, width):
+        if not self.use_collection:
+            return np.array([getattr(obj, name)[:] for obj in self.objs], dtype=np.float32).reshape(-1, width)
+        buffer = np.empty(len(bpy.data.objects) * width, dtype=np.float32)
+        bpy.data.objects.foreach_get(name, buffer)
+        self.buffers[name] = buffer.reshape(-1, width)
+        return self.buffers[name][self.indices]
+
+    # (N, 4, 4) matrices, foreach_get gives the columns one after another
+    def read_matrix(self, name):
+        matrix = self.read(name, 16).astype(np.float64).reshape(-1, 4, 4)
+        self.buffers.pop(name, None)
+        return matrix.transpose(0, 2, 1) if self.use_collection else matrix
+
+    # (N, 3, 3) delta rotations in the rotation mode of each object, applied after the rotations
+    # (the axis angle mode has no delta in the API)
+    def delta_rotation_matrices(self):
+        matrix = np.tile(np.eye(3), (len(self.objs), 1, 1))
+        for order in EULER_ORDERS:
+            pick = self.rotation_modes == order
+            if pick.any():
+                matrix[pick] = euler_order_to_matrix(self.delta_rotation[pick].astype(np.float64), order)
+        pick = self.rotation_modes == "QUATERNION"
+        if pick.any():
+            matrix[pick] = quaternion_to_matrix(self.delta_quaternion[pick].astype(np.float64))
+        return matrix
+
+    # Write locations and the rotations of all modes, (N, 3) and (N, 4) arrays
+    # (None: the quaternions or axis angles are not written)
+    def write_world(self, location, rotation, quaternion, axis_angle):
+        for name, values in (("rotation_quaternion", quaternion), ("rotation_axis_angle", axis_angle)):
+            if values is None:
+                continue
+            if self.use_collection:
+                self.buffers[name][self.indices] = values
+                bpy.data.objects.foreach_set(name, self.buffers[name].ravel())
+            else:
+                for obj, value in zip(self.objs, values.tolist()):
+                    setattr(obj, name, value)
+        self.write(location, rotation)
+
+# Objects without a selected ancestor, the others move with their selected parent
+def top_objects(objs):
+    selected = {obj.as_pointer() for obj in objs}
+    tops = []
+    for obj in objs:
+        parent = obj.parent
+        while parent is not None and parent.as_pointer() not in selected:
+            parent = parent.parent
+        if parent is None:
+            tops.append(obj)
+    return tops
+
+# Base transforms of scattered objects, keyed by ID.session_uid (kept over undo).
+# A base is valid while the object still has the transforms written by the
+# last scattering. When it was moved, or is newly selected, its current
+# transforms become its base. Checking is one comparison of the arrays.
+class BaseSnapshot:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.uids = np.empty(0, dtype=np.int64)
+        self.base_location = np.empty((0, 3), dtype=np.float32)
+        self.base_rotation = np.empty((0, 3), dtype=np.float32)
+        self.written_location = np.empty((0, 3), dtype=np.float32)
+        self.written_rotation = np.empty((0, 3), dtype=np.float32)
+
+    # Rows of the uids in the snapshot (-1: not in the snapshot)
+    def rows(self, uids):
+        if len(self.uids) == 0:
+            return np.full(len(uids), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.uids, uids), len(self.uids) - 1)
+        return np.where(self.uids[pos] == uids, pos, -1)
+
+    # Base location and rotation of objects with the current transforms
+    def base(self, uids, location, rotation):
+        rows = self.rows(uids)
+        known = rows >= 0
+        valid = known.copy()
+        valid[known] = (
+            np.all(self.written_location[rows[known]] == location[known], axis=1)
+            & np.all(self.written_rotation[rows[known]] == rotation[known], axis=1)
+        )
+        base_location = np.array(location, dtype=np.float32)
+        base_rotation = np.array(rotation, dtype=np.float32)
+        base_location[valid] = self.base_location[rows[valid]]
+        base_rotation[valid] = self.base_rotation[rows[valid]]
+        return base_location, base_rotation
+
+    # Keep the bases and the written transforms of objects
+    def update(self, uids, base_location, base_rotation, location, rotation):
+        keep = ~np.isin(self.uids, uids)
+        all_uids = np.concatenate((self.uids[keep], uids))
+        order = np.argsort(all_uids, kind = "stable")
+        self.uids = all_uids[order]
+        self.base_location = np.concatenate((self.base_location[keep], base_location)).astype(np.float32)[order]
+        self.base_rotation = np.concatenate((self.base_rotation[keep], base_rotation)).astype(np.float32)[order]
+        self.written_location = np.concatenate((self.written_location[keep], location)).astype(np.float32)[order]
+        self.written_rotation = np.concatenate((self.written_rotation[keep], rotation)).astype(np.float32)[order]
+
+base_snapshot = BaseSnapshot() if np is not None else None
+
+# Session uids of objects as an int64 array
+def session_uids(objs):
+    return np.fromiter((obj.session_uid for obj in objs), dtype=np.int64, count=len(objs))
+
+# Object pointers become invalid with a new file
+@persistent
+def clear_base_snapshot(dummy):
+    if base_snapshot is not None:
+        base_snapshot.clear()
+
+# Animated scattering: F-curves keyed for each object, the stream counter of a frame
+# (apart from the counters of the attempts) and the custom property of the action keeping the base
+ANIMATED_CURVES = [("location", 0), ("location", 1), ("location", 2),
+                   ("rotation_euler", 0), ("rotation_euler", 1), ("rotation_euler", 2)]
+FRAME_COUNTER = 1 << 24
+ANIMATED_BASE_PROP = "scatter_base"
+
+# Centered moving average over 2 * radius + 1 frames of a (F, N) array, fewer frames at the ends
+def smooth_frames(values, radius):
+    count = len(values)
+    cumsum = np.zeros((count + 1,) + values.shape[1:], dtype=np.float64)
+    np.cumsum(values, axis=0, out=cumsum[1:])
+    idx = np.arange(count)
+    lower = np.maximum(idx - radius, 0)
+    upper = np.minimum(idx + radius + 1, count)
+    return (cumsum[upper] - cumsum[lower]) / (upper - lower)[:, None]
+
+# Minimum distance (Poisson-disk like) placement with a uniform hash grid.
+#   base:        (N, 3) locations before scattering
+#   candidates:  function(attempt, indices) -> (len(indices), 3) location
+#                offsets of the objects at the indices for the attempt
+#   lower/upper: (3,) minimum and maximum of the location offsets
+# Objects are placed in order. An object tries its attempts until its location
+# is farther than min_distance from all placed objects. The grid cell size is
+# min_distance, so only the 27 neighbor cells are checked (about O(n)). Over
+# very large ranges the cell grows until the cell keys fit in int64.
+# Returns (N, 3) offsets and a bool array of the objects placed in distance.
+def min_distance_offsets(base, candidates, lower, upper, min_distance, max_attempts):
+    count = len(base)
+    offsets = np.zeros((count, 3), dtype=np.float64)
+    placed = np.zeros(count, dtype=bool)
+    if count == 0:
+        return offsets, placed
+
+    # Cell key as one integer, the neighbor cells are key + delta
+    cell = min_distance
+    while True:
+        origin = np.floor((base.min(axis=0) + lower) / cell) - 1
+        span = int((np.floor((base.max(axis=0) + upper) / cell) - origin).max()) + 2
+        if span ** 3 < 2 ** 62:
+            break
+        cell *= 2.0
+    deltas = [dx + span * (dy + span * dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+    r2 = min_distance * min_distance
+    grid = {}
+    px, py, pz = [], [], []
+    pending = np.arange(count)
+    for attempt in range(max(1, max_attempts)):
+        offsets[pending] = candidates(attempt, pending)
+        pos = base[pending] + offsets[pending]
+        cells = (np.floor(pos / cell) - origin).astype(np.int64)
+        keys = (cells[:, 0] + span * (cells[:, 1] + span * cells[:, 2])).tolist()
+
+        rejected = []
+        for i, key, (x, y, z) in zip(pending.tolist(), keys, pos.tolist()):
+            free = True
+            for delta in deltas:
+                for j in grid.get(key + delta, ()):
+                    dx = px[j] - x
+                    dy = py[j] - y
+                    dz = pz[j] - z
+                    if dx * dx + dy * dy + dz * dz < r2:
+                        free = False
+                        break
+                if not free:
+                    break
+
+            if free:
+                grid.setdefault(key, []).append(len(px))
+                px.append(x)
+                py.append(y)
+                pz.append(z)
+                placed[i] = True
+            else:
+                rejected.append(i)
+
+        pending = np.array(rejected, dtype=np.int64)
+        if len(pending) == 0:
+            break
+
+    return offsets, placed
+
+# Bounding spheres of the objects in object space: the center of the bound box and
+# the distance to its farthest corner, with the scale of each object.
+# Objects sharing data without modifiers share the local sphere.
+# Returns (N, 3) centers, (N,) radii and (N, 3) scales.
+def bounding_spheres(objs):
+    centers = np.empty((len(objs), 3), dtype=np.float64)
+    radii = np.empty(len(objs), dtype=np.float64)
+    scales = np.empty((len(objs), 3), dtype=np.float64)
+    local = {}
+    for idx, obj in enumerate(objs):
+        key = obj.data.as_pointer() if obj.data is not None and len(obj.modifiers) == 0 else obj.as_pointer()
+        sphere = local.get(key)
+        if sphere is None:
+            corners = np.array(obj.bound_box, dtype=np.float64)
+            center = (corners.min(axis=0) + corners.max(axis=0)) * 0.5
+            sphere = local[key] = (center, float(np.sqrt(((corners - center) ** 2).sum(axis=1)).max()))
+        centers[idx] = sphere[0]
+        radii[idx] = sphere[1]
+        scales[idx] = obj.scale[:]
+    return centers, radii, scales
+
+# Neighbor cells of the grid pairs, the cell itself and one of each opposite pair
+HALF_NEIGHBORS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1) if (dx, dy, dz) >= (0, 0, 0)]
+
+# All pairs (i < j) of points in the same or neighbor cells of a uniform grid, as two index arrays.
+# Points are sorted by cell key, the points of a neighbor cell are a range found by searchsorted
+# over the occupied cells.
+def grid_pairs(points, cell):
+    count = len(points)
+    cells = np.floor(points / cell).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind = "stable")
+    cell_keys, cell_start, cell_count = np.unique(keys[order], return_index = True, return_counts = True)
+    point_cell = np.searchsorted(cell_keys, keys)
+
+    pairs_i, pairs_j = [], []
+    for dx, dy, dz in HALF_NEIGHBORS:
+        neighbor = cell_keys + (dx * dims[1] + dy) * dims[2] + dz
+        found = np.minimum(np.searchsorted(cell_keys, neighbor), len(cell_keys) - 1)
+        counts = np.where(cell_keys[found] == neighbor, cell_count[found], 0)[point_cell]
+        start = cell_start[found][point_cell]
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        i = np.repeat(np.arange(count), counts)
+        j = order[np.repeat(start - (np.cumsum(counts) - counts), counts) + np.arange(total)]
+        if (dx, dy, dz) == (0, 0, 0):
+            keep = i < j
+            i, j = i[keep], j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+
+    if len(pairs_i) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+# Push overlapping bounding spheres apart inside the bounds of each object.
+#   centers:      (N, 3) locations
+#   radii:        (N,) radii of the bounding spheres
+#   lower/upper:  (N, 3) bounds of the locations (the scatter ranges)
+# Each iteration moves every object by the sum of the pushes of its overlapping
+# pairs (a little over half the overlap each, along the line of the centers), all pairs at once.
+# The candidate pairs are the pairs closer than their radii plus a margin, from a grid
+# rebuilt only when an object moved more than half the margin since the last build
+# (no overlap is missed).
+# Returns (centers, iterations, residual overlaps, grid builds)
+def relax_overlaps(centers, radii, lower, upper, max_iterations, tolerance = 1e-6):
+    count = len(centers)
+    centers = np.clip(np.array(centers, dtype=np.float64), lower, upper)
+    if count < 2 or radii.max() <= 0.0:
+        return centers, 0, 0, 0
+
+    margin = max(radii.max() * 0.5, 1e-6)
+    cell = 2.0 * radii.max() + margin
+    # Keys of the grid must fit in int64 wherever the centers move inside their bounds
+    extent = upper.max(axis=0) - lower.min(axis=0) + 2.0 * radii.max()
+    while np.prod(extent / cell + 4.0) > 2.0 ** 62:
+        cell *= 2.0
+
+    built = None
+    builds = 0
+    iterations = 0
+    overlaps = 0
+    for iteration in range(max_iterations + 1):
+        if built is None or np.max(np.abs(centers - built)) > margin * 0.5:
+            pairs_i, pairs_j = grid_pairs(centers, cell)
+            delta = centers[pairs_j] - centers[pairs_i]
+            near = (delta * delta).sum(axis=1) < (radii[pairs_i] + radii[pairs_j] + margin) ** 2
+            pairs_i, pairs_j = pairs_i[near], pairs_j[near]
+            built = centers.copy()
+            builds += 1
+
+        delta = centers[pairs_j] - centers[pairs_i]
+        dist = np.sqrt((delta * delta).sum(axis=1))
+        overlap = radii[pairs_i] + radii[pairs_j] - dist
+        hit = overlap > tolerance
+        overlaps = int(hit.sum())
+        if overlaps == 0 or iteration == max_iterations:
+            break
+        iterations += 1
+
+        i, j, delta, dist, overlap = pairs_i[hit], pairs_j[hit], delta[hit], dist[hit], overlap[hit]
+        # Coincident centers are pushed apart in the XY plane by a direction of the pair
+        direction = np.empty_like(delta)
+        apart = dist > 1e-12
+        direction[apart] = delta[apart] / dist[apart, None]
+        angle = (i[~apart] * 7919 + j[~apart]) * 2.399963
+        direction[~apart] = np.stack((np.cos(angle), np.sin(angle), np.zeros(len(angle))), axis=1)
+
+        push = direction * (overlap * 0.6)[:, None]
+        move = np.empty((count, 3), dtype=np.float64)
+        for axis in range(3):
+            move[:, axis] = np.bincount(j, push[:, axis], minlength = count) - np.bincount(i, push[:, axis], minlength = count)
+        centers = np.clip(centers + move, lower, upper)
+
+    return centers, iterations, overlaps, builds
+
+# Rotation matrices of XYZ euler angles, (N, 3) -> (N, 3, 3)
+def euler_to_matrix(euler):
+    cx, cy, cz = np.cos(euler).T
+    sx, sy, sz = np.sin(euler).T
+    matrix = np.empty((len(euler), 3, 3), dtype=np.float64)
+    matrix[:, 0, 0] = cy * cz
+    matrix[:, 0, 1] = sx * sy * cz - cx * sz
+    matrix[:, 0, 2] = cx * sy * cz + sx * sz
+    matrix[:, 1, 0] = cy * sz
+    matrix[:, 1, 1] = sx * sy * sz + cx * cz
+    matrix[:, 1, 2] = cx * sy * sz - sx * cz
+    matrix[:, 2, 0] = -sy
+    matrix[:, 2, 1] = sx * cy
+    matrix[:, 2, 2] = cx * cy
+    return matrix
+
+# XYZ euler angles of rotation matrices, (N, 3, 3) -> (N, 3)
+def matrix_to_euler(matrix):
+    euler = np.empty((len(matrix), 3), dtype=np.float64)
+    cy = np.hypot(matrix[:, 0, 0], matrix[:, 1, 0])
+    euler[:, 1] = np.arctan2(-matrix[:, 2, 0], cy)
+    euler[:, 0] = np.arctan2(matrix[:, 2, 1], matrix[:, 2, 2])
+    euler[:, 2] = np.arctan2(matrix[:, 1, 0], matrix[:, 0, 0])
+
+    # Gimbal lock: put all rotation on X
+    lock = cy < 1e-6
+    euler[lock, 0] = np.arctan2(-matrix[lock, 1, 2], matrix[lock, 1, 1])
+    euler[lock, 2] = 0.0
+    return euler
+
+# Rotation matrices turning the Z-axis to unit vectors, (N, 3) -> (N, 3, 3)
+def align_z_matrix(normal):
+    nx, ny, nz = normal.T
+    k = 1.0 / np.maximum(1.0 + nz, 1e-12)
+    matrix = np.empty((len(normal), 3, 3), dtype=np.float64)
+    matrix[:, 0, 0] = 1.0 - nx * nx * k
+    matrix[:, 0, 1] = -nx * ny * k
+    matrix[:, 0, 2] = nx
+    matrix[:, 1, 0] = -nx * ny * k
+    matrix[:, 1, 1] = 1.0 - ny * ny * k
+    matrix[:, 1, 2] = ny
+    matrix[:, 2, 0] = -nx
+    matrix[:, 2, 1] = -ny
+    matrix[:, 2, 2] = nz
+
+    # Normal to -Z: half turn around X
+    flip = nz < -1.0 + 1e-9
+    matrix[flip] = np.diag([1.0, -1.0, -1.0])
+    return matrix
+
+# Axes of the euler rotation modes in the order they are applied ("XYZ": Rz @ Ry @ Rx)
+EULER_ORDERS = {
+    "XYZ": (0, 1, 2), "YZX": (1, 2, 0), "ZXY": (2, 0, 1),
+    "XZY": (0, 2, 1), "YXZ": (1, 0, 2), "ZYX": (2, 1, 0),
+}
+
+# Euler angles of rotation matrices in a rotation mode, (N, 3, 3) -> (N, 3)
+# The axes are permuted to the XYZ order, an odd permutation mirrors the angles.
+def matrix_to_euler_order(matrix, order):
+    axes = list(EULER_ORDERS[order])
+    sign = 1.0 if order in ("XYZ", "YZX", "ZXY") else -1.0
+    euler = np.empty((len(matrix), 3), dtype=np.float64)
+    euler[:, axes] = matrix_to_euler(matrix[:, axes][:, :, axes]) * sign
+    return euler
+
+# Rotation matrices of euler angles in a rotation mode, (N, 3) -> (N, 3, 3)
+def euler_order_to_matrix(euler, order):
+    axes = list(EULER_ORDERS[order])
+    sign = 1.0 if order in ("XYZ", "YZX", "ZXY") else -1.0
+    inverse_axes = list(np.argsort(axes))
+    return euler_to_matrix(euler[:, axes] * sign)[:, inverse_axes][:, :, inverse_axes]
+
+# Unit quaternions (W, X, Y, Z) of rotation matrices, (N, 3, 3) -> (N, 4)
+# Each one from the largest of W, X, Y, Z for precision.
+def matrix_to_quaternion(matrix):
+    m = matrix
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    squares = np.stack((1.0 + trace, 1.0 + 2.0 * m[:, 0, 0] - trace,
+                        1.0 + 2.0 * m[:, 1, 1] - trace, 1.0 + 2.0 * m[:, 2, 2] - trace), axis=1)
+    largest = np.argmax(squares, axis=1)
+    s = np.sqrt(np.maximum(squares[np.arange(len(m)), largest], 1e-12)) * 2.0
+    # Four times the largest component is s, the others are divided by s
+    largest_value = s * s * 0.25
+    quaternion = np.empty((len(m), 4), dtype=np.float64)
+    for component, (w, x, y, z) in enumerate([
+        (largest_value, m[:, 2, 1] - m[:, 1, 2], m[:, 0, 2] - m[:, 2, 0], m[:, 1, 0] - m[:, 0, 1]),
+        (m[:, 2, 1] - m[:, 1, 2], largest_value, m[:, 0, 1] + m[:, 1, 0], m[:, 0, 2] + m[:, 2, 0]),
+        (m[:, 0, 2] - m[:, 2, 0], m[:, 0, 1] + m[:, 1, 0], largest_value, m[:, 1, 2] + m[:, 2, 1]),
+        (m[:, 1, 0] - m[:, 0, 1], m[:, 0, 2] + m[:, 2, 0], m[:, 1, 2] + m[:, 2, 1], largest_value),
+    ]):
+        pick = largest == component
+        quaternion[pick] = np.stack((w[pick], x[pick], y[pick], z[pick]), axis=1) / s[pick, None]
+    return quaternion / np.linalg.norm(quaternion, axis=1)[:, None]
+
+# Rotation matrices of quaternions (W, X, Y, Z), normalized first, (N, 4) -> (N, 3, 3)
+def quaternion_to_matrix(quaternion):
+    w, x, y, z = (quaternion / np.maximum(np.linalg.norm(quaternion, axis=1), 1e-12)[:, None]).T
+    matrix = np.empty((len(quaternion), 3, 3), dtype=np.float64)
+    matrix[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    matrix[:, 0, 1] = 2.0 * (x * y - z * w)
+    matrix[:, 0, 2] = 2.0 * (x * z + y * w)
+    matrix[:, 1, 0] = 2.0 * (x * y + z * w)
+    matrix[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    matrix[:, 1, 2] = 2.0 * (y * z - x * w)
+    matrix[:, 2, 0] = 2.0 * (x * z - y * w)
+    matrix[:, 2, 1] = 2.0 * (y * z + x * w)
+    matrix[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return matrix
+
+# Axis angles (angle, X, Y, Z) of unit quaternions, (N, 4) -> (N, 4)
+# No rotation gets the Y-axis like a new object.
+def quaternion_to_axis_angle(quaternion):
+    sin_half = np.linalg.norm(quaternion[:, 1:4], axis=1)
+    axis_angle = np.empty((len(quaternion), 4), dtype=np.float64)
+    axis_angle[:, 0] = 2.0 * np.arctan2(sin_half, quaternion[:, 0])
+    axis_angle[:, 1:4] = np.where(sin_half[:, None] > 1e-12, quaternion[:, 1:4] / np.maximum(sin_half, 1e-12)[:, None], (0.0, 1.0, 0.0))
+    return axis_angle
+
+# Inverses of (N, 4, 4) matrices, the pseudo-inverse of singular ones (zero scale)
+def inverse_matrices(matrix):
+    inverse = np.empty_like(matrix)
+    regular = np.abs(np.linalg.det(matrix)) > 1e-12
+    inverse[regular] = np.linalg.inv(matrix[regular])
+    if not regular.all():
+        inverse[~regular] = np.linalg.pinv(matrix[~regular])
+    return inverse
+
+# Vertex group weights of target meshes by object name: (data name, group name,
+# vertex count, weights), read once and dropped by a depsgraph update of the
+# object or its mesh (see scatter_depsgraph_update)
+vertex_weights_cache = {}
+
+# Weights of a vertex group on the evaluated mesh of an object, 0 where unassigned.
+# Deform weights have no foreach access, the loop runs once per mesh and group.
+def vertex_weights(obj, mesh, group):
+    cached = vertex_weights_cache.get(obj.name)
+    if cached is not None and cached[1:3] == (group.name, len(mesh.vertices)):
+        return cached[3]
+
+    index = group.index
+    weights = np.fromiter(
+        (next((elem.weight for elem in vert.groups if elem.group == index), 0.0) for vert in mesh.vertices),
+        dtype=np.float32, count=len(mesh.vertices),
+    )
+    vertex_weights_cache[obj.name] = (obj.data.name, group.name, len(mesh.vertices), weights)
+    return weights
+
+# Meshes of another file may have the same names
+@persistent
+def clear_vertex_weights(dummy):
+    vertex_weights_cache.clear()
+
+# Random points on the surface of a mesh object in world space.
+# Triangles are chosen by a prefix sum (CDF) of their areas, the points in a
+# triangle are uniform barycentric coordinates. All in NumPy arrays.
+class SurfaceSampler:
+    # Random value axes of the triangle and the barycentric coordinates
+    sample_axes = (6, 7, 8)
+
+    def __init__(self, obj, depsgraph, weight_group = ""):
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        matrix = np.array(eval_obj.matrix_world, dtype=np.float64)
+
+        group = obj.vertex_groups.get(weight_group) if weight_group else None
+        self.weights = vertex_weights(obj, mesh, group) if group is not None else None
+        eval_obj.to_mesh_clear()
+
+        self.verts = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        self.tris = tris.reshape(-1, 3)
+        corners = self.verts[self.tris]
+        cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        area = np.linalg.norm(cross, axis=1)
+        self.normals = cross / np.maximum(area, 1e-30)[:, None]
+        self.cdf = np.cumsum(area)
+        self.corners = corners
+        self.lower = self.verts.min(axis=0) if len(self.verts) else np.zeros(3)
+        self.upper = self.verts.max(axis=0) if len(self.verts) else np.zeros(3)
+        self.bvh = None
+
+    def is_empty(self):
+        return len(self.cdf) == 0 or self.cdf[-1] <= 0.0
+
+    # Points, normals and triangle indices for stream keys
+    def sample(self, seed, keys, counter = 0):
+        u_tri, u_1, u_2 = (random_values(seed, keys, axis, counter) for axis in self.sample_axes)
+        tri = np.minimum(np.searchsorted(self.cdf, u_tri * self.cdf[-1], side = "right"), len(self.cdf) - 1)
+        s_1 = np.sqrt(u_1)
+        corners = self.corners[tri]
+        points = (
+            (1.0 - s_1)[:, None] * corners[:, 0]
+            + (s_1 * (1.0 - u_2))[:, None] * corners[:, 1]
+            + (s_1 * u_2)[:, None] * corners[:, 2]
+        )
+        return points, self.normals[tri], tri
+
+    # Nearest points, normals and triangle indices on the surface
+    def project(self, points):
+        if self.bvh is None:
+            self.bvh = BVHTree.FromPolygons(self.verts.tolist(), self.tris.tolist())
+
+        normals = np.empty_like(points)
+        tri = np.zeros(len(points), dtype=np.int64)
+        points = points.copy()
+        find_nearest = self.bvh.find_nearest
+        for idx, point in enumerate(points.tolist()):
+            location, normal, index, _ = find_nearest(point)
+            if location is not None:
+                points[idx] = location
+                normals[idx] = normal
+                tri[idx] = index
+        return points, normals, tri
+
+    # Vertex group weights at points in the triangles (barycentric interpolation)
+    def vertex_density(self, points, tri):
+        corners = self.corners[tri]
+        v_0 = corners[:, 1] - corners[:, 0]
+        v_1 = corners[:, 2] - corners[:, 0]
+        v_2 = points - corners[:, 0]
+        d_00 = np.einsum("ij,ij->i", v_0, v_0)
+        d_01 = np.einsum("ij,ij->i", v_0, v_1)
+        d_11 = np.einsum("ij,ij->i", v_1, v_1)
+        d_20 = np.einsum("ij,ij->i", v_2, v_0)
+        d_21 = np.einsum("ij,ij->i", v_2, v_1)
+        denom = np.maximum(d_00 * d_11 - d_01 * d_01, 1e-30)
+        w_1 = (d_11 * d_20 - d_01 * d_21) / denom
+        w_2 = (d_00 * d_21 - d_01 * d_20) / denom
+        weights = self.weights[self.tris[tri]]
+        return (1.0 - w_1 - w_2) * weights[:, 0] + w_1 * weights[:, 1] + w_2 * weights[:, 2]
+
+# Polyline of a spline in object space as a (M, 3) array, closed when the spline is cyclic.
+# Bezier segments are evaluated at the resolution of the spline, all segments at once.
+# Poly and NURBS splines follow their points.
+def spline_polyline(spline):
+    cyclic = spline.use_cyclic_u
+    if spline.type == 'BEZIER':
+        count = len(spline.bezier_points)
+        arrays = []
+        for name in ("co", "handle_left", "handle_right"):
+            values = np.empty(count * 3, dtype=np.float32)
+            spline.bezier_points.foreach_get(name, values)
+            arrays.append(values.reshape(-1, 3).astype(np.float64))
+        co, left, right = arrays
+        if count < 2:
+            return co
+
+        start = np.arange(count if cyclic else count - 1)
+        end = (start + 1) % count
+        t = np.linspace(0.0, 1.0, max(spline.resolution_u, 1), endpoint = False)[None, :, None]
+        polyline = (
+            (1.0 - t) ** 3 * co[start, None]
+            + 3.0 * (1.0 - t) ** 2 * t * right[start, None]
+            + 3.0 * (1.0 - t) * t ** 2 * left[end, None]
+            + t ** 3 * co[end, None]
+        ).reshape(-1, 3)
+        return np.concatenate((polyline, co[end[-1:]]))
+
+    values = np.empty(len(spline.points) * 4, dtype=np.float32)
+    spline.points.foreach_get("co", values)
+    polyline = values.reshape(-1, 4)[:, 0:3].astype(np.float64)
+    if cyclic and len(polyline) > 1:
+        polyline = np.concatenate((polyline, polyline[0:1]))
+    return polyline
+
+# Arc-length lookup table of a curve object in world space.
+# The splines are evaluated once into segments with a prefix sum of their lengths,
+# points at arc lengths are found by a binary search and a linear interpolation.
+class CurvePath:
+    def __init__(self, obj):
+        self.data_name = obj.data.name
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        starts = []
+        ends = []
+        for spline in obj.data.splines:
+            polyline = spline_polyline(spline) @ matrix[:3, :3].T + matrix[:3, 3]
+            starts.append(polyline[:-1])
+            ends.append(polyline[1:])
+
+        self.starts = np.concatenate(starts) if starts else np.zeros((0, 3))
+        self.ends = np.concatenate(ends) if ends else np.zeros((0, 3))
+        lengths = np.linalg.norm(self.ends - self.starts, axis=1)
+        keep = lengths > 1e-12
+        self.starts, self.ends, self.lengths = self.starts[keep], self.ends[keep], lengths[keep]
+        self.tangents = (self.ends - self.starts) / self.lengths[:, None]
+        self.cdf = np.concatenate(([0.0], np.cumsum(self.lengths)))
+        self.length = float(self.cdf[-1])
+
+    def is_empty(self):
+        return self.length <= 0.0
+
+    # Points and unit tangents at arc lengths
+    def evaluate(self, arc):
+        segment = np.clip(np.searchsorted(self.cdf, arc, side = "right") - 1, 0, len(self.lengths) - 1)
+        t = np.clip((arc - self.cdf[segment]) / self.lengths[segment], 0.0, 1.0)
+        points = self.starts[segment] + t[:, None] * (self.ends[segment] - self.starts[segment])
+        return points, self.tangents[segment]
+
+# Frames along tangents as rotation matrices: X across the curve (horizontal when possible),
+# Y along the tangent, Z up. (N, 3) -> (N, 3, 3)
+def tangent_frames(tangents):
+    up = np.zeros_like(tangents)
+    vertical = np.abs(tangents[:, 2]) > 0.999
+    up[~vertical, 2] = 1.0
+    up[vertical, 1] = 1.0
+    side = np.cross(tangents, up)
+    side /= np.linalg.norm(side, axis=1)[:, None]
+    frames = np.empty((len(tangents), 3, 3), dtype=np.float64)
+    frames[:, :, 0] = side
+    frames[:, :, 1] = tangents
+    frames[:, :, 2] = np.cross(side, tangents)
+    return frames
+
+# Random value axis of the jittered arc lengths
+CURVE_AXIS = 10
+
+# Arc-length tables of curves by object name, built once and dropped by a
+# depsgraph update of the curve object or its data (see scatter_depsgraph_update)
+curve_path_cache = {}
+
+def curve_path(obj):
+    path = curve_path_cache.get(obj.name)
+    if path is None:
+        path = curve_path_cache[obj.name] = CurvePath(obj)
+    return path
+
+# Curves of another file may have the same names
+@persistent
+def clear_curve_paths(dummy):
+    curve_path_cache.clear()
+
+# Density images as (H, W) arrays, read once by foreach_get and kept until
+# the image changes (a depsgraph update of the image, its size or file).
+image_density_cache = {}
+
+def image_density(image):
+    signature = (tuple(image.size), image.filepath_raw, image.source)
+    cached = image_density_cache.get(image.name)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    width, height = image.size
+    channels = image.channels
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    pixels.shape = (height, width, channels)
+    density = np.clip(pixels[:, :, :min(channels, 3)].mean(axis=2), 0.0, 1.0)
+    image_density_cache[image.name] = (signature, density)
+    return density
+
+# Densities of points in an image covering the XY rectangle of lower - upper
+def image_density_at(density, points, lower, upper):
+    height, width = density.shape
+    size = np.maximum(upper[0:2] - lower[0:2], 1e-12)
+    uv = (points[:, 0:2] - lower[0:2]) / size
+    ix = np.clip((uv[:, 0] * width).astype(np.int64), 0, width - 1)
+    iy = np.clip((uv[:, 1] * height).astype(np.int64), 0, height - 1)
+    return density[iy, ix]
+
+# Random value axis of the density rejection
+ACCEPT_AXIS = 9
+
+# Rejection sampling of candidates against a density in [0, 1].
+#   candidates: function(counter, indices) -> candidate values
+#   density:    function(indices, values) -> densities of the candidates
+# An attempt tries up to `rounds` counters for each object. accepted (bool
+# array) tells which objects found an accepted candidate.
+# Returns a candidates function of attempts (for min_distance_offsets).
+def density_rejection(candidates, density, seed, keys, rounds, accepted):
+    def sample(attempt, indices):
+        counter = attempt * rounds
+        values = candidates(counter, indices)
+        accepted[indices] = False
+        pending = np.arange(len(indices))
+        for step in range(rounds):
+            u = random_values(seed, keys[indices[pending]], ACCEPT_AXIS, counter + step)
+            ok = u < density(indices[pending], values[pending])
+            accepted[indices[pending[ok]]] = True
+            pending = pending[~ok]
+            if len(pending) == 0 or step == rounds - 1:
+                break
+            values[pending] = candidates(counter + step + 1, indices[pending])
+        return values
+
+    return sample
+
+# Drop cached data of changed images, curves and meshes
+@persistent
+def scatter_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Image):
+            image_density_cache.pop(update.id.name, None)
+        elif isinstance(update.id, bpy.types.Object) and update.id.type == 'MESH' and update.is_updated_geometry:
+            vertex_weights_cache.pop(update.id.name, None)
+        elif isinstance(update.id, bpy.types.Mesh):
+            for name in [name for name, cached in vertex_weights_cache.items() if cached[0] == update.id.name]:
+                del vertex_weights_cache[name]
+        elif isinstance(update.id, bpy.types.Object) and update.id.type == 'CURVE':
+            curve_path_cache.pop(update.id.name, None)
+        elif isinstance(update.id, bpy.types.Curve):
+            for name in [name for name, path in curve_path_cache.items() if path.data_name == update.id.name]:
+                del curve_path_cache[name]
+
+# Estimated memory of an object without its data, and of attribute values
+OBJECT_BYTES = 1536
+ATTRIBUTE_BYTES = {
+    "FLOAT": 4, "INT": 4, "FLOAT_VECTOR": 12, "FLOAT_COLOR": 16, "BYTE_COLOR": 4,
+    "STRING": 1, "BOOLEAN": 1, "FLOAT2": 8, "INT8": 1, "INT32_2D": 8,
+    "QUATERNION": 16, "FLOAT4X4": 64,
+}
+
+# Estimated memory of object data (mesh attributes, positions and topology)
+def data_bytes(data):
+    if data is None or not hasattr(data, "attributes"):
+        return 0
+    return sum(len(attr.data) * ATTRIBUTE_BYTES.get(attr.data_type, 4) for attr in data.attributes)
+
+# Memory in a short readable form
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+# Settings of the addon, one property group of the scene read by the operators and saved in presets
+class ObjectsScatterSettings(bpy.types.PropertyGroup):
     scatter_xm: bpy.props.FloatProperty(
         name = "Scatter -X",
         description = "Maximum scattering to -X",
@@ -102,7 +990,7 @@ class OBJSCATTER_OT_ObjectsRandomScatter(bpy.types.Operator):
         description = "Maximum rotation angle -Y",
         default = 0.0,
         min = 0.0,
-        max = 10000.0
+        max = 180.0
     )
     
     scatter_ryp: bpy.props.FloatProperty(
@@ -110,7 +998,7 @@ class OBJSCATTER_OT_ObjectsRandomScatter(bpy.types.Operator):
         description = "Maximum rotation angle +Y",
         default = 0.0,
         min = 0.0,
-        max = 10000.0
+        max = 180.0
     )
     
     scatter_zm: bpy.props.FloatProperty(
@@ -145,51 +1033,1163 @@ class OBJSCATTER_OT_ObjectsRandomScatter(bpy.types.Operator):
         max = 180.0
     )
 
+    scatter_seed: bpy.props.IntProperty(
+        name = "Seed",
+        description = "Random seed, the same seed gives the same scattering",
+        default = 0,
+        min = 0
+    )
+
+    scatter_stream_key: bpy.props.EnumProperty(
+        name = "Stream",
+        description = "Random stream of each object",
+        items = [
+            ("NAME", "Name", "Stream by object name, stable for any subset and order"),
+            ("INDEX", "Index", "Stream by index in the selection"),
+        ],
+        default = "NAME"
+    )
+
+    scatter_bulk: bpy.props.BoolProperty(
+        name = "Bulk",
+        description = "Draw all offsets at once and write transforms in bulk (needs NumPy)",
+        default = True
+    )
+
+    scatter_from_base: bpy.props.BoolProperty(
+        name = "From Base",
+        description = "Scatter from the base transforms kept by the addon, not from the scattered ones (needs NumPy)",
+        default = True
+    )
+
+    scatter_min_distance: bpy.props.FloatProperty(
+        name = "Min Distance",
+        description = "Minimum distance between scattered objects (0: no limit, needs NumPy)",
+        default = 0.0,
+        min = 0.0,
+        max = 10000.0
+    )
+
+    scatter_max_attempts: bpy.props.IntProperty(
+        name = "Attempts",
+        description = "Maximum attempts to find a location in the minimum distance",
+        default = 30,
+        min = 1,
+        max = 1000
+    )
+
+    scatter_relax: bpy.props.BoolProperty(
+        name = "Relax",
+        description = "Push overlapping objects (bounding spheres) apart within the ranges after scattering (bulk only)",
+        default = False
+    )
+
+    scatter_relax_iterations: bpy.props.IntProperty(
+        name = "Iterations",
+        description = "Maximum iterations of the overlap relaxation",
+        default = 100,
+        min = 1,
+        max = 10000
+    )
+
+    scatter_mode: bpy.props.EnumProperty(
+        name = "Mode",
+        description = "What to scatter",
+        items = [
+            ("SELECTED", "Selected", "Scatter the selected objects"),
+            ("INSTANCE", "Instances", "Create instances of a source and scatter them"),
+        ],
+        default = "SELECTED"
+    )
+
+    scatter_instance_type: bpy.props.EnumProperty(
+        name = "Instance",
+        description = "Type of the instances",
+        items = [
+            ("LINKED", "Linked Data", "Objects sharing the data of the source object"),
+            ("COLLECTION", "Collection", "Empties instancing the source collection"),
+        ],
+        default = "LINKED"
+    )
+
+    scatter_count: bpy.props.IntProperty(
+        name = "Count",
+        description = "Number of instances",
+        default = 100,
+        min = 1,
+        max = 10000000
+    )
+
+    scatter_source: bpy.props.PointerProperty(
+        name = "Source",
+        description = "Source object of the instances (empty: active object)",
+        type = bpy.types.Object
+    )
+
+    scatter_source_collection: bpy.props.PointerProperty(
+        name = "Source Collection",
+        description = "Source collection of the collection instances",
+        type = bpy.types.Collection
+    )
+
+    scatter_placement: bpy.props.EnumProperty(
+        name = "Placement",
+        description = "Where to place the objects",
+        items = [
+            ("OFFSET", "Offset", "Offset from the current location"),
+            ("SURFACE", "Surface", "On the surface of a target mesh, the ranges jitter the points"),
+            ("CURVE", "Curve", "Along a curve object, the X and Z ranges jitter across the curve, Y along it"),
+        ],
+        default = "OFFSET"
+    )
+
+    scatter_space: bpy.props.EnumProperty(
+        name = "Space",
+        description = "Space of the offsets",
+        items = [
+            ("LOCAL", "Local", "Add the offsets to the location and rotation of the objects (in the parent space)"),
+            ("WORLD", "World", "Move and rotate the objects along the world axes, children of selected objects move with them (needs NumPy)"),
+        ],
+        default = "LOCAL"
+    )
+
+    scatter_target: bpy.props.PointerProperty(
+        name = "Target",
+        description = "Target mesh object to place the objects on",
+        type = bpy.types.Object,
+        poll = lambda self, obj: obj.type == 'MESH'
+    )
+
+    scatter_curve: bpy.props.PointerProperty(
+        name = "Curve",
+        description = "Curve object to place the objects along",
+        type = bpy.types.Object,
+        poll = lambda self, obj: obj.type == 'CURVE'
+    )
+
+    scatter_curve_spacing: bpy.props.EnumProperty(
+        name = "Spacing",
+        description = "Positions of the objects along the curve",
+        items = [
+            ("UNIFORM", "Uniform", "Equal arc lengths between the objects"),
+            ("JITTERED", "Jittered", "A random position in an equal part of the curve for each object"),
+        ],
+        default = "UNIFORM"
+    )
+
+    scatter_align_tangent: bpy.props.BoolProperty(
+        name = "Align to Tangent",
+        description = "Align the Y-axis of the objects to the tangent of the curve",
+        default = False
+    )
+
+    scatter_align_normal: bpy.props.BoolProperty(
+        name = "Align to Normal",
+        description = "Align the Z-axis of the objects to the surface normal",
+        default = False
+    )
+
+    scatter_density: bpy.props.EnumProperty(
+        name = "Density",
+        description = "Density map of the scattering",
+        items = [
+            ("NONE", "None", "Uniform density"),
+            ("IMAGE", "Image", "Image over the XY area of the scattering, brighter is denser"),
+            ("VERTEX_GROUP", "Vertex Group", "Vertex group weights of the target mesh (surface placement)"),
+        ],
+        default = "NONE"
+    )
+
+    scatter_density_image: bpy.props.PointerProperty(
+        name = "Density Image",
+        description = "Image of the density map",
+        type = bpy.types.Image
+    )
+
+    scatter_density_group: bpy.props.StringProperty(
+        name = "Density Group",
+        description = "Vertex group of the target mesh as the density map",
+        default = ""
+    )
+
+    scatter_animated: bpy.props.BoolProperty(
+        name = "Animated",
+        description = "Key new offsets on the frames of a range, written to the F-curves in bulk (needs NumPy)",
+        default = False
+    )
+
+    scatter_frame_start: bpy.props.IntProperty(
+        name = "Start",
+        description = "First frame of the animated scattering",
+        default = 1
+    )
+
+    scatter_frame_end: bpy.props.IntProperty(
+        name = "End",
+        description = "Last frame of the animated scattering",
+        default = 250
+    )
+
+    scatter_frame_step: bpy.props.IntProperty(
+        name = "Step",
+        description = "Frames between the keys",
+        default = 1,
+        min = 1,
+        max = 1000
+    )
+
+    scatter_smooth: bpy.props.IntProperty(
+        name = "Smooth",
+        description = "Keys averaged on each side of a key to smooth the jitter (0: no smoothing)",
+        default = 0,
+        min = 0,
+        max = 100
+    )
+
+    scatter_modal: bpy.props.BoolProperty(
+        name = "Modal",
+        description = "Scatter in time slices with progress, Esc to cancel",
+        default = False
+    )
+
+    scatter_frame_ms: bpy.props.FloatProperty(
+        name = "Slice Time",
+        description = "Target time of a time slice in milliseconds",
+        default = 30.0,
+        min = 1.0,
+        max = 1000.0
+    )
+
+# Data-block settings by collection of bpy.data, scripts and the batch pass them by name
+SETTINGS_POINTERS = {
+    "scatter_source": "objects",
+    "scatter_source_collection": "collections",
+    "scatter_target": "objects",
+    "scatter_curve": "objects",
+    "scatter_density_image": "images",
+}
+
+# Settings saved in presets, data-blocks of a file are not
+PRESET_SETTINGS = [
+    name for name in ObjectsScatterSettings.__annotations__
+    if name not in SETTINGS_POINTERS and name != "scatter_density_group"
+]
+
+# Write plain values to the settings, data-blocks by name
+def apply_settings(settings, values):
+    for name, value in values.items():
+        if name in SETTINGS_POINTERS and isinstance(value, str):
+            value = getattr(bpy.data, SETTINGS_POINTERS[name]).get(value) if value else None
+        setattr(settings, name, value)
+
+# Scatter layouts: the transforms of objects in an uncompressed .npz, one array for each field.
+# The entries are sorted by the hashes of their names, so objects are matched by a binary
+# search of integers, and the arrays are memory-mapped when a layout is loaded.
+LAYOUT_VERSION = 1
+LAYOUT_ARRAYS = ["version", "names", "name_hashes", "indices", "keys", "location", "rotation",
+                 "seed", "setting_names", "setting_values"]
+FNV64_OFFSET = 0xCBF29CE484222325
+FNV64_PRIME = 0x100000001B3
+
+# FNV-1a hashes of the code points of names, a unicode array -> uint64 array.
+# One pass over the characters for all names, the padding of shorter names is skipped.
+def name_hashes(names):
+    if len(names) == 0:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.ascontiguousarray(names).view(np.uint32).reshape(len(names), -1)
+    shortest = int((codes != 0).sum(axis=1).min())
+    hashes = np.full(len(names), FNV64_OFFSET, dtype=np.uint64)
+    for idx in range(codes.shape[1]):
+        column = codes[:, idx].astype(np.uint64)
+        mixed = (hashes ^ column) * np.uint64(FNV64_PRIME)
+        hashes = mixed if idx < shortest else np.where(column != 0, mixed, hashes)
+    return hashes
+
+# Save the transforms of objects with their stream keys and the settings
+def save_layout(path, objs, keys, settings):
+    transforms = BulkTransforms(objs)
+    names = np.array([obj.name for obj in objs], dtype=np.str_)
+    hashes = name_hashes(names)
+    order = np.argsort(hashes, kind = "stable")
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            version = np.int64(LAYOUT_VERSION),
+            names = names[order],
+            name_hashes = hashes[order],
+            indices = order.astype(np.int64),
+            keys = np.asarray(keys, dtype=np.uint64)[order],
+            location = transforms.location[order],
+            rotation = transforms.rotation[order],
+            seed = np.int64(settings.scatter_seed),
+            setting_names = np.array(PRESET_SETTINGS),
+            setting_values = np.array([str(getattr(settings, name)) for name in PRESET_SETTINGS]),
+        )
+
+# Arrays of an .npz by name. Arrays stored without compression are memory-mapped
+# at their offset in the file, the others (and scalars) are read.
+def load_npz(path):
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # Local file header: 30 bytes, then the file name and the extra field
+            f.seek(info.header_offset)
+            name_length, extra_length = struct.unpack("<HH", f.read(30)[26:30])
+            start = info.header_offset + 30 + name_length + extra_length
+            f.seek(start)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            if dtype.hasobject or len(shape) == 0 or 0 in shape:
+                f.seek(start)
+                arrays[name] = np.lib.format.read_array(f)
+            else:
+                arrays[name] = np.memmap(f, dtype = dtype, mode = "r", offset = f.tell(), shape = shape,
+                                         order = "F" if fortran_order else "C")
+    return arrays
+
+# Arrays of a layout file, ValueError when it is not a layout
+def load_layout(path):
+    try:
+        layout = load_npz(path)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a layout file: {e}")
+    missing = [name for name in LAYOUT_ARRAYS if name not in layout]
+    if len(missing) > 0:
+        raise ValueError(f"Not a layout file, no {', '.join(missing)}")
+    if int(layout["version"]) > LAYOUT_VERSION:
+        raise ValueError(f"Layout version {int(layout['version'])} is newer than this addon")
+    return layout
+
+# Rows of the layout entries of names (a unicode array), -1 for names not in the layout.
+# The hashes are searched in sorted order (far fewer cache misses), then the names are compared.
+def layout_rows(layout, names):
+    layout_hashes = layout["name_hashes"]
+    if len(layout_hashes) == 0 or len(names) == 0:
+        return np.full(len(names), -1, dtype=np.int64)
+    hashes = name_hashes(names)
+    order = np.argsort(hashes)
+    rows = np.empty(len(names), dtype=np.int64)
+    rows[order] = np.searchsorted(layout_hashes, hashes[order])
+    rows = np.minimum(rows, len(layout_hashes) - 1)
+    found = (layout_hashes[rows] == hashes) & (layout["names"][rows] == names)
+    return np.where(found, rows, -1)
+
+# Scattering of the addon operators, with the settings of the scene
+class ObjectsScatterBase:
+    # Enabled ranges as [(axis index, minimum, maximum, unit scale)]
+    # Rotation ranges are in degree and converted to radian by the unit scale.
+    def scatter_ranges(self):
+        to_radian = math.pi / 180
+        ranges = []
+        for axis, (prop_m, prop_p, is_rotation) in enumerate(SCATTER_AXES):
+            scatter_m = -getattr(self.settings, prop_m)
+            scatter_p = getattr(self.settings, prop_p)
+            if scatter_m < scatter_p:
+                ranges.append((axis, scatter_m, scatter_p, to_radian if is_rotation else 1.0))
+
+        return ranges
+
+    # Minimum and maximum of the location offsets as (3,) arrays
+    def location_bounds(self):
+        lower = np.zeros(3, dtype=np.float64)
+        upper = np.zeros(3, dtype=np.float64)
+        for axis, scatter_m, scatter_p, scale in self.scatter_ranges():
+            if axis < 3:
+                lower[axis] = scatter_m
+                upper[axis] = scatter_p
+
+        return lower, upper
+
     def replace_all_objects_random(self, obj_types):
+        objs = [obj for obj in bpy.context.selected_objects if obj.type in obj_types]
+        self.replace_objects(objs, self.settings.scatter_stream_key)
+
+    # The bulk path is needed by all settings but the plain ranges
+    def use_bulk(self):
+        if np is None:
+            return False
+        return self.settings.scatter_bulk or self.settings.scatter_relax or self.settings.scatter_min_distance > 0.0 or self.settings.scatter_placement != "OFFSET" or self.settings.scatter_density != "NONE"
+
+    def replace_objects(self, objs, key_type):
+        self.unplaced = 0
+        self.accepted = None
+        self.keyed = None
+        self.relaxed = None
+        self.moved_with_parent = 0
+        if self.settings.scatter_animated:
+            self.replace_objects_animated(objs, key_type)
+        elif self.settings.scatter_space == "WORLD" and self.settings.scatter_placement == "OFFSET":
+            self.replace_objects_world(objs, key_type)
+        elif self.use_bulk():
+            self.replace_objects_bulk(objs, key_type)
+        else:
+            self.replace_objects_each(objs, key_type)
+
+    # Create instances of the source and scatter them from the source location.
+    # Instances share the source data, so only the objects take memory.
+    # Streams are keyed by instance index, names may get suffixes.
+    # Returns (instances, estimated bytes, estimated bytes of real duplicates)
+    def scatter_instances(self, context):
+        if self.settings.scatter_instance_type == "COLLECTION":
+            source = self.settings.scatter_source_collection
+            if source is None:
+                return None
+            name = source.name
+            matrix = context.scene.cursor.matrix
+            source_bytes = sum(data_bytes(obj.data) for obj in source.all_objects) + OBJECT_BYTES * len(source.all_objects)
+        else:
+            source = self.settings.scatter_source or context.active_object
+            if source is None:
+                return None
+            name = source.name
+            matrix = source.matrix_world.copy()
+            source_bytes = data_bytes(source.data) + OBJECT_BYTES
+
+        collection = bpy.data.collections.new(f"Scatter {name}")
+        context.scene.collection.children.link(collection)
+
+        objs = []
+        new_object = bpy.data.objects.new
+        link = collection.objects.link
+        for idx in range(self.settings.scatter_count):
+            if self.settings.scatter_instance_type == "COLLECTION":
+                obj = new_object(f"{name}.scatter.{idx:05d}", None)
+                obj.instance_type = "COLLECTION"
+                obj.instance_collection = source
+            else:
+                obj = new_object(f"{name}.scatter.{idx:05d}", source.data)
+            obj.matrix_world = matrix
+            link(obj)
+            objs.append(obj)
+
+        self.replace_objects(objs, "INDEX")
+        return objs, OBJECT_BYTES * len(objs), source_bytes * len(objs)
+
+    # Offsets of the objects as a (N, 6) array: X, Y, Z, rotation X, Y, Z
+    def random_offsets(self, keys, counter = 0):
+        keys = np.asarray(keys, dtype=np.uint64)
+        offsets = np.zeros((len(keys), 6), dtype=np.float64)
+        for axis, scatter_m, scatter_p, scale in self.scatter_ranges():
+            values = random_values(self.settings.scatter_seed, keys, axis, counter)
+            offsets[:, axis] = (values * (scatter_p - scatter_m) + scatter_m) * scale
+
+        return offsets
+
+    # Draw random values for all objects at once and write them in bulk
+    def replace_objects_bulk(self, objs, key_type):
+        plan = self.bulk_plan(objs, key_type)
+        if plan is not None:
+            self.write_transforms(*plan)
+
+    # New transforms of the objects, without writing them:
+    # (objects, BulkTransforms, base location, base rotation, location, rotation)
+    # None when there is nothing to scatter.
+    def bulk_plan(self, objs, key_type):
+        if self.settings.scatter_placement == "SURFACE":
+            return self.surface_plan(objs, key_type)
+        if self.settings.scatter_placement == "CURVE":
+            return self.curve_plan(objs, key_type)
+
+        if len(objs) == 0 or len(self.scatter_ranges()) == 0:
+            return None
+
+        keys = np.array(stream_keys(objs, key_type), dtype=np.uint64)
+        transforms = BulkTransforms(objs)
+        base_location, base_rotation = self.base_transforms(objs, transforms)
+        # Objects to the space of the locations (their parents): rotations and scales
+        def linear(rotation, scale):
+            return euler_to_matrix(base_rotation + rotation) * scale[:, None, :]
+        offsets = self.placed_offsets(objs, keys, base_location.astype(np.float64), linear)
+        return objs, transforms, base_location, base_rotation, base_location + offsets[:, 0:3], base_rotation + offsets[:, 3:6]
+
+    # Offsets of the objects from their base locations as a (N, 6) array,
+    # with the density, the minimum distance and the relaxation of the settings.
+    # linear: function(rotation offsets, scales) -> (N, 3, 3) matrices from object
+    # space to the space of the base locations, for the bounding spheres of the relaxation
+    def placed_offsets(self, objs, keys, base, linear):
+        offsets = self.random_offsets(keys)
+        lower, upper = self.location_bounds()
+
+        def candidates(counter, indices):
+            return self.random_offsets(keys[indices], counter)[:, 0:3]
+
+        # Density over the XY area of all locations the objects can get
+        if self.settings.scatter_density == "IMAGE":
+            density = image_density(self.settings.scatter_density_image)
+            area_lower = base.min(axis=0) + lower
+            area_upper = base.max(axis=0) + upper
+            candidates = self.density_candidates(
+                candidates, lambda indices, values: image_density_at(density, base[indices] + values, area_lower, area_upper), keys
+            )
+
+        # Retry the locations in the minimum distance, attempt 0 is the offset above
+        if self.settings.scatter_min_distance > 0.0:
+            offsets[:, 0:3], placed = min_distance_offsets(
+                base, candidates, lower, upper, self.settings.scatter_min_distance, self.settings.scatter_max_attempts
+            )
+            self.unplaced = len(objs) - int(placed.sum())
+        elif self.settings.scatter_density != "NONE":
+            offsets[:, 0:3] = candidates(0, np.arange(len(objs)))
+
+        # Overlapping objects pushed apart within the ranges
+        if self.settings.scatter_relax:
+            offsets[:, 0:3] = self.relax(objs, base, offsets[:, 0:3], lower, upper, lambda scale: linear(offsets[:, 3:6], scale))
+
+        return offsets
+
+    # Scatter in world space and write the transforms in bulk
+    def replace_objects_world(self, objs, key_type):
+        plan = self.world_plan(objs, key_type)
+        if plan is None:
+            return
+
+        objs, transforms, base_location, base_rotation, location, rotation, quaternion, axis_angle = plan
+        transforms.write_world(location, rotation, quaternion, axis_angle)
+        # Only the euler rotations are kept in the base snapshot
+        euler = np.isin(transforms.rotation_modes, list(EULER_ORDERS))
+        self.keep_base([obj for obj, keep in zip(objs, euler.tolist()) if keep], base_location[euler], base_rotation[euler],
+                       transforms.location[euler], transforms.rotation[euler])
+
+    # New transforms of the objects by offsets along the world axes:
+    # (objects, WorldTransforms, base location, base rotation, location, rotation euler, quaternion, axis angle)
+    # The rotations are about the world location of each object. The new world matrices
+    # are brought back to the local transforms through the parent part of the world matrices
+    # (world = parent @ basis, the parent matrix with its parent inverse), all objects at once.
+    def world_plan(self, objs, key_type):
+        tops = top_objects(objs)
+        self.moved_with_parent = len(objs) - len(tops)
+        objs = tops
+        if len(objs) == 0 or len(self.scatter_ranges()) == 0:
+            return None
+
+        keys = np.array(stream_keys(objs, key_type), dtype=np.uint64)
+        transforms = WorldTransforms(objs)
+        modes = transforms.rotation_modes
+        # Objects with quaternions or axis angles scatter from their current transforms
+        euler = np.isin(modes, list(EULER_ORDERS))
+        base_location, base_rotation = self.base_transforms(objs, transforms)
+        base_location = np.where(euler[:, None], base_location, transforms.location)
+        base_rotation = np.where(euler[:, None], base_rotation, transforms.rotation)
+
+        # The basis is T(location + delta) @ delta rotation @ rotation @ S(scale * delta)
+        parent = transforms.matrix_world @ inverse_matrices(transforms.matrix_basis)
+        delta_rotation = transforms.delta_rotation_matrices()
+        scale = transforms.scale.astype(np.float64) * transforms.delta_scale
+        basis = transforms.matrix_basis.copy()
+        if self.settings.scatter_from_base:
+            for order in EULER_ORDERS:
+                pick = modes == order
+                if pick.any():
+                    rotation_matrix = euler_order_to_matrix(base_rotation[pick].astype(np.float64), order)
+                    basis[pick, 0:3, 0:3] = delta_rotation[pick] @ rotation_matrix * scale[pick, None, :]
+                    basis[pick, 0:3, 3] = base_location[pick] + transforms.delta_location[pick]
+        world = parent @ basis
+
+        world_linear = world[:, 0:3, 0:3].copy()
+        offsets = self.placed_offsets(objs, keys, world[:, 0:3, 3].copy(), lambda rotation, scale: euler_to_matrix(rotation) @ world_linear)
+        world[:, 0:3, 0:3] = euler_to_matrix(offsets[:, 3:6]) @ world[:, 0:3, 0:3]
+        world[:, 0:3, 3] += offsets[:, 0:3]
+        basis = inverse_matrices(parent) @ world
+
+        # Rotations without the deltas and the scale, in the rotation mode of each object
+        scale = np.where(scale == 0.0, 1.0, scale)
+        rotation_matrix = delta_rotation.transpose(0, 2, 1) @ (basis[:, 0:3, 0:3] / scale[:, None, :])
+        location = basis[:, 0:3, 3] - transforms.delta_location
+        rotation = transforms.rotation.astype(np.float64)
+        for order in EULER_ORDERS:
+            pick = modes == order
+            if pick.any():
+                rotation[pick] = matrix_to_euler_order(rotation_matrix[pick], order)
+
+        quaternion = None
+        axis_angle = None
+        pick = (modes == "QUATERNION") | (modes == "AXIS_ANGLE")
+        if pick.any():
+            quaternion = transforms.quaternion.astype(np.float64)
+            axis_angle = transforms.axis_angle.astype(np.float64)
+            new_quaternion = matrix_to_quaternion(rotation_matrix[pick])
+            # The sign nearest to the current quaternion
+            flip = (new_quaternion * quaternion[pick]).sum(axis=1) < 0.0
+            new_quaternion[flip] *= -1.0
+            quaternion[pick] = np.where((modes[pick] == "QUATERNION")[:, None], new_quaternion, quaternion[pick])
+            axis_angle[pick] = np.where((modes[pick] == "AXIS_ANGLE")[:, None], quaternion_to_axis_angle(new_quaternion), axis_angle[pick])
+
+        return objs, transforms, base_location, base_rotation, location, rotation, quaternion, axis_angle
+
+    # Relaxed location offsets of the objects.
+    # linear: function(scales) -> (N, 3, 3) matrices from object space to the space of the locations,
+    # the bounding spheres are moved to the bound centers and grown by the largest axis
+    def relax(self, objs, base, offsets, lower, upper, linear):
+        start = time.perf_counter()
+        local_centers, local_radii, scale = bounding_spheres(objs)
+        matrix = linear(scale)
+        shift = np.einsum("nij,nj->ni", matrix, local_centers)
+        radii = local_radii * np.linalg.norm(matrix, axis=1).max(axis=1)
+        centers, iterations, overlaps, builds = relax_overlaps(
+            base + offsets + shift, radii, base + lower + shift, base + upper + shift, self.settings.scatter_relax_iterations
+        )
+        self.relaxed = (iterations, overlaps, builds, time.perf_counter() - start)
+        return centers - shift - base
+
+    # Candidates of attempts by rejection sampling against a density
+    def density_candidates(self, candidates, density, keys):
+        self.accepted = np.zeros(len(keys), dtype=bool)
+        return density_rejection(candidates, density, self.settings.scatter_seed, keys, self.settings.scatter_max_attempts, self.accepted)
+
+    # Base transforms of the objects, the snapshot ones or the current ones
+    def base_transforms(self, objs, transforms):
+        if self.settings.scatter_from_base:
+            return base_snapshot.base(session_uids(objs), transforms.location, transforms.rotation)
+        return transforms.location, transforms.rotation
+
+    # Write transforms and keep the bases in the snapshot
+    def write_transforms(self, objs, transforms, base_location, base_rotation, location, rotation):
+        transforms.write(location, rotation)
+        self.keep_base(objs, base_location, base_rotation, transforms.location, transforms.rotation)
+
+    # Keep the bases and the written transforms (float32 as stored)
+    def keep_base(self, objs, base_location, base_rotation, location, rotation):
+        if self.settings.scatter_from_base:
+            base_snapshot.update(session_uids(objs), base_location, base_rotation, location, rotation)
+
+    # Place the objects on the target surface.
+    # The location ranges jitter the sampled points, which are projected back
+    # onto the surface. The rotation ranges are added (to the normal alignment).
+    def surface_plan(self, objs, key_type):
+        target = self.settings.scatter_target
+        objs = [obj for obj in objs if obj != target]
+        if len(objs) == 0:
+            return None
+
+        weight_group = self.settings.scatter_density_group if self.settings.scatter_density == "VERTEX_GROUP" else ""
+        surface = SurfaceSampler(target, bpy.context.evaluated_depsgraph_get(), weight_group)
+        if surface.is_empty():
+            self.report({'WARNING'}, f"{target.name} has no surface")
+            return None
+
+        keys = np.array(stream_keys(objs, key_type), dtype=np.uint64)
+        jitter = any(axis < 3 for axis, _, _, _ in self.scatter_ranges())
+        normals = np.zeros((len(objs), 3), dtype=np.float64)
+        triangles = np.zeros(len(objs), dtype=np.int64)
+
+        # Points (and their normals and triangles) of a counter
+        def candidates(counter, indices):
+            points, normals[indices], triangles[indices] = surface.sample(self.settings.scatter_seed, keys[indices], counter)
+            if jitter:
+                points, normals[indices], triangles[indices] = surface.project(points + self.random_offsets(keys[indices], counter)[:, 0:3])
+            return points
+
+        if self.settings.scatter_density == "IMAGE":
+            density = image_density(self.settings.scatter_density_image)
+            candidates = self.density_candidates(
+                candidates, lambda indices, values: image_density_at(density, values, surface.lower, surface.upper), keys
+            )
+        elif self.settings.scatter_density == "VERTEX_GROUP" and surface.weights is not None:
+            candidates = self.density_candidates(
+                candidates, lambda indices, values: surface.vertex_density(values, triangles[indices]), keys
+            )
+
+        if self.settings.scatter_min_distance > 0.0:
+            locations, placed = min_distance_offsets(
+                np.zeros((len(objs), 3), dtype=np.float64), candidates,
+                surface.lower, surface.upper, self.settings.scatter_min_distance, self.settings.scatter_max_attempts
+            )
+            self.unplaced = len(objs) - int(placed.sum())
+        else:
+            locations = candidates(0, np.arange(len(objs)))
+
+        transforms = BulkTransforms(objs)
+        base_location, base_rotation = self.base_transforms(objs, transforms)
+        offsets = self.random_offsets(keys)
+        if self.settings.scatter_align_normal:
+            rotations = matrix_to_euler(align_z_matrix(normals) @ euler_to_matrix(offsets[:, 3:6]))
+        else:
+            rotations = base_rotation + offsets[:, 3:6]
+
+        return objs, transforms, base_location, base_rotation, locations, rotations
+
+    # Place the objects along the curve at uniform or jittered arc lengths.
+    # The objects take the positions in the order of their stream keys. The location
+    # ranges jitter the points in the frame of the tangent (X across, Y along, Z up),
+    # the rotation ranges are added (to the tangent alignment).
+    def curve_plan(self, objs, key_type):
+        curve = self.settings.scatter_curve
+        objs = [obj for obj in objs if obj != curve]
+        if len(objs) == 0:
+            return None
+
+        path = curve_path(curve)
+        if path.is_empty():
+            self.report({'WARNING'}, f"{curve.name} has no length")
+            return None
+
+        keys = np.array(stream_keys(objs, key_type), dtype=np.uint64)
+        slots = np.empty(len(objs), dtype=np.float64)
+        slots[np.argsort(keys, kind = "stable")] = np.arange(len(objs))
+        if self.settings.scatter_curve_spacing == "JITTERED":
+            slots += random_values(self.settings.scatter_seed, keys, CURVE_AXIS)
+        else:
+            slots += 0.5
+        points, tangents = path.evaluate(slots / len(objs) * path.length)
+
+        frames = tangent_frames(tangents)
+        offsets = self.random_offsets(keys)
+        locations = points + np.einsum("nij,nj->ni", frames, offsets[:, 0:3])
+
+        transforms = BulkTransforms(objs)
+        base_location, base_rotation = self.base_transforms(objs, transforms)
+        if self.settings.scatter_align_tangent:
+            rotations = matrix_to_euler(frames @ euler_to_matrix(offsets[:, 3:6]))
+        else:
+            rotations = base_rotation + offsets[:, 3:6]
+
+        return objs, transforms, base_location, base_rotation, locations, rotations
+
+    # Scatter object by object, from the bases of the snapshot as the bulk path when NumPy is there
+    def replace_objects_each(self, objs, key_type):
         to_radian = math.pi / 180
-        for obj in bpy.context.selected_objects:
-            if obj.type in obj_types:
-                # Move X, Y, Z
-                scatter_m = -self.scatter_xm
-                scatter_p = self.scatter_xp
-                if scatter_m < scatter_p:
-                    mov = random.random() * (scatter_p - scatter_m) + scatter_m
-                    obj.location.x += mov
-
-                scatter_m = -self.scatter_ym
-                scatter_p = self.scatter_yp
-                if scatter_m < scatter_p:
-                    mov = random.random() * (scatter_p - scatter_m) + scatter_m
-                    obj.location.y += mov
-                    
-                scatter_m = -self.scatter_zm
-                scatter_p = self.scatter_zp
-                if scatter_m < scatter_p:
-                    mov = random.random() * (scatter_p - scatter_m) + scatter_m
-                    obj.location.z += mov
-
-                # Rotate X, Y, Z axis
-                scatter_m = -self.scatter_rxm
-                scatter_p = self.scatter_rxp
-                if scatter_m < scatter_p:
-                    rot = random.random() * (scatter_p - scatter_m) + scatter_m
-                    obj.rotation_euler.x += (rot * to_radian)
-
-                scatter_m = -self.scatter_rym
-                scatter_p = self.scatter_ryp
-                if scatter_m < scatter_p:
-                    rot = random.random() * (scatter_p - scatter_m) + scatter_m
-                    obj.rotation_euler.y += (rot * to_radian)
-
-                scatter_m = -self.scatter_rzm
-                scatter_p = self.scatter_rzp
-                if scatter_m < scatter_p:
-                    rot = random.random() * (scatter_p - scatter_m) + scatter_m
-                    obj.rotation_euler.z += (rot * to_radian)
-    
+        settings = self.settings
+        seed = settings.scatter_seed
+        use_base = settings.scatter_from_base and base_snapshot is not None and len(objs) > 0
+        if use_base:
+            location = np.array([obj.location[:] for obj in objs], dtype=np.float32)
+            rotation = np.array([obj.rotation_euler[:] for obj in objs], dtype=np.float32)
+            base_location, base_rotation = base_snapshot.base(session_uids(objs), location, rotation)
+            for obj, loc, rot in zip(objs, base_location.tolist(), base_rotation.tolist()):
+                obj.location = loc
+                obj.rotation_euler = rot
+
+        for obj, key in zip(objs, stream_keys(objs, key_type)):
+            # Move X, Y, Z
+            scatter_m = -settings.scatter_xm
+            scatter_p = settings.scatter_xp
+            if scatter_m < scatter_p:
+                mov = random_value(seed, key, 0) * (scatter_p - scatter_m) + scatter_m
+                obj.location.x += mov
+
+            scatter_m = -settings.scatter_ym
+            scatter_p = settings.scatter_yp
+            if scatter_m < scatter_p:
+                mov = random_value(seed, key, 1) * (scatter_p - scatter_m) + scatter_m
+                obj.location.y += mov
+                
+            scatter_m = -settings.scatter_zm
+            scatter_p = settings.scatter_zp
+            if scatter_m < scatter_p:
+                mov = random_value(seed, key, 2) * (scatter_p - scatter_m) + scatter_m
+                obj.location.z += mov
+
+            # Rotate X, Y, Z axis
+            scatter_m = -settings.scatter_rxm
+            scatter_p = settings.scatter_rxp
+            if scatter_m < scatter_p:
+                rot = random_value(seed, key, 3) * (scatter_p - scatter_m) + scatter_m
+                obj.rotation_euler.x += (rot * to_radian)
+
+            scatter_m = -settings.scatter_rym
+            scatter_p = settings.scatter_ryp
+            if scatter_m < scatter_p:
+                rot = random_value(seed, key, 4) * (scatter_p - scatter_m) + scatter_m
+                obj.rotation_euler.y += (rot * to_radian)
+
+            scatter_m = -settings.scatter_rzm
+            scatter_p = settings.scatter_rzp
+            if scatter_m < scatter_p:
+                rot = random_value(seed, key, 5) * (scatter_p - scatter_m) + scatter_m
+                obj.rotation_euler.z += (rot * to_radian)
+
+        if use_base:
+            location = np.array([obj.location[:] for obj in objs], dtype=np.float32)
+            rotation = np.array([obj.rotation_euler[:] for obj in objs], dtype=np.float32)
+            self.keep_base(objs, base_location, base_rotation, location, rotation)
+
+    # Frames of the animated scattering
+    def animation_frames(self):
+        settings = self.settings
+        return np.arange(settings.scatter_frame_start, settings.scatter_frame_end + 1, settings.scatter_frame_step)
+
+    # Offsets of all objects on all frames as a (F, N, 6) array.
+    # The frame is the counter of the streams, any frame range gets the same values on its frames.
+    def animated_offsets(self, keys, frames):
+        offsets = np.empty((len(frames), len(keys), 6), dtype=np.float64)
+        for idx, frame in enumerate(frames.tolist()):
+            offsets[idx] = self.random_offsets(keys, FRAME_COUNTER + frame)
+
+        if self.settings.scatter_smooth > 0:
+            for axis in range(6):
+                offsets[:, :, axis] = smooth_frames(offsets[:, :, axis], self.settings.scatter_smooth)
+        return offsets
+
+    # Bases of the animated objects: the base kept in their action, or the base snapshot
+    def animated_base(self, objs, transforms):
+        base_location, base_rotation = self.base_transforms(objs, transforms)
+        base_location = np.array(base_location, dtype=np.float32)
+        base_rotation = np.array(base_rotation, dtype=np.float32)
+        for idx, obj in enumerate(objs):
+            action = obj.animation_data.action if obj.animation_data is not None else None
+            base = action.get(ANIMATED_BASE_PROP) if action is not None else None
+            if base is not None and len(base) == 6:
+                base_location[idx] = base[0:3]
+                base_rotation[idx] = base[3:6]
+        return base_location, base_rotation
+
+    # Action of an object to key, its own copy when the action is shared
+    def object_action(self, obj):
+        if obj.animation_data is None:
+            obj.animation_data_create()
+        action = obj.animation_data.action
+        if action is None:
+            action = bpy.data.actions.new(f"{obj.name}Action")
+            obj.animation_data.action = action
+        elif action.users > 1:
+            action = action.copy()
+            obj.animation_data.action = action
+        return action
+
+    # Key the objects on the frames, one array for all keys.
+    # The location and rotation F-curves are replaced, the keys of an F-curve are written at once.
+    def replace_objects_animated(self, objs, key_type):
+        if len(objs) == 0 or len(self.scatter_ranges()) == 0:
+            return
+
+        start = time.perf_counter()
+        frames = self.animation_frames()
+        keys = np.array(stream_keys(objs, key_type), dtype=np.uint64)
+        transforms = BulkTransforms(objs)
+        base_location, base_rotation = self.animated_base(objs, transforms)
+        offsets = self.animated_offsets(keys, frames)
+
+        # (N, 6, F, 2) keys: frame, value
+        points = np.empty((len(objs), 6, len(frames), 2), dtype=np.float32)
+        points[:, :, :, 0] = frames
+        points[:, 0:3, :, 1] = (offsets[:, :, 0:3] + base_location).transpose(1, 2, 0)
+        points[:, 3:6, :, 1] = (offsets[:, :, 3:6] + base_rotation).transpose(1, 2, 0)
+
+        for obj, obj_points, location, rotation in zip(objs, points, base_location.tolist(), base_rotation.tolist()):
+            action = self.object_action(obj)
+            action[ANIMATED_BASE_PROP] = location + rotation
+            fcurves = action.fcurves
+            for curve_points, (data_path, index) in zip(obj_points, ANIMATED_CURVES):
+                fcurve = fcurves.find(data_path, index = index)
+                if fcurve is not None:
+                    fcurves.remove(fcurve)
+                fcurve = fcurves.new(data_path, index = index, action_group = "Object Transforms")
+                fcurve.keyframe_points.add(len(frames))
+                fcurve.keyframe_points.foreach_set("co", curve_points.ravel())
+                fcurve.update()
+
+        self.keyed = (len(objs), len(frames), time.perf_counter() - start)
+
+    # Error message of settings that can not be scattered, or None
+    def check_settings(self):
+        if self.settings.scatter_placement == "SURFACE":
+            target = self.settings.scatter_target
+            if np is None or target is None or target.type != 'MESH':
+                return "Surface placement needs NumPy and a target mesh"
+            if self.settings.scatter_relax:
+                self.report({'WARNING'}, "Relaxation is not used by the surface placement")
+
+        if self.settings.scatter_placement == "CURVE":
+            curve = self.settings.scatter_curve
+            if np is None or curve is None or curve.type != 'CURVE':
+                return "Curve placement needs NumPy and a curve object"
+            if self.settings.scatter_min_distance > 0.0 or self.settings.scatter_density != "NONE" or self.settings.scatter_relax:
+                self.report({'WARNING'}, "Minimum distance, density and relaxation are not used along a curve")
+
+        if self.settings.scatter_density == "IMAGE":
+            image = self.settings.scatter_density_image
+            if image is None:
+                return "No density image"
+            # Images of a missing file or not loaded have no pixels
+            if image.size[0] * image.size[1] == 0 or not image.has_data:
+                return f"Density image {image.name} has no pixels"
+
+        if self.settings.scatter_density == "VERTEX_GROUP" and self.settings.scatter_placement == "OFFSET" and not self.settings.scatter_animated:
+            self.report({'WARNING'}, "Vertex group density needs the surface placement, scattered without it")
+
+        if self.settings.scatter_animated:
+            if np is None or self.settings.scatter_placement != "OFFSET":
+                return "Animated scattering needs NumPy and the offset placement"
+            if self.settings.scatter_frame_end < self.settings.scatter_frame_start:
+                return "The end frame is before the start frame"
+            if self.settings.scatter_min_distance > 0.0 or self.settings.scatter_density != "NONE" or self.settings.scatter_relax:
+                self.report({'WARNING'}, "Minimum distance, density and relaxation are not used by the animated scattering")
+            if self.settings.scatter_space == "WORLD":
+                self.report({'WARNING'}, "World space is not used by the animated scattering, keyed in local space")
+        elif self.settings.scatter_space == "WORLD" and self.settings.scatter_placement == "OFFSET" and np is None:
+            return "World space needs NumPy"
+
+        if (self.settings.scatter_min_distance > 0.0 or self.settings.scatter_density != "NONE") and np is None:
+            self.report({'WARNING'}, "Minimum distance and density need NumPy, scattered without them")
+
+        return None
+
+    # Report objects which could not follow the settings
+    def report_results(self):
+        if self.keyed is not None:
+            self.report({'INFO'}, "{} objects x {} frames keyed in {:.2f} sec".format(*self.keyed))
+
+        if self.moved_with_parent > 0:
+            self.report({'INFO'}, f"{self.moved_with_parent} children of selected objects moved with their parents")
+
+        if self.relaxed is not None:
+            self.report({'INFO'}, "Relaxed in {} iterations, {} overlaps left, {} grid builds, {:.3f} sec".format(*self.relaxed))
+
+        if self.unplaced > 0:
+            self.report({'WARNING'}, f"{self.unplaced} objects could not keep the minimum distance")
+
+        if self.accepted is not None and not self.accepted.all():
+            self.report({'WARNING'}, f"{int((~self.accepted).sum())} objects found no place in the density map")
+
+# Addon class
+class OBJSCATTER_OT_ObjectsRandomScatter(ObjectsScatterBase, bpy.types.Operator):
+    bl_idname = "objects.random_scattering"
+    bl_label = "Scattering"
+    bl_description = "Objects Random Scattering"
+    bl_options = {"REGISTER", "UNDO"}
+
     # Run this addon
     def execute(self, context):
-        self.replace_all_objects_random(['MESH', 'CURVE'])
+        self.settings = context.scene.objects_scatter
+        error = self.check_settings()
+        if error is not None:
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
+        if self.settings.scatter_mode == "INSTANCE":
+            result = self.scatter_instances(context)
+            if result is None:
+                self.report({'ERROR'}, "No source to instance")
+                return {'CANCELLED'}
+            objs, instance_bytes, duplicate_bytes = result
+            self.report({'INFO'}, f"{len(objs)} instances: about {format_bytes(instance_bytes)} (duplicates: about {format_bytes(duplicate_bytes)})")
+        else:
+            self.replace_all_objects_random(['MESH', 'CURVE'])
+
+        self.report_results()
+        return {'FINISHED'}
+
+# Addon class, time-sliced for huge selections
+# The new transforms are computed at once, then written in chunks on timer
+# events. The chunk size follows the target time of a slice so the viewport
+# keeps responding. Esc writes the original transforms back.
+class OBJSCATTER_OT_ObjectsRandomScatterModal(ObjectsScatterBase, bpy.types.Operator):
+    bl_idname = "objects.random_scattering_modal"
+    bl_label = "Scattering (Modal)"
+    bl_description = "Objects Random Scattering in time slices with progress, Esc to cancel"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # Redo and scripts run at once
+    def execute(self, context):
+        return OBJSCATTER_OT_ObjectsRandomScatter.execute(self, context)
+
+    def invoke(self, context, event):
+        self.settings = context.scene.objects_scatter
+        error = self.check_settings()
+        if error is not None:
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
+        # Instances, keys, world space and the per-object path have nothing to slice
+        if self.settings.scatter_mode == "INSTANCE" or self.settings.scatter_animated or not self.use_bulk() \
+                or (self.settings.scatter_space == "WORLD" and self.settings.scatter_placement == "OFFSET"):
+            return self.execute(context)
+
+        self.unplaced = 0
+        self.accepted = None
+        self.keyed = None
+        self.relaxed = None
+        self.moved_with_parent = 0
+        objs = [obj for obj in context.selected_objects if obj.type in ['MESH', 'CURVE']]
+        plan = self.bulk_plan(objs, self.settings.scatter_stream_key)
+        if plan is None:
+            return {'FINISHED'}
+
+        self.objs, transforms, self.base_location, self.base_rotation, location, rotation = plan
+        self.location = location.astype(np.float32)
+        self.rotation = rotation.astype(np.float32)
+        self.original_location = transforms.location.tolist()
+        self.original_rotation = transforms.rotation.tolist()
+        self.new_location = self.location.tolist()
+        self.new_rotation = self.rotation.tolist()
+        self.done = 0
+        self.chunk = 256
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self.timer = wm.event_timer_add(0.001, window = context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.rollback()
+            self.finish(context)
+            self.report({'INFO'}, "Scattering cancelled")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # One slice
+        start = time.perf_counter()
+        end = min(self.done + self.chunk, len(self.objs))
+        for obj, loc, rot in zip(self.objs[self.done:end], self.new_location[self.done:end], self.new_rotation[self.done:end]):
+            obj.location = loc
+            obj.rotation_euler = rot
+        elapsed = time.perf_counter() - start
+        self.done = end
+
+        # Chunk size for the target time, at most twice or half at a time
+        ratio = self.settings.scatter_frame_ms / 1000.0 / max(elapsed, 1e-5)
+        self.chunk = int(min(max(self.chunk * min(max(ratio, 0.5), 2.0), 16), 1000000))
+
+        progress = self.done / len(self.objs)
+        context.window_manager.progress_update(progress * 100)
+        context.workspace.status_text_set(f"Scattering {self.done}/{len(self.objs)} ({progress:.0%}), Esc to cancel")
+
+        if self.done < len(self.objs):
+            return {'RUNNING_MODAL'}
+
+        self.keep_base(self.objs, self.base_location, self.base_rotation, self.location, self.rotation)
+        self.finish(context)
+        self.report_results()
+        return {'FINISHED'}
+
+    # Write the original transforms of the objects done so far
+    def rollback(self):
+        for obj, loc, rot in zip(self.objs[:self.done], self.original_location, self.original_rotation):
+            obj.location = loc
+            obj.rotation_euler = rot
+
+    def finish(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+# Reset scattered objects to their base transforms
+# It is one bulk write and does not push a scene undo step.
+class OBJSCATTER_OT_ResetToBase(bpy.types.Operator):
+    bl_idname = "objects.scatter_reset_base"
+    bl_label = "Reset to Base"
+    bl_description = "Reset the selected scattered objects to their transforms before scattering"
+    bl_options = {"REGISTER"}
+
+    @classmethod
+    def poll(cls, context):
+        return base_snapshot is not None and len(base_snapshot.uids) > 0
+
+    def execute(self, context):
+        objs = list(context.selected_objects)
+        rows = base_snapshot.rows(session_uids(objs))
+        objs = [obj for obj, row in zip(objs, rows.tolist()) if row >= 0]
+        rows = rows[rows >= 0]
+        if len(objs) == 0:
+            self.report({'INFO'}, "No scattered objects selected")
+            return {'CANCELLED'}
+
+        transforms = BulkTransforms(objs)
+        base_location = base_snapshot.base_location[rows]
+        base_rotation = base_snapshot.base_rotation[rows]
+        transforms.write(base_location, base_rotation)
+        base_snapshot.update(session_uids(objs), base_location, base_rotation, transforms.location, transforms.rotation)
+        self.report({'INFO'}, f"{len(objs)} objects reset")
+        return {'FINISHED'}
+
+# Export the transforms of the selected objects as a layout (.npz)
+class OBJSCATTER_OT_ExportLayout(bpy.types.Operator, ExportHelper):
+    bl_idname = "objects.scatter_layout_export"
+    bl_label = "Export Layout"
+    bl_description = "Export the transforms of the selected objects with the seed and the settings as a binary layout"
+    bl_options = {"REGISTER"}
+
+    filename_ext = ".npz"
+    filter_glob: bpy.props.StringProperty(default = "*.npz", options = {'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return np is not None
+
+    def execute(self, context):
+        settings = context.scene.objects_scatter
+        objs = [obj for obj in context.selected_objects if obj.type in ['MESH', 'CURVE']]
+        if len(objs) == 0:
+            self.report({'ERROR'}, "No objects to export")
+            return {'CANCELLED'}
+
+        try:
+            save_layout(self.filepath, objs, stream_keys(objs, settings.scatter_stream_key), settings)
+        except OSError as e:
+            self.report({'ERROR'}, f"Export failed: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Layout of {len(objs)} objects exported to {self.filepath}")
+        return {'FINISHED'}
+
+# Place objects by a layout (.npz), the file is memory-mapped and written in bulk
+class OBJSCATTER_OT_ImportLayout(bpy.types.Operator, ImportHelper):
+    bl_idname = "objects.scatter_layout_import"
+    bl_label = "Import Layout"
+    bl_description = "Place objects by the transforms of a binary layout"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filename_ext = ".npz"
+    filter_glob: bpy.props.StringProperty(default = "*.npz", options = {'HIDDEN'})
+
+    match: bpy.props.EnumProperty(
+        name = "Match",
+        description = "Objects to place",
+        items = [
+            ("NAME", "Name", "Objects of the file with the names of the layout"),
+            ("INDEX", "Index", "Selected objects in the order of the export"),
+        ],
+        default = "NAME"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return np is not None
+
+    def execute(self, context):
+        start = time.perf_counter()
+        try:
+            layout = load_layout(self.filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Import failed: {e}")
+            return {'CANCELLED'}
+
+        entries = len(layout["names"])
+        if self.match == "NAME":
+            all_objs = list(bpy.data.objects)
+            rows = layout_rows(layout, np.array([obj.name for obj in all_objs], dtype=np.str_))
+            indices = np.flatnonzero(rows >= 0)
+            rows = rows[indices]
+            objs = [all_objs[idx] for idx in indices.tolist()]
+        else:
+            objs = [obj for obj in context.selected_objects if obj.type in ['MESH', 'CURVE']][:entries]
+            rows = np.empty(entries, dtype=np.int64)
+            rows[layout["indices"]] = np.arange(entries)
+            rows = rows[:len(objs)]
+            indices = None
+
+        if len(objs) == 0:
+            self.report({'WARNING'}, "No objects match the layout")
+            return {'CANCELLED'}
+
+        transforms = BulkTransforms(objs, indices)
+        transforms.write(layout["location"][rows], layout["rotation"][rows])
+        self.report({'INFO'}, f"{len(objs)} of {entries} layout entries placed (seed {int(layout['seed'])}) "
+                              f"in {time.perf_counter() - start:.3f} sec")
         return {'FINISHED'}
 
 # Addon panel class
@@ -206,188 +2206,138 @@ class OBJSCATTER_PT_ObjectsRandomScatter(bpy.types.Panel):
         layout.label(text = "", icon="PLUGIN")
     
     # Draw addon panel contents
+    # The operators read the settings of the scene, nothing is copied to them.
     def draw(self, context):
         layout = self.layout
-        scene = context.scene
+        settings = context.scene.objects_scatter
 
-        row = layout.row()
-        op = row.operator(OBJSCATTER_OT_ObjectsRandomScatter.bl_idname, text = "SCATTER")
+        row = layout.row(align = True)
+        row.menu(OBJSCATTER_MT_Presets.__name__, text = OBJSCATTER_MT_Presets.bl_label)
+        row.operator(OBJSCATTER_OT_AddPreset.bl_idname, text = "", icon = "ADD")
+        row.operator(OBJSCATTER_OT_AddPreset.bl_idname, text = "", icon = "REMOVE").remove_active = True
 
-        op.scatter_xm = scene.scatter_xm
-        op.scatter_xp = scene.scatter_xp
-        op.scatter_rxm = scene.scatter_rxm
-        op.scatter_rxp = scene.scatter_rxp
-        
-        op.scatter_ym = scene.scatter_ym
-        op.scatter_xp = scene.scatter_yp
-        op.scatter_rym = scene.scatter_rym
-        op.scatter_ryp = scene.scatter_ryp
-        
-        op.scatter_zm = scene.scatter_zm
-        op.scatter_xp = scene.scatter_zp
-        op.scatter_rzm = scene.scatter_rzm
-        op.scatter_rzp = scene.scatter_rzp
+        row = layout.row()
+        if settings.scatter_modal:
+            row.operator(OBJSCATTER_OT_ObjectsRandomScatterModal.bl_idname, text = "SCATTER")
+        else:
+            row.operator(OBJSCATTER_OT_ObjectsRandomScatter.bl_idname, text = "SCATTER")
+        row.prop(settings, "scatter_modal", text = "", icon = "TIME")
+        row.operator(OBJSCATTER_OT_ResetToBase.bl_idname, text = "", icon = "LOOP_BACK")
+        row.operator(OBJSCATTER_OT_ExportLayout.bl_idname, text = "", icon = "EXPORT")
+        row.operator(OBJSCATTER_OT_ImportLayout.bl_idname, text = "", icon = "IMPORT")
+        if settings.scatter_modal:
+            layout.prop(settings, "scatter_frame_ms", text = "Slice ms")
 
         row = layout.row()
-        row.prop(scene, "scatter_xm", text = "-X")
-        row.prop(scene, "scatter_xp", text = "+X")
+        row.prop(settings, "scatter_xm", text = "-X")
+        row.prop(settings, "scatter_xp", text = "+X")
 
         row = layout.row()
-        row.prop(scene, "scatter_ym", text = "-Y")
-        row.prop(scene, "scatter_yp", text = "+Y")
+        row.prop(settings, "scatter_ym", text = "-Y")
+        row.prop(settings, "scatter_yp", text = "+Y")
 
         row = layout.row()
-        row.prop(scene, "scatter_zm", text = "-Z")
-        row.prop(scene, "scatter_zp", text = "+Z")
+        row.prop(settings, "scatter_zm", text = "-Z")
+        row.prop(settings, "scatter_zp", text = "+Z")
 
         row = layout.row()
-        row.prop(scene, "scatter_rxm", text = "-Xdeg")
-        row.prop(scene, "scatter_rxp", text = "+Xdeg")
+        row.prop(settings, "scatter_rxm", text = "-Xdeg")
+        row.prop(settings, "scatter_rxp", text = "+Xdeg")
         
         row = layout.row()
-        row.prop(scene, "scatter_rym", text = "-Ydeg")
-        row.prop(scene, "scatter_ryp", text = "+Ydeg")
+        row.prop(settings, "scatter_rym", text = "-Ydeg")
+        row.prop(settings, "scatter_ryp", text = "+Ydeg")
         
         row = layout.row()
-        row.prop(scene, "scatter_rzm", text = "-Zdeg")
-        row.prop(scene, "scatter_rzp", text = "+Zdeg")
-
-        # Set initial value to the operator
-        op.scatter_xm  = scene.scatter_xm
-        op.scatter_xp  = scene.scatter_xp
-        op.scatter_rxm = scene.scatter_rxm
-        op.scatter_rxp = scene.scatter_rxp
-        
-        op.scatter_ym  = scene.scatter_ym
-        op.scatter_yp  = scene.scatter_yp
-        op.scatter_rym = scene.scatter_rym
-        op.scatter_ryp = scene.scatter_ryp
-        
-        op.scatter_zm  = scene.scatter_zm
-        op.scatter_zp  = scene.scatter_zp
-        op.scatter_rzm = scene.scatter_rzm
-        op.scatter_rzp = scene.scatter_rzp
+        row.prop(settings, "scatter_rzm", text = "-Zdeg")
+        row.prop(settings, "scatter_rzp", text = "+Zdeg")
 
-def register_properties():
-    scene = bpy.types.Scene
-
-    scene.scatter_xm = bpy.props.FloatProperty(
-        name = "Scatter -X",
-        description = "Maximum scattering to -X",
-        default = 0.0,
-        min = 0.0,
-        max = 10000.0
-    )
-
-    scene.scatter_xp = bpy.props.FloatProperty(
-        name = "Scatter +X",
-        description = "Maximum scattering to +X",
-        default = 0.0,
-        min = 0.0,
-        max = 10000.0
-    )
-
-    scene.scatter_rxm = bpy.props.FloatProperty(
-        name = "Rotation -X",
-        description = "Maximum rotation angle -X",
-        default = 0.0,
-        min = 0.0,
-        max = 180.0
-    )
-
-    scene.scatter_rxp = bpy.props.FloatProperty(
-        name = "Rotation +X",
-        description = "Maximum rotation angle +X",
-        default = 0.0,
-        min = 0.0,
-        max = 180.0
-    )
-
-    scene.scatter_ym = bpy.props.FloatProperty(
-        name = "Scatter -Y",
-        description = "Maximum scattering to -Y",
-        default = 0.0,
-        min = 0.0,
-        max = 10000.0
-    )
+        row = layout.row()
+        row.prop(settings, "scatter_seed", text = "Seed")
+        row.prop(settings, "scatter_stream_key", text = "")
+        row.prop(settings, "scatter_bulk", text = "Bulk")
+        row.prop(settings, "scatter_from_base", text = "Base")
 
-    scene.scatter_yp = bpy.props.FloatProperty(
-        name = "Scatter +Y",
-        description = "Maximum scattering to +Y",
-        default = 0.0,
-        min = 0.0,
-        max = 10000.0
-    )
+        row = layout.row()
+        row.prop(settings, "scatter_min_distance", text = "Min Dist")
+        row.prop(settings, "scatter_max_attempts", text = "Attempts")
 
-    scene.scatter_rym = bpy.props.FloatProperty(
-        name = "Rotation -Y",
-        description = "Maximum rotation angle -Y",
-        default = 0.0,
-        min = 0.0,
-        max = 180.0
-    )
+        row = layout.row()
+        row.prop(settings, "scatter_relax", text = "Relax")
+        if settings.scatter_relax:
+            row.prop(settings, "scatter_relax_iterations", text = "Iterations")
 
-    scene.scatter_ryp = bpy.props.FloatProperty(
-        name = "Rotation +Y",
-        description = "Maximum rotation angle +Y",
-        default = 0.0,
-        min = 0.0,
-        max = 180.0
-    )
+        row = layout.row()
+        row.prop(settings, "scatter_animated", text = "Animated")
+        if settings.scatter_animated:
+            row.prop(settings, "scatter_smooth", text = "Smooth")
+            row = layout.row(align = True)
+            row.prop(settings, "scatter_frame_start", text = "Start")
+            row.prop(settings, "scatter_frame_end", text = "End")
+            row.prop(settings, "scatter_frame_step", text = "Step")
 
-    scene.scatter_zm = bpy.props.FloatProperty(
-        name = "Scatter -Z",
-        description = "Maximum scattering to -Z",
-        default = 0.0,
-        min = 0.0,
-        max = 10000.0
-    )
+        layout.prop(settings, "scatter_mode", expand = True)
+        if settings.scatter_mode == "INSTANCE":
+            row = layout.row()
+            row.prop(settings, "scatter_instance_type", text = "")
+            row.prop(settings, "scatter_count", text = "Count")
+            if settings.scatter_instance_type == "COLLECTION":
+                layout.prop(settings, "scatter_source_collection", text = "Source")
+            else:
+                layout.prop(settings, "scatter_source", text = "Source")
 
-    scene.scatter_zp = bpy.props.FloatProperty(
-        name = "Scatter +Z",
-        description = "Maximum scattering to +Z",
-        default = 0.0,
-        min = 0.0,
-        max = 10000.0
-    )
+        layout.prop(settings, "scatter_placement", expand = True)
+        if settings.scatter_placement == "SURFACE":
+            row = layout.row()
+            row.prop(settings, "scatter_target", text = "")
+            row.prop(settings, "scatter_align_normal", text = "Normal")
+        elif settings.scatter_placement == "CURVE":
+            row = layout.row()
+            row.prop(settings, "scatter_curve", text = "")
+            row.prop(settings, "scatter_curve_spacing", text = "")
+            row.prop(settings, "scatter_align_tangent", text = "Tangent")
+        else:
+            layout.prop(settings, "scatter_space", expand = True)
 
-    scene.scatter_rzm = bpy.props.FloatProperty(
-        name = "Rotation -Z",
-        description = "Maximum rotation angle -Z",
-        default = 0.0,
-        min = 0.0,
-        max = 180.0
-    )
+        row = layout.row()
+        row.prop(settings, "scatter_density", text = "Density")
+        if settings.scatter_density == "IMAGE":
+            row.prop(settings, "scatter_density_image", text = "")
+        elif settings.scatter_density == "VERTEX_GROUP":
+            if settings.scatter_target:
+                row.prop_search(settings, "scatter_density_group", settings.scatter_target, "vertex_groups", text = "")
+            else:
+                row.prop(settings, "scatter_density_group", text = "")
 
-    scene.scatter_rzp = bpy.props.FloatProperty(
-        name = "Rotation +Z",
-        description = "Maximum rotation angle +Z",
-        default = 0.0,
-        min = 0.0,
-        max = 180.0
-    )
+# Presets of the settings
+class OBJSCATTER_MT_Presets(bpy.types.Menu):
+    bl_label = "Scatter Presets"
+    preset_subdir = "objects_scatter"
+    preset_operator = "script.execute_preset"
+    draw = bpy.types.Menu.draw_preset
 
-def unregister_properties():
-    scene = bpy.types.Scene
-    del scene.scatter_xm
-    del scene.scatter_xp
-    del scene.scatter_rxm
-    del scene.scatter_rxp
-    del scene.scatter_ym
-    del scene.scatter_yp
-    del scene.scatter_rym
-    del scene.scatter_ryp
-    del scene.scatter_zm
-    del scene.scatter_zp
-    del scene.scatter_rzm
-    del scene.scatter_rzp
+class OBJSCATTER_OT_AddPreset(AddPresetBase, bpy.types.Operator):
+    bl_idname = "objects.scatter_preset_add"
+    bl_label = "Add Scatter Preset"
+    bl_description = "Add or remove a preset of the scattering settings"
+    preset_menu = "OBJSCATTER_MT_Presets"
+    preset_subdir = "objects_scatter"
+    preset_defines = ["settings = bpy.context.scene.objects_scatter"]
+    preset_values = [f"settings.{name}" for name in PRESET_SETTINGS]
 
 def menu_register_func(cls, context):
     cls.layout.separator()
     cls.layout.operator(OBJSCATTER_OT_ObjectsRandomScatter.bl_idname, icon = "PLUGIN")
 
 classes = [
+    ObjectsScatterSettings,
     OBJSCATTER_OT_ObjectsRandomScatter,
+    OBJSCATTER_OT_ObjectsRandomScatterModal,
+    OBJSCATTER_OT_ResetToBase,
+    OBJSCATTER_OT_ExportLayout,
+    OBJSCATTER_OT_ImportLayout,
+    OBJSCATTER_MT_Presets,
+    OBJSCATTER_OT_AddPreset,
     OBJSCATTER_PT_ObjectsRandomScatter,
 ]
 
@@ -396,11 +2346,19 @@ def register():
         bpy.utils.register_class(cls)
     
     bpy.types.VIEW3D_MT_transform_object.append(menu_register_func)
-    register_properties()
+    bpy.types.Scene.objects_scatter = PointerProperty(type = ObjectsScatterSettings)
+    bpy.app.handlers.load_post.append(clear_base_snapshot)
+    bpy.app.handlers.load_post.append(clear_curve_paths)
+    bpy.app.handlers.load_post.append(clear_vertex_weights)
+    bpy.app.handlers.depsgraph_update_post.append(scatter_depsgraph_update)
     print(f"Addon {bl_info['name']} is available.")
 
 def unregister():
-    unregister_properties()
+    bpy.app.handlers.depsgraph_update_post.remove(scatter_depsgraph_update)
+    bpy.app.handlers.load_post.remove(clear_vertex_weights)
+    bpy.app.handlers.load_post.remove(clear_curve_paths)
+    bpy.app.handlers.load_post.remove(clear_base_snapshot)
+    del bpy.types.Scene.objects_scatter
     bpy.types.VIEW3D_MT_transform_object.remove(menu_register_func)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
@@ -0,0 +1,200 @@
+##############################################################
+# Batch scatter for many .blend files
+#   Blender Version: 4.3.2
+#   Functions:
+#     - Run objects_scatter.py on .blend files in background Blender
+#       processes, some files at the same time.
+#     - Scatter parameters are given by a JSON file.
+#     - Results and timings of each file are written to a JSON file.
+#   Author: Shunsuke Ohira
+#   License: GPLv2
+#   Usage:
+#     blender --background --python objects_scatter_batch.py -- \
+#         --files a.blend b.blend --params params.json --jobs 8
+#     (python objects_scatter_batch.py ... works the same with --blender)
+#
+#   params.json: scatter settings of the scene and "select"
+#     {"scatter_xm": 2.0, "scatter_xp": 2.0, "scatter_seed": 1,
+#      "select": "ALL"}
+#     select: "ALL"               all objects in the view layer (default)
+#             "SELECTED"          objects selected in the file
+#             "COLLECTION:<name>" objects in the collection
+##############################################################
+import argparse, json, os, subprocess, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+
+# Runs in a background Blender (worker) or in any Python (driver only)
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+SCRIPT_PATH = os.path.abspath(__file__)
+
+# Command line arguments after "--" when run by Blender
+def parse_args(argv):
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    elif bpy is not None:
+        argv = []
+    else:
+        argv = argv[1:]
+
+    parser = argparse.ArgumentParser(description = "Scatter objects in many .blend files")
+    parser.add_argument("--files", nargs = "*", default = [], help = ".blend files")
+    parser.add_argument("--file-list", help = "text file with one .blend file per line")
+    parser.add_argument("--params", help = "JSON file of the scatter parameters")
+    parser.add_argument("--jobs", type = int, default = os.cpu_count() or 1, help = "Blender processes at the same time")
+    parser.add_argument("--output", default = "scatter_results.json", help = "JSON file of the results")
+    parser.add_argument("--output-dir", help = "directory to save the scattered files")
+    parser.add_argument("--in-place", action = "store_true", help = "overwrite the input files")
+    parser.add_argument("--blender", help = "Blender executable (default: this Blender, $BLENDER or blender)")
+    parser.add_argument("--timeout", type = float, default = None, help = "seconds per file")
+
+    # Worker arguments, given by the driver
+    parser.add_argument("--worker", action = "store_true", help = argparse.SUPPRESS)
+    parser.add_argument("--save-as", help = argparse.SUPPRESS)
+    parser.add_argument("--result", help = argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+# Blender executable for the workers
+def blender_path(args):
+    if args.blender:
+        return args.blender
+    if bpy is not None and bpy.app.binary_path:
+        return bpy.app.binary_path
+    return os.environ.get("BLENDER", "blender")
+
+# Path to save a scattered file
+def save_path(args, path):
+    if args.in_place:
+        return path
+    if args.output_dir:
+        return os.path.join(args.output_dir, os.path.basename(path))
+    root, ext = os.path.splitext(path)
+    return f"{root}_scattered{ext}"
+
+# Scatter one file in a background Blender process
+def run_file(args, path):
+    start = time.perf_counter()
+    result = {"file": path}
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = os.path.join(tmp, "result.json")
+        command = [
+            blender_path(args), "--background", "--factory-startup", path,
+            "--python", SCRIPT_PATH, "--",
+            "--worker", "--save-as", os.path.abspath(save_path(args, path)), "--result", result_path,
+        ]
+        if args.params:
+            command += ["--params", os.path.abspath(args.params)]
+
+        try:
+            proc = subprocess.run(command, capture_output = True, text = True, timeout = args.timeout)
+            result["returncode"] = proc.returncode
+            if os.path.exists(result_path):
+                with open(result_path) as f:
+                    result.update(json.load(f))
+            else:
+                result["status"] = "FAILED"
+                result["error"] = proc.stderr.strip()[-2000:]
+        except subprocess.TimeoutExpired:
+            result["status"] = "TIMEOUT"
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+# Scatter all files with a pool of Blender processes
+def run_driver(args):
+    files = list(args.files)
+    if args.file_list:
+        with open(args.file_list) as f:
+            files += [line.strip() for line in f if line.strip()]
+    if len(files) == 0:
+        print("No .blend files given")
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok = True)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = max(1, args.jobs)) as pool:
+        results = list(pool.map(lambda path: run_file(args, path), files))
+
+    report = {
+        "jobs": args.jobs,
+        "files": results,
+        "failed": sum(1 for result in results if result.get("status") != "FINISHED"),
+        "total_seconds": time.perf_counter() - start,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent = 2)
+
+    print(f"Scattered {len(files) - report['failed']}/{len(files)} files in {report['total_seconds']:.2f} sec")
+    return 0 if report["failed"] == 0 else 1
+
+# Objects to scatter by the "select" parameter
+def select_objects(select):
+    view_layer = bpy.context.view_layer
+    if select == "SELECTED":
+        return
+    if select.startswith("COLLECTION:"):
+        collection = bpy.data.collections[select[len("COLLECTION:"):]]
+        targets = set(collection.all_objects)
+    else:
+        targets = None
+
+    for obj in view_layer.objects:
+        obj.select_set(targets is None or obj in targets)
+
+# Scatter the opened file (in a background Blender), saved only when the operator finished
+def run_worker(args):
+    sys.path.insert(0, os.path.dirname(SCRIPT_PATH))
+    result = {"status": "FAILED"}
+    try:
+        import objects_scatter
+
+        params = {}
+        if args.params:
+            with open(args.params) as f:
+                params = json.load(f)
+        select = params.pop("select", "ALL")
+
+        objects_scatter.register()
+        start = time.perf_counter()
+        select_objects(select)
+        result["objects"] = len(bpy.context.selected_objects)
+        result["select_seconds"] = time.perf_counter() - start
+
+        # The operator reads the settings of the scene, data-blocks are given by name
+        objects_scatter.apply_settings(bpy.context.scene.objects_scatter, params)
+        start = time.perf_counter()
+        try:
+            status = bpy.ops.objects.random_scattering()
+        except RuntimeError as e:
+            # An error report of the operator is raised by bpy.ops
+            status = {'CANCELLED'}
+            result["error"] = str(e).strip()
+        result["scatter_seconds"] = time.perf_counter() - start
+        result["status"] = "".join(status)
+        if status != {'FINISHED'}:
+            result.setdefault("error", "The scattering was cancelled")
+        else:
+            start = time.perf_counter()
+            bpy.ops.wm.save_as_mainfile(filepath = args.save_as)
+            result["save_seconds"] = time.perf_counter() - start
+            result["saved"] = args.save_as
+    except Exception as e:
+        result["status"] = "FAILED"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    with open(args.result, "w") as f:
+        json.dump(result, f)
+
+def main():
+    args = parse_args(sys.argv)
+    if args.worker:
+        run_worker(args)
+        return 0
+    return run_driver(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
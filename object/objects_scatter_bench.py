@@ -0,0 +1,462 @@
+##############################################################
+# Benchmark of objects_scatter.py
+#   Blender Version: 4.3.2
+#   Functions:
+#     - Build synthetic scenes of 1k / 10k / 100k / 1M objects and time
+#       the scatter modes (per-object, bulk, minimum distance, surface,
+#       animated, overlap relaxation, world space, curve) and the import of
+#       a layout exported by the bulk mode.
+#     - Report objects/sec and peak memory as JSON.
+#     - Runs in background Blender, or in plain Python with a lightweight
+#       bpy stand-in (for CI without Blender, times the addon's Python
+#       side only, the stand-in has no real RNA cost).
+#   Author: Shunsuke Ohira
+#   License: GPLv2
+#   Usage:
+#     blender --background --factory-startup --python objects_scatter_bench.py -- \
+#         --sizes 1000 10000 100000 --output bench.json
+#     python objects_scatter_bench.py --sizes 1000 10000
+##############################################################
+import argparse, json, math, os, sys, tempfile, time, tracemalloc, types
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_MODES = ["EACH", "BULK", "MIN_DISTANCE", "SURFACE", "ANIMATED", "RELAX", "WORLD", "CURVE", "LAYOUT"]
+
+# Settings of each mode
+MODE_PROPERTIES = {
+    "EACH":         {"scatter_bulk": False},
+    "BULK":         {"scatter_bulk": True},
+    "MIN_DISTANCE": {"scatter_bulk": True, "scatter_min_distance": 0.1},
+    "SURFACE":      {"scatter_bulk": True, "scatter_placement": "SURFACE"},
+    "ANIMATED":     {"scatter_animated": True, "scatter_frame_start": 1, "scatter_frame_end": 250, "scatter_smooth": 2},
+    "RELAX":        {"scatter_bulk": True, "scatter_relax": True, "scatter_relax_iterations": 100},
+    "WORLD":        {"scatter_bulk": True, "scatter_space": "WORLD"},
+    "CURVE":        {"scatter_bulk": True, "scatter_placement": "CURVE", "scatter_curve_spacing": "JITTERED", "scatter_align_tangent": True},
+    "LAYOUT":       {"scatter_bulk": True},
+}
+
+# Ranges used by all modes
+SCATTER_PROPERTIES = {
+    "scatter_xm": 50.0, "scatter_xp": 50.0,
+    "scatter_ym": 50.0, "scatter_yp": 50.0,
+    "scatter_zm": 1.0, "scatter_zp": 1.0,
+    "scatter_rzm": 180.0, "scatter_rzp": 180.0,
+    "scatter_seed": 1,
+    "scatter_from_base": False,
+}
+
+### LIGHTWEIGHT BPY STAND-IN ###
+# Unknown names of a stand-in module are empty classes (bpy.types.*, mathutils.*)
+class StandInModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        cls = type(name, (), {})
+        setattr(self, name, cls)
+        return cls
+
+# Property definitions return their default value
+def stand_in_property(*args, **kwargs):
+    return kwargs.get("default")
+
+# Base of operators and panels: annotations (also of mixins) become class attributes
+class StandInStruct:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for base in reversed(cls.__mro__):
+            for name, value in base.__dict__.get("__annotations__", {}).items():
+                setattr(cls, name, value)
+
+    def report(self, level, message):
+        self.reports = getattr(self, "reports", []) + [(level, message)]
+
+# float[3] property of a stand-in object
+class StandInVector(list):
+    x = property(lambda self: self[0], lambda self, v: self.__setitem__(0, v))
+    y = property(lambda self: self[1], lambda self, v: self.__setitem__(1, v))
+    z = property(lambda self: self[2], lambda self, v: self.__setitem__(2, v))
+
+# Mesh shared by all stand-in objects, a unit triangle like the Blender scene
+class StandInMesh:
+    def as_pointer(self):
+        return id(self)
+
+class StandInObject:
+    _session_uid = 0
+    data = StandInMesh()
+    modifiers = ()
+    scale = (1.0, 1.0, 1.0)
+    bound_box = [(x, y, 0.0) for x in (0.0, 1.0) for y in (0.0, 1.0) for _ in range(2)]
+
+    def __init__(self, name, type = "MESH"):
+        StandInObject._session_uid += 1
+        self.session_uid = StandInObject._session_uid
+        self.name = name
+        self.type = type
+        self._location = StandInVector((0.0, 0.0, 0.0))
+        self._rotation = StandInVector((0.0, 0.0, 0.0))
+
+    location = property(lambda self: self._location, lambda self, v: setattr(self, "_location", StandInVector(v)))
+    rotation_euler = property(lambda self: self._rotation, lambda self, v: setattr(self, "_rotation", StandInVector(v)))
+
+    def as_pointer(self):
+        return id(self)
+
+    def update_tag(self, refresh = set()):
+        pass
+
+    animation_data = None
+
+    def animation_data_create(self):
+        self.animation_data = types.SimpleNamespace(action = None)
+        return self.animation_data
+
+# Keyframes of an F-curve kept as one array
+class StandInKeyframes:
+    def __init__(self):
+        self.co = []
+
+    def add(self, count):
+        self.co = [0.0] * (count * 2)
+
+    def foreach_set(self, name, buffer):
+        self.co[:] = buffer.tolist() if hasattr(buffer, "tolist") else list(buffer)
+
+class StandInFCurve:
+    def __init__(self, data_path, index):
+        self.data_path = data_path
+        self.array_index = index
+        self.keyframe_points = StandInKeyframes()
+
+    def update(self):
+        pass
+
+class StandInFCurves(list):
+    def find(self, data_path, index = 0):
+        for fcurve in self:
+            if fcurve.data_path == data_path and fcurve.array_index == index:
+                return fcurve
+        return None
+
+    def new(self, data_path, index = 0, action_group = ""):
+        self.append(StandInFCurve(data_path, index))
+        return self[-1]
+
+class StandInAction(dict):
+    users = 1
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.fcurves = StandInFCurves()
+
+class StandInActions(list):
+    def new(self, name):
+        self.append(StandInAction(name))
+        return self[-1]
+
+# Points of a poly spline
+class StandInPoints(list):
+    def foreach_get(self, name, buffer):
+        buffer[:] = [v for point in self for v in getattr(point, name)]
+
+# Curve object of the curve mode, a circle of poly points
+def stand_in_path(radius, count):
+    points = StandInPoints(
+        types.SimpleNamespace(co = (radius * math.cos(angle), radius * math.sin(angle), 0.0, 1.0))
+        for angle in (2.0 * math.pi * idx / count for idx in range(count))
+    )
+    path = StandInObject("BenchPath", "CURVE")
+    path.data = types.SimpleNamespace(name = "BenchPath", splines = [
+        types.SimpleNamespace(type = "POLY", use_cyclic_u = True, resolution_u = 12, points = points)
+    ])
+    path.matrix_world = [[1.0 if row == col else 0.0 for col in range(4)] for row in range(4)]
+    return path
+
+# bpy.data.objects with foreach_get/set of float[3] properties
+class StandInObjects(list):
+    attributes = {"location": "_location", "rotation_euler": "_rotation"}
+
+    def foreach_get(self, name, buffer):
+        attr = self.attributes[name]
+        buffer[:] = [v for obj in self for v in getattr(obj, attr)]
+
+    def foreach_set(self, name, buffer):
+        attr = self.attributes[name]
+        values = buffer.tolist() if hasattr(buffer, "tolist") else list(buffer)
+        for idx, obj in enumerate(self):
+            setattr(obj, attr, StandInVector(values[idx * 3:idx * 3 + 3]))
+
+    def get(self, name, default = None):
+        for obj in self:
+            if obj.name == name:
+                return obj
+        return default
+
+# Install the stand-in as bpy, bpy_extras and mathutils
+def install_stand_in():
+    modules = {}
+    for name in ["bpy", "bpy.props", "bpy.types", "bpy.app", "bpy.app.handlers",
+                 "bpy_extras", "bpy_extras.object_utils", "bpy_extras.io_utils", "bl_operators", "bl_operators.presets",
+                 "mathutils", "mathutils.bvhtree", "mathutils.kdtree"]:
+        modules[name] = StandInModule(name)
+
+    bpy = modules["bpy"]
+    for name in ["BoolProperty", "IntProperty", "FloatProperty", "FloatVectorProperty", "EnumProperty",
+                 "StringProperty", "PointerProperty", "CollectionProperty"]:
+        setattr(modules["bpy.props"], name, stand_in_property)
+    for name in ["Operator", "Panel", "Menu", "PropertyGroup", "UIList"]:
+        setattr(modules["bpy.types"], name, type(name, (StandInStruct,), {}))
+    modules["bpy.types"].Menu.draw_preset = lambda self, context: None
+    modules["bpy.app.handlers"].persistent = lambda func: func
+    for name in ["load_post", "depsgraph_update_post", "depsgraph_update_pre"]:
+        setattr(modules["bpy.app.handlers"], name, [])
+    modules["bpy.app"].handlers = modules["bpy.app.handlers"]
+    modules["bpy.app"].background = True
+
+    bpy.props = modules["bpy.props"]
+    bpy.types = modules["bpy.types"]
+    bpy.app = modules["bpy.app"]
+    bpy.data = types.SimpleNamespace(objects = StandInObjects(), collections = {}, images = {}, actions = StandInActions())
+    bpy.context = types.SimpleNamespace(selected_objects = [], scene = None, view_layer = None)
+    modules["bpy_extras"].object_utils = modules["bpy_extras.object_utils"]
+    modules["bpy_extras"].io_utils = modules["bpy_extras.io_utils"]
+    modules["bl_operators"].presets = modules["bl_operators.presets"]
+    modules["mathutils"].bvhtree = modules["mathutils.bvhtree"]
+    modules["mathutils"].kdtree = modules["mathutils.kdtree"]
+    sys.modules.update(modules)
+    return bpy
+
+### SCENES ###
+# A scene of count objects, all selected
+class StandInScene:
+    supports = {"EACH", "BULK", "MIN_DISTANCE", "ANIMATED", "RELAX", "CURVE", "LAYOUT"}
+
+    def __init__(self, bpy, count):
+        self.bpy = bpy
+        objs = StandInObjects(StandInObject(f"Bench.{idx:07d}") for idx in range(count))
+        bpy.data.objects = objs
+        bpy.context.selected_objects = list(objs)
+        objs.append(stand_in_path(100.0, 64))
+
+    def reset(self):
+        for obj in self.bpy.data.objects:
+            obj.location = (0.0, 0.0, 0.0)
+            obj.rotation_euler = (0.0, 0.0, 0.0)
+
+    def run(self, module, props):
+        if props.get("scatter_placement") == "CURVE":
+            props = dict(props, scatter_curve = "BenchPath")
+        settings = module.ObjectsScatterSettings()
+        module.apply_settings(settings, props)
+        self.bpy.context.scene = types.SimpleNamespace(objects_scatter = settings)
+        return module.OBJSCATTER_OT_ObjectsRandomScatter().execute(self.bpy.context)
+
+    def export_layout(self, module, path):
+        op = module.OBJSCATTER_OT_ExportLayout()
+        op.filepath = path
+        return op.execute(self.bpy.context)
+
+    def import_layout(self, module, path):
+        op = module.OBJSCATTER_OT_ImportLayout()
+        op.filepath = path
+        return op.execute(self.bpy.context)
+
+    def clear(self):
+        self.bpy.data.objects = StandInObjects()
+        self.bpy.data.actions = StandInActions()
+        self.bpy.context.selected_objects = []
+
+class BlenderScene:
+    supports = set(DEFAULT_MODES)
+
+    def __init__(self, bpy, count):
+        import numpy as np
+        self.bpy = bpy
+        self.np = np
+
+        # Objects sharing one small mesh
+        mesh = bpy.data.meshes.new("Bench")
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+        self.collection = bpy.data.collections.new("Bench")
+        bpy.context.scene.collection.children.link(self.collection)
+        link = self.collection.objects.link
+        new_object = bpy.data.objects.new
+        for idx in range(count):
+            link(new_object(f"Bench.{idx:07d}", mesh))
+
+        # Target grid of the surface mode
+        size = 200
+        verts = [(x - size / 2, y - size / 2, 0.0) for y in range(size + 1) for x in range(size + 1)]
+        faces = [(y * (size + 1) + x, y * (size + 1) + x + 1, (y + 1) * (size + 1) + x + 1, (y + 1) * (size + 1) + x)
+                 for y in range(size) for x in range(size)]
+        ground = bpy.data.meshes.new("BenchGround")
+        ground.from_pydata(verts, [], faces)
+        self.target = new_object("BenchGround", ground)
+        bpy.context.scene.collection.objects.link(self.target)
+
+        # Path of the curve mode, a circle of poly points
+        curve = bpy.data.curves.new("BenchPath", 'CURVE')
+        spline = curve.splines.new('POLY')
+        spline.points.add(63)
+        angles = self.np.linspace(0.0, 2.0 * math.pi, 64, endpoint = False)
+        co = self.np.stack((100.0 * self.np.cos(angles), 100.0 * self.np.sin(angles),
+                            self.np.zeros(64), self.np.ones(64)), axis=1)
+        spline.points.foreach_set("co", co.astype(self.np.float32).ravel())
+        spline.use_cyclic_u = True
+        self.path = new_object("BenchPath", curve)
+        bpy.context.scene.collection.objects.link(self.path)
+
+        for obj in bpy.context.view_layer.objects:
+            obj.select_set(obj.name.startswith("Bench."))
+
+    def reset(self):
+        objs = self.bpy.data.objects
+        zeros = self.np.zeros(len(objs) * 3, dtype=self.np.float32)
+        objs.foreach_set("location", zeros)
+        objs.foreach_set("rotation_euler", zeros)
+
+    def run(self, module, props):
+        if props.get("scatter_placement") == "SURFACE":
+            props = dict(props, scatter_target = self.target.name)
+        elif props.get("scatter_placement") == "CURVE":
+            props = dict(props, scatter_curve = self.path.name)
+        module.apply_settings(self.bpy.context.scene.objects_scatter, props)
+        return self.bpy.ops.objects.random_scattering()
+
+    def export_layout(self, module, path):
+        return self.bpy.ops.objects.scatter_layout_export(filepath = path)
+
+    def import_layout(self, module, path):
+        return self.bpy.ops.objects.scatter_layout_import(filepath = path)
+
+    def clear(self):
+        bpy = self.bpy
+        actions = [obj.animation_data.action for obj in self.collection.objects
+                   if obj.animation_data is not None and obj.animation_data.action is not None]
+        bpy.data.batch_remove(list(self.collection.objects) + [self.target, self.path, self.collection] + actions)
+        for mesh in [mesh for mesh in bpy.data.meshes if mesh.users == 0]:
+            bpy.data.meshes.remove(mesh)
+        for curve in [curve for curve in bpy.data.curves if curve.users == 0]:
+            bpy.data.curves.remove(curve)
+
+### BENCHMARK ###
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+# Best time of some runs, then one run under tracemalloc for the peak memory
+def bench_mode(scene, module, count, mode, repeat):
+    props = dict(SCATTER_PROPERTIES, **MODE_PROPERTIES[mode])
+    if mode == "RELAX":
+        # Ranges growing with the count, the bounding spheres cover about 40% of the area
+        extent = math.sqrt(count) * 2.0
+        props.update(scatter_xm = extent, scatter_xp = extent, scatter_ym = extent, scatter_yp = extent)
+
+    # The layout mode times the import of a layout of a bulk scattering
+    if mode == "LAYOUT":
+        path = os.path.join(tempfile.gettempdir(), "objects_scatter_bench.npz")
+        scene.reset()
+        scene.run(module, props)
+        scene.export_layout(module, path)
+        run = lambda: scene.import_layout(module, path)
+    else:
+        run = lambda: scene.run(module, props)
+
+    times = []
+    for _ in range(repeat):
+        scene.reset()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    scene.reset()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(times)
+    return {
+        "mode": mode,
+        "objects": count,
+        "seconds": best,
+        "objects_per_sec": count / best if best > 0 else None,
+        "peak_python_mb": peak / (1024 * 1024),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def parse_args(argv):
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = argv[1:] if "bpy" not in sys.modules else []
+
+    parser = argparse.ArgumentParser(description = "Benchmark of objects_scatter.py")
+    parser.add_argument("--sizes", type = int, nargs = "*", default = DEFAULT_SIZES)
+    parser.add_argument("--modes", nargs = "*", default = DEFAULT_MODES, choices = DEFAULT_MODES)
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--max-each", type = int, default = 100000, help = "largest size of the per-object mode")
+    parser.add_argument("--max-animated", type = int, default = 10000, help = "largest size of the animated mode (250 frames)")
+    parser.add_argument("--max-relax", type = int, default = 100000, help = "largest size of the relaxation mode")
+    parser.add_argument("--stand-in", action = "store_true", help = "use the bpy stand-in in Blender too")
+    parser.add_argument("--output", help = "JSON file (default: stdout)")
+    return parser.parse_args(argv)
+
+def main():
+    try:
+        import bpy
+        in_blender = hasattr(bpy, "ops")
+    except ImportError:
+        in_blender = False
+
+    args = parse_args(sys.argv)
+    if not in_blender or args.stand_in:
+        for name in [name for name in sys.modules if name.split(".")[0] in ("bpy", "bpy_extras", "bl_operators", "mathutils")]:
+            del sys.modules[name]
+        bpy = install_stand_in()
+        scene_class = StandInScene
+    else:
+        scene_class = BlenderScene
+
+    sys.path.insert(0, SCRIPT_DIR)
+    import objects_scatter
+    if scene_class is BlenderScene:
+        objects_scatter.register()
+
+    results = []
+    for count in args.sizes:
+        scene = scene_class(bpy, count)
+        for mode in args.modes:
+            if mode not in scene.supports or (mode == "EACH" and count > args.max_each) \
+                    or (mode == "ANIMATED" and count > args.max_animated) \
+                    or (mode == "RELAX" and count > args.max_relax):
+                results.append({"mode": mode, "objects": count, "skipped": True})
+                continue
+            results.append(bench_mode(scene, objects_scatter, count, mode, args.repeat))
+            print(f"{mode:>12} {count:>8} objects: {results[-1]['seconds']:.3f} sec", file = sys.stderr)
+        scene.clear()
+
+    report = {
+        "addon_version": list(objects_scatter.bl_info["version"]),
+        "backend": "blender" if scene_class is BlenderScene else "stand-in",
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    text = json.dumps(report, indent = 2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,48 @@
 #   Target: Shader Editor > Tool
 #   Functions:
 #     - Create nodes for calculating cylindrical coordinates.
+#     - Polar, spherical, toroidal, log-polar and JSON templates.
 #   Author: Shunsuke Ohira
 #   License: GPLv2
 #   Addon Version:
 #     0.1.0: 2025/03/05
 #          - Cylindrical coordinates
 #          - Polar coordinates
+#     0.2.0: 2026/10/18
+#          - Coordinates nodes in a cached node group, one group node per material
+#          - Template optimizer (dead nodes, common nodes, ARCTAN2 and LENGTH)
+#          - Batch apply to the materials of the selected objects or all materials
+#          - Bake mode, coordinates of the vertices into a point attribute by NumPy
+#          - Template registry (built-in and JSON files) compiled once on register
+#          - Spherical, toroidal and log-polar coordinates
+#          - Inserted nodes found by fingerprint, reused or updated instead of duplicated
+#          - Cost of the inserted nodes, Cycles render timing and JSON export
+#          - Bulk construction of the nodes with fewer RNA accesses
+#          - Settings in one property group of the scene, presets
 ##############################################################
 import bpy
+import hashlib, json, math, os, time
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from bpy.props import (
     IntProperty,
     FloatProperty,
     FloatVectorProperty,
     EnumProperty,
     BoolProperty,
+    StringProperty,
+    PointerProperty,
 )
+from bpy_extras.io_utils import ExportHelper
+from bl_operators.presets import AddPresetBase
 
 # Addon information
 bl_info = {
     "name": "Add Coordinates Nodes",
     "author": "Shunsuke Ohira",
-    "version": (0, 1, 0),
+    "version": (0, 2, 0),
     "blender": (4, 3, 2),
     "location": "シェーダーエディター",
     "description": "Add Coordinates Nodes",
@@ -35,58 +56,435 @@ bl_info = {
     "category": "Shader",
 }
 
-# Panel class
-class NodeCoordinatesNoePanel(bpy.types.Panel):
-    # Panel information
-    bl_idname = "NODE_PT_CoordinatesNodes"
-    bl_space_type = 'NODE_EDITOR'
-    bl_label = "Add Corrdinates Nodes"
-    bl_region_type = "UI"
-    bl_category = "Tool"
+# Version of the node templates, rebuild the node groups when changed
+TEMPLATE_VERSION = 1
 
-    # Drawing panel
-    def draw(self, context):
-        # Draw on the Shader Editor Node Tree
-        material = context.material
-        if hasattr(material, 'node_tree'):
-            node_tree = material.node_tree
-            layout = self.layout
-            scene = context.scene
+# Custom properties of the coordinates node groups, the type also marks the inserted output nodes
+GROUP_TYPE_PROP = "coordinates_type"
+GROUP_KEY_PROP = "coordinates_key"
 
-            # Place a label on this panel
-            layout.label(text="Coordinates Type:")
+# Custom property of a node tree: name of the output node of the inserted nodes, by coordinates type
+INDEX_PROP = "coordinates_nodes"
+# Custom property of a node tree: fingerprint of the output node when it was inserted, by coordinates type
+INDEX_FINGERPRINT_PROP = "coordinates_fingerprints"
 
-            # Place a property (Dropdown list with an enum)
-            layout.prop(scene, "NodeCoordinates_type_prop_enum", text="Type")
+# Node group name of each coordinates type (found again by the custom property)
+node_group_names = {}
 
-            # Place a button to execute an operator
-            op = layout.operator(NODE_OT_CoordinatesNodes.bl_idname, text = "Create Nodes")
-            
-            # Set initial value of the dropdown list to the operator
-            op.NodeCoordinates_type_prop_enum = scene.NodeCoordinates_type_prop_enum
+# Nodes without side inputs, the same inputs give the same outputs
+PURE_NODES = {"ShaderNodeMath", "ShaderNodeVectorMath", "ShaderNodeSeparateXYZ", "ShaderNodeCombineXYZ"}
 
-# Operator class
-class NODE_OT_CoordinatesNodes(bpy.types.Operator):
-    # Operator information
-    bl_idname = "nodetree.coordinatesnode"
-    bl_label = "Add corrdinates nodes"
-    bl_desicription = "Add corrdinates nodes"
-    bl_options = {"REGISTER", "UNDO"}
+# Math operations where the first two inputs can be swapped
+COMMUTATIVE_OPERATIONS = {"ADD", "MULTIPLY", "MINIMUM", "MAXIMUM"}
 
-    # Dropdown list to choose a coordinates to create nodes
-    NodeCoordinates_type_prop_enum : EnumProperty(
-        name="Types",
-        description="Enum Property",
-        items=[
-            ('ITEM_1', "Cylindrical", "Cylindrical Coordinates"),
-            ('ITEM_2', "Polar", "Polar Coordinates"),
-        ],
-        default='ITEM_1'
-    )
+# Required fields of a template, of its nodes and of its links
+TEMPLATE_FIELDS = ["Type", "Nodes", "Links"]
+NODE_FIELDS = ["ID", "Node", "Location"]
+LINK_FIELDS = ["From", "To"]
+MATH_NODES = {"ShaderNodeMath", "ShaderNodeVectorMath"}
+
+# Check the required fields of a template, the compile looks them up without checking
+def validate_template(data):
+    if not isinstance(data, dict):
+        raise ValueError("Not a template object")
+    for field in TEMPLATE_FIELDS:
+        if field not in data:
+            raise ValueError(f"No {field}")
+    for items, fields, kind in [(data["Nodes"], NODE_FIELDS, "node"), (data["Links"], LINK_FIELDS, "link")]:
+        for idx, item in enumerate(items):
+            if not isinstance(item, dict):
+                raise ValueError(f"{kind.title()} {idx} is not an object")
+            for field in fields:
+                if field not in item:
+                    raise ValueError(f"No {field} in {kind} {idx}")
+            if kind == "node" and item["Node"] in MATH_NODES and "Operation" not in item:
+                raise ValueError(f"No Operation in node {idx}")
+
+# Graph of a template: nodes by ID and the linked source (ID, output) of each input
+def template_graph(node_list, link_list):
+    nodes = {}
+    for node_data in node_list:
+        if node_data["ID"] in nodes:
+            raise ValueError(f"Duplicate node ID: {node_data['ID']}")
+        if "Location" not in node_data:
+            raise ValueError(f"No location: {node_data['ID']}")
+        nodes[node_data["ID"]] = dict(node_data)
+
+    sources = {node_id: {} for node_id in nodes}
+    invalid_links = 0
+    for linker in link_list:
+        from_id, from_idx = linker["From"]
+        to_id, to_idx = linker["To"]
+        if from_id not in nodes or to_id not in nodes or from_idx < 0 or to_idx < 0:
+            invalid_links += 1
+            continue
+        # A later link to the same input replaces the former one as links.new does
+        sources[to_id][to_idx] = (from_id, from_idx)
+
+    return nodes, sources, invalid_links
+
+# Operation of a source when it is the output of a math node
+def source_operation(nodes, source):
+    if source is None or source[1] != 0:
+        return None
+    node_data = nodes[source[0]]
+    if node_data["Node"] != "ShaderNodeMath":
+        return None
+    return node_data["Operation"]
+
+# Default value of an unlinked input
+def input_value(node_data, idx):
+    inputs = node_data.get("Inputs", [])
+    return inputs[idx] if idx < len(inputs) else None
+
+# Base of a square (POWER by 2 or MULTIPLY by itself), or None
+def square_base(nodes, sources, source):
+    operation = source_operation(nodes, source)
+    node_sources = sources[source[0]] if operation else {}
+    if operation == "POWER" and 0 in node_sources and 1 not in node_sources:
+        if input_value(nodes[source[0]], 1) == 2.0:
+            return node_sources[0]
+    if operation == "MULTIPLY" and node_sources.get(0) is not None and node_sources.get(0) == node_sources.get(1):
+        return node_sources[0]
+    return None
+
+# Bases of a sum of squares, or None
+def square_terms(nodes, sources, source):
+    base = square_base(nodes, sources, source)
+    if base is not None:
+        return [base]
+    if source_operation(nodes, source) != "ADD" or len(sources[source[0]]) != 2:
+        return None
+    terms = []
+    for idx in (0, 1):
+        sub_terms = square_terms(nodes, sources, sources[source[0]][idx])
+        if sub_terms is None:
+            return None
+        terms += sub_terms
+    return terms
+
+# Link consumers of an output to another output
+def redirect(sources, old, new):
+    for node_sources in sources.values():
+        for idx, source in node_sources.items():
+            if source == old:
+                node_sources[idx] = new
+
+# SGN(Y)*ACOS(X/SQRT(X^2+Y^2)) to ARCTAN2(Y, X)
+def rewrite_arctan2(nodes, sources, order):
+    count = 0
+    for node_id in order:
+        node_data = nodes[node_id]
+        if node_data["Node"] != "ShaderNodeMath" or node_data["Operation"] != "MULTIPLY":
+            continue
+        node_sources = sources[node_id]
+        for sign_idx, acos_idx in ((0, 1), (1, 0)):
+            sign, acos = node_sources.get(sign_idx), node_sources.get(acos_idx)
+            if source_operation(nodes, sign) != "SIGN" or source_operation(nodes, acos) != "ARCCOSINE":
+                continue
+            y = sources[sign[0]].get(0)
+            divide = sources[acos[0]].get(0)
+            if source_operation(nodes, divide) != "DIVIDE":
+                continue
+            x = sources[divide[0]].get(0)
+            sqrt = sources[divide[0]].get(1)
+            if source_operation(nodes, sqrt) != "SQRT":
+                continue
+            terms = square_terms(nodes, sources, sources[sqrt[0]].get(0))
+            if y is None or x is None or terms is None or sorted(terms) != sorted([x, y]):
+                continue
+
+            node_data["Operation"] = "ARCTAN2"
+            node_data["Inputs"] = []
+            sources[node_id] = {0: y, 1: x}
+            count += 1
+            break
+    return count
+
+# SQRT of a sum of 2 or 3 squares to the LENGTH of a vector
+def rewrite_length(nodes, sources, order):
+    count = 0
+    for node_id in list(order):
+        node_data = nodes[node_id]
+        if node_data["Node"] != "ShaderNodeMath" or node_data["Operation"] != "SQRT":
+            continue
+        terms = square_terms(nodes, sources, sources[node_id].get(0))
+        if terms is None or not 2 <= len(terms) <= 3:
+            continue
+
+        # X, Y, Z of the same vector, its length directly
+        separate = terms[0][0]
+        if sorted(terms) == [(separate, 0), (separate, 1), (separate, 2)] \
+                and nodes[separate]["Node"] == "ShaderNodeSeparateXYZ" and 0 in sources[separate]:
+            vector = sources[separate][0]
+        else:
+            combine_id = f"CombineXYZ({node_id})"
+            loc = node_data["Location"]
+            nodes[combine_id] = {"ID": combine_id, "Node": "ShaderNodeCombineXYZ", "Location": (loc[0] - 0.5, loc[1] - 0.5)}
+            sources[combine_id] = dict(enumerate(terms))
+            order.insert(order.index(node_id), combine_id)
+            vector = (combine_id, 0)
+
+        node_data["Node"] = "ShaderNodeVectorMath"
+        node_data["Operation"] = "LENGTH"
+        node_data["Inputs"] = []
+        sources[node_id] = {0: vector}
+        # Length is the second (Value) output of the vector math node
+        redirect(sources, (node_id, 0), (node_id, 1))
+        count += 1
+    return count
+
+# Merge nodes of the same type, operation and inputs, merged nodes leave the order
+def merge_common(nodes, sources, order):
+    count = 0
+    changed = True
+    while changed:
+        changed = False
+        signatures = {}
+        for node_id in list(order):
+            node_data = nodes[node_id]
+            if node_id not in sources or node_data["Node"] not in PURE_NODES:
+                continue
+            linked = dict(sources[node_id])
+            if node_data.get("Operation") in COMMUTATIVE_OPERATIONS and 0 in linked and 1 in linked:
+                linked[0], linked[1] = sorted([linked[0], linked[1]])
+            signature = (
+                node_data["Node"], node_data.get("Operation"),
+                # Vector defaults are lists in JSON templates
+                tuple(tuple(value) if isinstance(value, list) else value for value in node_data.get("Inputs", [])),
+                tuple(sorted(linked.items())),
+            )
+            if signature not in signatures:
+                signatures[signature] = node_id
+                continue
+
+            # Consumers of this node use the first one
+            for idx in range(8):
+                redirect(sources, (node_id, idx), (signatures[signature], idx))
+            del sources[node_id]
+            order.remove(node_id)
+            count += 1
+            changed = True
+    return count
+
+# Compile a template: validate, rewrite, merge and drop nodes not reaching the outputs
+def compile_template(node_list, link_list, outputs):
+    nodes, sources, invalid_links = template_graph(node_list, link_list)
+    for node_id in outputs:
+        if node_id not in nodes:
+            raise ValueError(f"No output node: {node_id}")
+    order = [node_data["ID"] for node_data in node_list]
+
+    merged = merge_common(nodes, sources, order)
+    rewrites = rewrite_arctan2(nodes, sources, order)
+    rewrites += rewrite_length(nodes, sources, order)
+    merged += merge_common(nodes, sources, order)
+
+    # Nodes reaching the outputs
+    alive = set()
+    stack = list(outputs)
+    while stack:
+        node_id = stack.pop()
+        if node_id in alive:
+            continue
+        alive.add(node_id)
+        stack += [source[0] for source in sources[node_id].values()]
+
+    compiled_nodes = [nodes[node_id] for node_id in order if node_id in alive]
+    compiled_links = [
+        {"From": list(sources[node_id][idx]), "To": [node_id, idx]}
+        for node_id in order if node_id in alive for idx in sorted(sources[node_id])
+    ]
+    stats = {
+        "nodes_before": len(node_list),
+        "nodes_after": len(compiled_nodes),
+        "links_before": len(link_list),
+        "links_after": len(compiled_links),
+        "invalid_links": invalid_links,
+        "rewrites": rewrites,
+        "merged": merged,
+    }
+    return compiled_nodes, compiled_links, stats
+
+# Fingerprint of a node: type, operation and the fingerprints of its linked inputs
+def node_fingerprint(node_type, operation, inputs):
+    linked = ";".join(sorted(f"{to_socket}<{fingerprint}:{from_socket}" for to_socket, fingerprint, from_socket in inputs))
+    data = f"{node_type}|{operation}|{linked}"
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+# Fingerprints of all nodes of a graph, each one covers the whole subgraph upstream of the node.
+# Node types, operations and links (from, output, to, input) by node index, linear time.
+def graph_fingerprints(node_types, operations, links):
+    count = len(node_types)
+    sources = [[] for _ in range(count)]
+    for from_idx, from_socket, to_idx, to_socket in links:
+        sources[to_idx].append((to_socket, from_idx, from_socket))
+
+    # Iterative post-order, 1: open, 2: done (an open source is a cycle)
+    fingerprints = [None] * count
+    state = [0] * count
+    for root in range(count):
+        stack = [root]
+        while stack:
+            idx = stack[-1]
+            if state[idx] == 0:
+                state[idx] = 1
+                stack += [from_idx for _, from_idx, _ in sources[idx] if state[from_idx] == 0]
+                continue
+            stack.pop()
+            if state[idx] == 2:
+                continue
+            inputs = [(to_socket, fingerprints[from_idx] or "cycle", from_socket) for to_socket, from_idx, from_socket in sources[idx]]
+            fingerprints[idx] = node_fingerprint(node_types[idx], operations[idx], inputs)
+            state[idx] = 2
+    return fingerprints
+
+# Nodes, links and fingerprints of a node tree, read once
+class TreeGraph:
+    def __init__(self, node_tree):
+        self.nodes = list(node_tree.nodes)
+        index = {node.as_pointer(): idx for idx, node in enumerate(self.nodes)}
+
+        # Socket indices, read only for the nodes having links
+        socket_index = {}
+        def socket_idx(sockets, socket):
+            key = socket.as_pointer()
+            if key not in socket_index:
+                socket_index.update((other.as_pointer(), idx) for idx, other in enumerate(sockets))
+            return socket_index[key]
+
+        self.links = [
+            (index[link.from_node.as_pointer()], socket_idx(link.from_node.outputs, link.from_socket),
+             index[link.to_node.as_pointer()], socket_idx(link.to_node.inputs, link.to_socket))
+            for link in node_tree.links
+        ]
+        self.fingerprints = graph_fingerprints(
+            [node.bl_idname for node in self.nodes],
+            [getattr(node, "operation", None) for node in self.nodes],
+            self.links,
+        )
+
+    # Index of a node by name
+    def find(self, name):
+        for idx, node in enumerate(self.nodes):
+            if node.name == name:
+                return idx
+        return None
+
+    # Nodes of the subgraph ending at an output node, without nodes also used outside of it
+    def subgraph(self, output_idx):
+        sources = {}
+        consumers = {}
+        for from_idx, _, to_idx, _ in self.links:
+            sources.setdefault(to_idx, []).append(from_idx)
+            consumers.setdefault(from_idx, []).append(to_idx)
+
+        cone = {output_idx}
+        stack = [output_idx]
+        while stack:
+            for from_idx in sources.get(stack.pop(), []):
+                if from_idx not in cone:
+                    cone.add(from_idx)
+                    stack.append(from_idx)
+
+        # Nodes feeding something outside, and everything upstream of them, stay
+        keep = [idx for idx in cone if idx != output_idx and any(to_idx not in cone for to_idx in consumers.get(idx, []))]
+        kept = set(keep)
+        while keep:
+            for from_idx in sources.get(keep.pop(), []):
+                if from_idx in cone and from_idx not in kept:
+                    kept.add(from_idx)
+                    keep.append(from_idx)
+        return cone - kept
 
-    ### CYLINDRICAL COORDINATES NODES DEFINITIONS ###
-    # Nodes list for the Cylindrical Coordinates
-    node_list_cylindrical = [
+    # Links from an output node to nodes outside of a subgraph: (output index, node, input index)
+    def outgoing(self, output_idx, subgraph):
+        return [
+            (from_socket, self.nodes[to_idx], to_socket)
+            for from_idx, from_socket, to_idx, to_socket in self.links
+            if from_idx == output_idx and to_idx not in subgraph
+        ]
+
+# Rotation matrix of an XYZ euler rotation
+def euler_matrix(rotation):
+    (cx, cy, cz), (sx, sy, sz) = np.cos(rotation), np.sin(rotation)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+# Mapping node of the Point type on (N, 3) points: rotate(points * scale) + location
+def mapping_point(points, location, rotation, scale):
+    matrix = euler_matrix(rotation).T.astype(points.dtype)
+    return (points * np.asarray(scale, points.dtype)) @ matrix + np.asarray(location, points.dtype)
+
+# A / B, 0 where B is 0 as the Divide node
+def safe_divide(a, b):
+    return np.divide(a, b, out = np.zeros_like(a), where = b != 0)
+
+# Cylindrical coordinates (angle, radius, height) of (N, 3) points
+def cylindrical_coordinates(points):
+    x, y, z = points.T
+    return np.stack([np.arctan2(y, x), np.hypot(x, y), z], axis = 1)
+
+# Polar coordinates (azimuth, inclination, radius) of (N, 3) points
+def polar_coordinates(points):
+    x, y, z = points.T
+    radius = np.sqrt(x * x + y * y + z * z)
+    inclination = np.arccos(np.clip(safe_divide(z, radius), -1.0, 1.0))
+    return np.stack([np.arctan2(y, x), inclination, radius], axis = 1)
+
+# Polar coordinates of a torus with this major radius (toroidal template)
+TOROIDAL_RADIUS = 1.0
+
+# Spherical coordinates (radius, inclination, azimuth) of (N, 3) points
+def spherical_coordinates(points):
+    x, y, z = points.T
+    radius = np.sqrt(x * x + y * y + z * z)
+    return np.stack([radius, np.arctan2(np.hypot(x, y), z), np.arctan2(y, x)], axis = 1)
+
+# Toroidal coordinates (azimuth, tube angle, tube radius) of (N, 3) points
+def toroidal_coordinates(points):
+    x, y, z = points.T
+    tube = np.hypot(x, y) - TOROIDAL_RADIUS
+    return np.stack([np.arctan2(y, x), np.arctan2(z, tube), np.hypot(tube, z)], axis = 1)
+
+# Log-polar coordinates (log radius, angle, height) of (N, 3) points, log 0 is 0 as the Logarithm node
+def log_polar_coordinates(points):
+    x, y, z = points.T
+    radius = np.hypot(x, y)
+    log_radius = np.log(np.where(radius > 0, radius, 1), dtype = points.dtype)
+    return np.stack([log_radius, np.arctan2(y, x), z], axis = 1)
+
+# NumPy functions computing the same values as the templates
+COORDINATES_FUNCTIONS = {
+    'CYLINDRICAL': cylindrical_coordinates,
+    'POLAR': polar_coordinates,
+    'SPHERICAL': spherical_coordinates,
+    'TOROIDAL': toroidal_coordinates,
+    'LOG_POLAR': log_polar_coordinates,
+}
+
+# Coordinates of (N, 3) object space points through the In and Out mappings
+def bake_coordinates(points, coord_type, mapping_in, mapping_out):
+    points = mapping_point(points, *mapping_in)
+    return mapping_point(COORDINATES_FUNCTIONS[coord_type](points), *mapping_out)
+
+### BUILT-IN TEMPLATES ###
+# Template format:
+#   "Type": enum identifier, "Label": name in the dropdown list, "Description": tooltip
+#   "Nodes": {"ID", "Node", "Location" (grid of 200), "Operation", "Inputs" (default values, None: unset)}
+#   "Links": {"From": [ID, output index], "To": [ID, input index]}
+#   MappingIn and MappingOut are required, MappingOut gives the output vector.
+# More templates are read from JSON files of the same format in the
+# coordinates_templates folder next to this file (a file can hold a list).
+
+# Cylindrical Coordinates
+TEMPLATE_CYLINDRICAL = {
+    "Type": "CYLINDRICAL",
+    "Label": "Cylindrical",
+    "Description": "Cylindrical Coordinates",
+    "Nodes": [
         {"ID": "TexCoord",                     "Node": "ShaderNodeTexCoord",    "Location": ( 0, 0)},
         {"ID": "MappingIn",                    "Node": "ShaderNodeMapping",     "Location": ( 1, 0)},
         {"ID": "SeparateXYZ",                  "Node": "ShaderNodeSeparateXYZ", "Location": ( 2, 0)},
@@ -100,10 +498,8 @@ class NODE_OT_CoordinatesNodes(bpy.types.Operator):
         {"ID": "SGN(Y)*ACOS(X/SQRT(X^2+Y^2))", "Node": "ShaderNodeMath",        "Location": ( 9, 1), "Operation": "MULTIPLY",   "Inputs": []},
         {"ID": "CombineXYZ",                   "Node": "ShaderNodeCombineXYZ",  "Location": (10, 0)},
         {"ID": "MappingOut",                   "Node": "ShaderNodeMapping",     "Location": (11, 0)},
-    ]
-    
-    # Link list for the Cylindrical Coordinates
-    link_list_cylindrical = [
+    ],
+    "Links": [
         {"From": ["TexCoord", 3],                     "To": ["MappingIn", 0]},
         {"From": ["MappingIn", 0],                    "To": ["SeparateXYZ", 0]},
         {"From": ["SeparateXYZ", 0],                  "To": ["X^2", 0]},
@@ -122,11 +518,15 @@ class NODE_OT_CoordinatesNodes(bpy.types.Operator):
         {"From": ["SQRT(X^2+Y^2)", 0],                "To": ["CombineXYZ", 1]},
         {"From": ["SeparateXYZ", 2],                  "To": ["CombineXYZ", 2]},
         {"From": ["CombineXYZ", 0],                   "To": ["MappingOut", 0]},
-    ]
+    ],
+}
 
-    ### POLAR COORDINATES NODES DEFINITIONS ###
-    # Nodes list for the Polar Coordinates
-    node_list_polar = [
+# Polar Coordinates (azimuth, inclination, radius)
+TEMPLATE_POLAR = {
+    "Type": "POLAR",
+    "Label": "Polar",
+    "Description": "Polar Coordinates",
+    "Nodes": [
         {"ID": "TexCoord",                     "Node": "ShaderNodeTexCoord",    "Location": ( 0, 0)},
         {"ID": "MappingIn",                    "Node": "ShaderNodeMapping",     "Location": ( 1, 0)},
         {"ID": "SeparateXYZ",                  "Node": "ShaderNodeSeparateXYZ", "Location": ( 2, 0)},
@@ -145,10 +545,8 @@ class NODE_OT_CoordinatesNodes(bpy.types.Operator):
         {"ID": "SGN(Y)*ACOS(X/SQRT(X^2+Y^2))", "Node": "ShaderNodeMath",        "Location": (10,-1), "Operation": "MULTIPLY",   "Inputs": []},
         {"ID": "CombineXYZ",                   "Node": "ShaderNodeCombineXYZ",  "Location": (11, 1)},
         {"ID": "MappingOut",                   "Node": "ShaderNodeMapping",     "Location": (12, 0)},
-    ]
-    
-    # Link list for the Polar Coordinates
-    link_list_polar = [
+    ],
+    "Links": [
         {"From": ["TexCoord", 3],                     "To": ["MappingIn", 0]},
         {"From": ["MappingIn", 0],                    "To": ["SeparateXYZ", 0]},
         {"From": ["SeparateXYZ", 0],                  "To": ["X^2", 0]},
@@ -173,105 +571,1016 @@ class NODE_OT_CoordinatesNodes(bpy.types.Operator):
         {"From": ["ACOS(Z/SQRT(X^2+Y^2+Z^2))", 0],    "To": ["CombineXYZ", 1]},
         {"From": ["SQRT(X^2+Y^2+Z^2)", 0],            "To": ["CombineXYZ", 2]},
         {"From": ["CombineXYZ", 0],                   "To": ["MappingOut", 0]},
+    ],
+}
+
+# Spherical Coordinates (radius, inclination, azimuth)
+TEMPLATE_SPHERICAL = {
+    "Type": "SPHERICAL",
+    "Label": "Spherical",
+    "Description": "Spherical Coordinates (radius, inclination, azimuth)",
+    "Nodes": [
+        {"ID": "TexCoord",             "Node": "ShaderNodeTexCoord",    "Location": (0, 0)},
+        {"ID": "MappingIn",            "Node": "ShaderNodeMapping",     "Location": (1, 0)},
+        {"ID": "SeparateXYZ",          "Node": "ShaderNodeSeparateXYZ", "Location": (2, 0)},
+        {"ID": "(X,Y,0)",              "Node": "ShaderNodeCombineXYZ",  "Location": (3, 1)},
+        {"ID": "|XY|",                 "Node": "ShaderNodeVectorMath",  "Location": (4, 1), "Operation": "LENGTH"},
+        {"ID": "|XYZ|",                "Node": "ShaderNodeVectorMath",  "Location": (3,-1), "Operation": "LENGTH"},
+        {"ID": "ATAN2(|XY|,Z)",        "Node": "ShaderNodeMath",        "Location": (5, 0), "Operation": "ARCTAN2"},
+        {"ID": "ATAN2(Y,X)",           "Node": "ShaderNodeMath",        "Location": (5,-1), "Operation": "ARCTAN2"},
+        {"ID": "CombineXYZ",           "Node": "ShaderNodeCombineXYZ",  "Location": (6, 0)},
+        {"ID": "MappingOut",           "Node": "ShaderNodeMapping",     "Location": (7, 0)},
+    ],
+    "Links": [
+        {"From": ["TexCoord", 3],      "To": ["MappingIn", 0]},
+        {"From": ["MappingIn", 0],     "To": ["SeparateXYZ", 0]},
+        {"From": ["MappingIn", 0],     "To": ["|XYZ|", 0]},
+        {"From": ["SeparateXYZ", 0],   "To": ["(X,Y,0)", 0]},
+        {"From": ["SeparateXYZ", 1],   "To": ["(X,Y,0)", 1]},
+        {"From": ["(X,Y,0)", 0],       "To": ["|XY|", 0]},
+        {"From": ["|XY|", 1],          "To": ["ATAN2(|XY|,Z)", 0]},
+        {"From": ["SeparateXYZ", 2],   "To": ["ATAN2(|XY|,Z)", 1]},
+        {"From": ["SeparateXYZ", 1],   "To": ["ATAN2(Y,X)", 0]},
+        {"From": ["SeparateXYZ", 0],   "To": ["ATAN2(Y,X)", 1]},
+        {"From": ["|XYZ|", 1],         "To": ["CombineXYZ", 0]},
+        {"From": ["ATAN2(|XY|,Z)", 0], "To": ["CombineXYZ", 1]},
+        {"From": ["ATAN2(Y,X)", 0],    "To": ["CombineXYZ", 2]},
+        {"From": ["CombineXYZ", 0],    "To": ["MappingOut", 0]},
+    ],
+}
+
+# Toroidal Coordinates (azimuth, tube angle, tube radius) around a circle of TOROIDAL_RADIUS
+TEMPLATE_TOROIDAL = {
+    "Type": "TOROIDAL",
+    "Label": "Toroidal",
+    "Description": "Toroidal Coordinates (azimuth, tube angle, tube radius) around a circle of radius 1",
+    "Nodes": [
+        {"ID": "TexCoord",             "Node": "ShaderNodeTexCoord",    "Location": (0, 0)},
+        {"ID": "MappingIn",            "Node": "ShaderNodeMapping",     "Location": (1, 0)},
+        {"ID": "SeparateXYZ",          "Node": "ShaderNodeSeparateXYZ", "Location": (2, 0)},
+        {"ID": "(X,Y,0)",              "Node": "ShaderNodeCombineXYZ",  "Location": (3, 1)},
+        {"ID": "|XY|",                 "Node": "ShaderNodeVectorMath",  "Location": (4, 1), "Operation": "LENGTH"},
+        {"ID": "|XY|-R",               "Node": "ShaderNodeMath",        "Location": (5, 1), "Operation": "SUBTRACT", "Inputs": [None, TOROIDAL_RADIUS]},
+        {"ID": "(|XY|-R,Z,0)",         "Node": "ShaderNodeCombineXYZ",  "Location": (6, 2)},
+        {"ID": "|(|XY|-R,Z)|",         "Node": "ShaderNodeVectorMath",  "Location": (7, 2), "Operation": "LENGTH"},
+        {"ID": "ATAN2(Z,|XY|-R)",      "Node": "ShaderNodeMath",        "Location": (6, 0), "Operation": "ARCTAN2"},
+        {"ID": "ATAN2(Y,X)",           "Node": "ShaderNodeMath",        "Location": (6,-1), "Operation": "ARCTAN2"},
+        {"ID": "CombineXYZ",           "Node": "ShaderNodeCombineXYZ",  "Location": (8, 0)},
+        {"ID": "MappingOut",           "Node": "ShaderNodeMapping",     "Location": (9, 0)},
+    ],
+    "Links": [
+        {"From": ["TexCoord", 3],        "To": ["MappingIn", 0]},
+        {"From": ["MappingIn", 0],       "To": ["SeparateXYZ", 0]},
+        {"From": ["SeparateXYZ", 0],     "To": ["(X,Y,0)", 0]},
+        {"From": ["SeparateXYZ", 1],     "To": ["(X,Y,0)", 1]},
+        {"From": ["(X,Y,0)", 0],         "To": ["|XY|", 0]},
+        {"From": ["|XY|", 1],            "To": ["|XY|-R", 0]},
+        {"From": ["|XY|-R", 0],          "To": ["(|XY|-R,Z,0)", 0]},
+        {"From": ["SeparateXYZ", 2],     "To": ["(|XY|-R,Z,0)", 1]},
+        {"From": ["(|XY|-R,Z,0)", 0],    "To": ["|(|XY|-R,Z)|", 0]},
+        {"From": ["SeparateXYZ", 2],     "To": ["ATAN2(Z,|XY|-R)", 0]},
+        {"From": ["|XY|-R", 0],          "To": ["ATAN2(Z,|XY|-R)", 1]},
+        {"From": ["SeparateXYZ", 1],     "To": ["ATAN2(Y,X)", 0]},
+        {"From": ["SeparateXYZ", 0],     "To": ["ATAN2(Y,X)", 1]},
+        {"From": ["ATAN2(Y,X)", 0],      "To": ["CombineXYZ", 0]},
+        {"From": ["ATAN2(Z,|XY|-R)", 0], "To": ["CombineXYZ", 1]},
+        {"From": ["|(|XY|-R,Z)|", 1],    "To": ["CombineXYZ", 2]},
+        {"From": ["CombineXYZ", 0],      "To": ["MappingOut", 0]},
+    ],
+}
+
+# Log-Polar Coordinates (log radius, angle, height)
+TEMPLATE_LOG_POLAR = {
+    "Type": "LOG_POLAR",
+    "Label": "Log-Polar",
+    "Description": "Log-Polar Coordinates (log radius, angle, height)",
+    "Nodes": [
+        {"ID": "TexCoord",             "Node": "ShaderNodeTexCoord",    "Location": (0, 0)},
+        {"ID": "MappingIn",            "Node": "ShaderNodeMapping",     "Location": (1, 0)},
+        {"ID": "SeparateXYZ",          "Node": "ShaderNodeSeparateXYZ", "Location": (2, 0)},
+        {"ID": "(X,Y,0)",              "Node": "ShaderNodeCombineXYZ",  "Location": (3, 1)},
+        {"ID": "|XY|",                 "Node": "ShaderNodeVectorMath",  "Location": (4, 1), "Operation": "LENGTH"},
+        {"ID": "LN(|XY|)",             "Node": "ShaderNodeMath",        "Location": (5, 1), "Operation": "LOGARITHM", "Inputs": [None, math.e]},
+        {"ID": "ATAN2(Y,X)",           "Node": "ShaderNodeMath",        "Location": (5, 0), "Operation": "ARCTAN2"},
+        {"ID": "CombineXYZ",           "Node": "ShaderNodeCombineXYZ",  "Location": (6, 0)},
+        {"ID": "MappingOut",           "Node": "ShaderNodeMapping",     "Location": (7, 0)},
+    ],
+    "Links": [
+        {"From": ["TexCoord", 3],      "To": ["MappingIn", 0]},
+        {"From": ["MappingIn", 0],     "To": ["SeparateXYZ", 0]},
+        {"From": ["SeparateXYZ", 0],   "To": ["(X,Y,0)", 0]},
+        {"From": ["SeparateXYZ", 1],   "To": ["(X,Y,0)", 1]},
+        {"From": ["(X,Y,0)", 0],       "To": ["|XY|", 0]},
+        {"From": ["|XY|", 1],          "To": ["LN(|XY|)", 0]},
+        {"From": ["SeparateXYZ", 1],   "To": ["ATAN2(Y,X)", 0]},
+        {"From": ["SeparateXYZ", 0],   "To": ["ATAN2(Y,X)", 1]},
+        {"From": ["LN(|XY|)", 0],      "To": ["CombineXYZ", 0]},
+        {"From": ["ATAN2(Y,X)", 0],    "To": ["CombineXYZ", 1]},
+        {"From": ["SeparateXYZ", 2],   "To": ["CombineXYZ", 2]},
+        {"From": ["CombineXYZ", 0],    "To": ["MappingOut", 0]},
+    ],
+}
+
+BUILTIN_TEMPLATES = [
+    TEMPLATE_CYLINDRICAL,
+    TEMPLATE_POLAR,
+    TEMPLATE_SPHERICAL,
+    TEMPLATE_TOROIDAL,
+    TEMPLATE_LOG_POLAR,
+]
+
+### TEMPLATE REGISTRY ###
+# Folder of the JSON templates
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coordinates_templates")
+
+# Grid size of the node locations
+NODE_SPACING = 200
+
+# Inputs of the node groups: name, node ID, input index, default value
+GROUP_INPUTS = [
+    ("In Location",  "MappingIn",  1, (0.0, 0.0, 0.0)),
+    ("In Rotation",  "MappingIn",  2, (0.0, 0.0, 0.0)),
+    ("In Scale",     "MappingIn",  3, (1.0, 1.0, 1.0)),
+    ("Out Location", "MappingOut", 1, (0.0, 0.0, 0.0)),
+    ("Out Rotation", "MappingOut", 2, (0.0, 0.0, 0.0)),
+    ("Out Scale",    "MappingOut", 3, (1.0, 1.0, 1.0)),
+]
+
+# Output of the node groups: node ID, output index
+GROUP_OUTPUT = ("MappingOut", 0)
+
+# Estimated cost of the Cycles SVM math operations, relative to an ADD
+SVM_OPERATION_COSTS = {
+    "ADD": 1, "SUBTRACT": 1, "MULTIPLY": 1, "MINIMUM": 1, "MAXIMUM": 1, "ABSOLUTE": 1, "SIGN": 1,
+    "DIVIDE": 2, "SCALE": 1, "DOT_PRODUCT": 3, "CROSS_PRODUCT": 6, "SQRT": 4, "LENGTH": 5, "NORMALIZE": 6,
+    "SINE": 16, "COSINE": 16, "TANGENT": 20, "ARCSINE": 20, "ARCCOSINE": 20, "ARCTANGENT": 16, "ARCTAN2": 20,
+    "POWER": 24, "LOGARITHM": 20, "EXPONENT": 16,
+}
+
+# Estimated cost of the other nodes: cost of one SVM instruction, instructions by used outputs
+SVM_NODE_COSTS = {
+    "ShaderNodeTexCoord": (1, True),
+    "ShaderNodeSeparateXYZ": (1, True),
+    "ShaderNodeCombineXYZ": (3, False),
+    "ShaderNodeMapping": (12, False),
+}
+
+# Estimated render cost of a template plan, before the constant folding of Cycles.
+# Separate and Texture Coordinate nodes compile to one SVM instruction per used output.
+def plan_cost(node_types, operations, links):
+    used_outputs = {}
+    for from_idx, from_socket, _, _ in links:
+        used_outputs.setdefault(from_idx, set()).add(from_socket)
+
+    math_ops = 0
+    instructions = 0
+    cost = 0
+    for idx, node_type in enumerate(node_types):
+        if node_type in ("ShaderNodeMath", "ShaderNodeVectorMath"):
+            math_ops += 1
+            instructions += 1
+            cost += SVM_OPERATION_COSTS.get(operations[idx], 4)
+        elif node_type in SVM_NODE_COSTS:
+            node_cost, per_output = SVM_NODE_COSTS[node_type]
+            count = len(used_outputs.get(idx, ())) if per_output else 1
+            instructions += count
+            cost += node_cost * count
+        else:
+            instructions += 1
+            cost += 4
+    return {"nodes": len(node_types), "math_ops": math_ops, "svm_instructions": instructions, "estimated_cost": cost}
+
+# Template compiled to node and link arrays by index, no lookups by ID when inserting
+class TemplatePlan:
+    def __init__(self, coord_type, node_list, link_list, stats = None):
+        self.node_list = node_list
+        self.link_list = link_list
+        self.stats = stats
+
+        index = {node_data["ID"]: idx for idx, node_data in enumerate(node_list)}
+        self.node_types = [node_data["Node"] for node_data in node_list]
+        self.locations = [(node_data["Location"][0] * NODE_SPACING, node_data["Location"][1] * NODE_SPACING) for node_data in node_list]
+        self.operations = [(idx, node_data["Operation"]) for idx, node_data in enumerate(node_list) if "Operation" in node_data]
+        self.defaults = [
+            (idx, input_idx, value)
+            for idx, node_data in enumerate(node_list)
+            for input_idx, value in enumerate(node_data.get("Inputs", [])) if value is not None
+        ]
+        # Links to unknown nodes are dropped as add_nodes always did
+        self.links = [
+            (index[linker["From"][0]], linker["From"][1], index[linker["To"][0]], linker["To"][1])
+            for linker in link_list if linker["From"][0] in index and linker["To"][0] in index
+        ]
+        self.output = index[GROUP_OUTPUT[0]]
+
+        # Bulk construction: flat locations, defaults by node, each linked output once
+        self.flat_locations = [value for location in self.locations for value in location]
+        node_defaults = {}
+        for idx, input_idx, value in self.defaults:
+            node_defaults.setdefault(idx, []).append((input_idx, value))
+        self.node_defaults = list(node_defaults.items())
+        link_outputs = {}
+        self.link_targets = [
+            (link_outputs.setdefault((from_idx, from_socket), len(link_outputs)), to_idx, to_socket)
+            for from_idx, from_socket, to_idx, to_socket in self.links
+        ]
+        self.link_outputs = list(link_outputs)
+        # The link limits are checked only when an input has more than one link
+        self.verify_links = len({(to_idx, to_socket) for _, to_idx, to_socket in self.link_targets}) < len(self.link_targets)
+
+        self.group_inputs = [(name, index[node_id], input_idx, default) for name, node_id, input_idx, default in GROUP_INPUTS]
+        xs = [node_data["Location"][0] for node_data in node_list]
+        self.min_x, self.max_x = min(xs), max(xs)
+
+        # Fingerprint of the nodes as inserted, to find them in a node tree
+        operations = [node_data.get("Operation") for node_data in node_list]
+        self.fingerprint = graph_fingerprints(self.node_types, operations, self.links)[self.output]
+        self.cost = plan_cost(self.node_types, operations, self.links)
+
+        # Key of the plan, changes with the template version or any node or link
+        data = json.dumps([node_list, link_list], sort_keys=True)
+        digest = hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+        self.key = f"{coord_type}:{TEMPLATE_VERSION}:{digest}"
+
+# A coordinates template, compiled once when loaded
+class CoordinatesTemplate:
+    def __init__(self, data):
+        validate_template(data)
+        self.coord_type = data["Type"]
+        self.label = data.get("Label", self.coord_type.replace("_", " ").title())
+        self.description = data.get("Description", f"{self.label} Coordinates")
+        self.node_list = [dict(node_data) for node_data in data["Nodes"]]
+        self.link_list = [dict(linker) for linker in data["Links"]]
+
+        for node_id in ["MappingIn", GROUP_OUTPUT[0]]:
+            if not any(node_data["ID"] == node_id for node_data in self.node_list):
+                raise ValueError(f"No {node_id} node")
+
+        # Plans of the original (False) and the optimized (True) template,
+        # the nodes of the group inputs are kept even when they do not reach the output
+        roots = [GROUP_OUTPUT[0]] + sorted({node_id for _, node_id, _, _ in GROUP_INPUTS} - {GROUP_OUTPUT[0]})
+        compiled_nodes, compiled_links, stats = compile_template(self.node_list, self.link_list, roots)
+        self.plans = {
+            False: TemplatePlan(self.coord_type, self.node_list, self.link_list),
+            True: TemplatePlan(self.coord_type, compiled_nodes, compiled_links, stats),
+        }
+
+# Add nodes of a template plan
+def add_nodes(node_tree, plan, origin = (0, 0), bulk = True):
+    if bulk:
+        return add_nodes_bulk(node_tree, plan, origin)
+    return add_nodes_each(node_tree, plan, origin)
+
+# Add nodes of a template plan one by one
+def add_nodes_each(node_tree, plan, origin = (0, 0)):
+    new_node = node_tree.nodes.new
+    nodes = [new_node(node_type) for node_type in plan.node_types]
+    for node, location in zip(nodes, plan.locations):
+        node.location = (location[0] + origin[0], location[1] + origin[1])
+    for idx, operation in plan.operations:
+        nodes[idx].operation = operation
+    for idx, input_idx, value in plan.defaults:
+        nodes[idx].inputs[input_idx].default_value = value
+
+    new_link = node_tree.links.new
+    for from_idx, from_socket, to_idx, to_socket in plan.links:
+        new_link(nodes[from_idx].outputs[from_socket], nodes[to_idx].inputs[to_socket])
+    return nodes
+
+# Add nodes of a template plan in a few passes: the locations in one foreach_set instead of one
+# write per node, each socket resolved once, the links without the link limit scans when no input
+# has two links. nodes.new and links.new still update the tree for each node and link, the tag at
+# the end is for the locations written by foreach_set, which sends no update.
+def add_nodes_bulk(node_tree, plan, origin = (0, 0)):
+    tree_nodes = node_tree.nodes
+    first = len(tree_nodes)
+    new_node = tree_nodes.new
+    nodes = [new_node(node_type) for node_type in plan.node_types]
+
+    # New nodes are at the end of the collection
+    if len(nodes) > 0 and tree_nodes[first] == nodes[0]:
+        locations = [0.0] * (len(tree_nodes) * 2)
+        tree_nodes.foreach_get("location", locations)
+        if origin[0] == 0 and origin[1] == 0:
+            locations[first * 2:] = plan.flat_locations
+        else:
+            locations[first * 2:] = [value + origin[idx & 1] for idx, value in enumerate(plan.flat_locations)]
+        tree_nodes.foreach_set("location", locations)
+    else:
+        for node, location in zip(nodes, plan.locations):
+            node.location = (location[0] + origin[0], location[1] + origin[1])
+
+    for idx, operation in plan.operations:
+        nodes[idx].operation = operation
+    for idx, values in plan.node_defaults:
+        inputs = nodes[idx].inputs
+        for input_idx, value in values:
+            inputs[input_idx].default_value = value
+
+    outputs = [nodes[idx].outputs[socket] for idx, socket in plan.link_outputs]
+    node_inputs = [None] * len(nodes)
+    new_link = node_tree.links.new
+    verify_limits = plan.verify_links
+    for output_pos, to_idx, to_socket in plan.link_targets:
+        inputs = node_inputs[to_idx]
+        if inputs is None:
+            inputs = node_inputs[to_idx] = nodes[to_idx].inputs
+        new_link(outputs[output_pos], inputs[to_socket], verify_limits = verify_limits)
+    node_tree.update_tag()
+    return nodes
+
+# Registered templates by coordinates type
+coordinates_templates = {}
+
+# Items of the coordinates type enums, kept referenced while Blender shows them
+template_enum_items = []
+
+# Cost of the last inserted nodes and the last render timings, by coordinates type
+cost_results = {}
+timing_results = {}
+
+# Load the built-in and JSON templates into the registry, a later template replaces the same type.
+# Invalid templates are reported and skipped, errors of the compiler itself are raised.
+def load_templates(directory = TEMPLATE_DIR):
+    sources = [("built-in", data) for data in BUILTIN_TEMPLATES]
+    if os.path.isdir(directory):
+        for file_name in sorted(os.listdir(directory)):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(directory, file_name)
+            try:
+                with open(path, encoding = "utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Coordinates template {path}: {e}")
+                continue
+            sources += [(path, item) for item in (data if isinstance(data, list) else [data])]
+
+    coordinates_templates.clear()
+    for source, data in sources:
+        try:
+            template = CoordinatesTemplate(data)
+        except (TypeError, IndexError, ValueError) as e:
+            print(f"Coordinates template {source}: {e}")
+            continue
+        coordinates_templates[template.coord_type] = template
+
+    template_enum_items[:] = [
+        (template.coord_type, template.label, template.description) for template in coordinates_templates.values()
     ]
+    return coordinates_templates
+
+# Items of the coordinates type enums
+def template_items(self, context):
+    return template_enum_items
+
+# Settings of the addon, one property group of the scene read by the operators and saved in presets
+class NodeCoordinatesSettings(bpy.types.PropertyGroup):
+    # Dropdown list to choose a coordinates to create nodes
+    NodeCoordinates_type_prop_enum : EnumProperty(
+        name="Types",
+        description="Enum Property",
+        items=template_items,
+    )
+
+    # Add one group node of a shared node group instead of all nodes
+    NodeCoordinates_use_node_group : BoolProperty(
+        name="Node Group",
+        description="Add a group node of a shared node group instead of all nodes",
+        default=True
+    )
+
+    # Materials to add the nodes
+    NodeCoordinates_target : EnumProperty(
+        name="Target",
+        description="Materials to add the nodes",
+        items=[
+            ('ACTIVE', "Active", "Active material of the active object"),
+            ('SELECTED', "Selected", "All materials of the selected objects"),
+            ('ALL', "All", "All materials in the file"),
+        ],
+        default='ACTIVE'
+    )
+
+    # Compile the template with the optimizer before creating nodes
+    NodeCoordinates_optimize : BoolProperty(
+        name="Optimize",
+        description="Remove dead nodes, merge common nodes and use ARCTAN2 and LENGTH for fewer nodes",
+        default=True
+    )
+
+    # Add the nodes, or bake the coordinates into a mesh attribute
+    NodeCoordinates_mode : EnumProperty(
+        name="Mode",
+        description="Add the coordinates nodes, or bake the coordinates of the vertices into an attribute",
+        items=[
+            ('NODES', "Nodes", "Add the coordinates nodes"),
+            ('BAKE', "Bake", "Bake the coordinates into a point attribute, the material gets an Attribute node"),
+        ],
+        default='NODES'
+    )
+
+    # Name of the baked attribute, empty for a name by the coordinates type
+    NodeCoordinates_attribute : StringProperty(
+        name="Attribute",
+        description="Name of the baked attribute (empty: coordinates_<type>)",
+        default=""
+    )
+
+    # Transforms of MappingIn and MappingOut for the bake
+    NodeCoordinates_in_location : FloatVectorProperty(name="In Location", subtype='TRANSLATION', default=(0.0, 0.0, 0.0))
+    NodeCoordinates_in_rotation : FloatVectorProperty(name="In Rotation", subtype='EULER', default=(0.0, 0.0, 0.0))
+    NodeCoordinates_in_scale : FloatVectorProperty(name="In Scale", subtype='XYZ', default=(1.0, 1.0, 1.0))
+    NodeCoordinates_out_location : FloatVectorProperty(name="Out Location", subtype='TRANSLATION', default=(0.0, 0.0, 0.0))
+    NodeCoordinates_out_rotation : FloatVectorProperty(name="Out Rotation", subtype='EULER', default=(0.0, 0.0, 0.0))
+    NodeCoordinates_out_scale : FloatVectorProperty(name="Out Scale", subtype='XYZ', default=(1.0, 1.0, 1.0))
+
+    # Use the bulk construction of the nodes
+    NodeCoordinates_bulk : BoolProperty(
+        name="Bulk",
+        description="Create the nodes in a few passes with fewer RNA accesses",
+        default=True
+    )
+
+# Settings saved in presets
+PRESET_SETTINGS = [name for name in NodeCoordinatesSettings.__annotations__]
+
+# Panel class
+class NodeCoordinatesNoePanel(bpy.types.Panel):
+    # Panel information
+    bl_idname = "NODE_PT_CoordinatesNodes"
+    bl_space_type = 'NODE_EDITOR'
+    bl_label = "Add Corrdinates Nodes"
+    bl_region_type = "UI"
+    bl_category = "Tool"
+
+    # Drawing panel
+    # The operators read the settings of the scene, nothing is copied to them.
+    def draw(self, context):
+        # Draw on the Shader Editor Node Tree
+        material = context.material
+        if hasattr(material, 'node_tree'):
+            layout = self.layout
+            settings = context.scene.NodeCoordinates_settings
+
+            # Presets of the settings
+            row = layout.row(align=True)
+            row.menu(NODE_MT_CoordinatesPresets.__name__, text=NODE_MT_CoordinatesPresets.bl_label)
+            row.operator(NODE_OT_CoordinatesAddPreset.bl_idname, text="", icon="ADD")
+            row.operator(NODE_OT_CoordinatesAddPreset.bl_idname, text="", icon="REMOVE").remove_active = True
+
+            # Place a label on this panel
+            layout.label(text="Coordinates Type:")
+
+            # Place a property (Dropdown list with an enum)
+            layout.prop(settings, "NodeCoordinates_type_prop_enum", text="Type")
+            layout.prop(settings, "NodeCoordinates_target", text="Target")
+            layout.prop(settings, "NodeCoordinates_mode", text="Mode")
+            if settings.NodeCoordinates_mode == 'BAKE':
+                layout.prop(settings, "NodeCoordinates_attribute", text="Attribute")
+                col = layout.column(align=True)
+                col.prop(settings, "NodeCoordinates_in_location", text="In Location")
+                col.prop(settings, "NodeCoordinates_in_rotation", text="In Rotation")
+                col.prop(settings, "NodeCoordinates_in_scale", text="In Scale")
+                col = layout.column(align=True)
+                col.prop(settings, "NodeCoordinates_out_location", text="Out Location")
+                col.prop(settings, "NodeCoordinates_out_rotation", text="Out Rotation")
+                col.prop(settings, "NodeCoordinates_out_scale", text="Out Scale")
+            else:
+                row = layout.row()
+                row.prop(settings, "NodeCoordinates_use_node_group", text="Node Group")
+                row.prop(settings, "NodeCoordinates_optimize", text="Optimize")
+                row.prop(settings, "NodeCoordinates_bulk", text="Bulk")
+
+            # Place a button to execute an operator
+            layout.operator(NODE_OT_CoordinatesNodes.bl_idname, text = "Create Nodes")
+
+            # Cost of the nodes of the coordinates type
+            template = coordinates_templates.get(settings.NodeCoordinates_type_prop_enum)
+            if template is not None and settings.NodeCoordinates_mode == 'NODES':
+                self.draw_cost(layout, settings, template)
+
+    # Estimated cost, cost of the last inserted nodes and the render timings
+    def draw_cost(self, layout, settings, template):
+        box = layout.box()
+        box.label(text="Cost:")
+        cost = template.plans[settings.NodeCoordinates_optimize].cost
+        box.label(text=f"{cost['nodes']} nodes, {cost['math_ops']} math ops")
+        box.label(text=f"~{cost['svm_instructions']} SVM instructions, cost {cost['estimated_cost']}")
+
+        inserted = cost_results.get(template.coord_type)
+        if inserted is not None:
+            box.label(text=f"Inserted: {inserted['nodes']} nodes, {inserted['math_ops']} math ops, "
+                      f"~{inserted['svm_instructions']} SVM")
+
+        timing = timing_results.get(template.coord_type)
+        if timing is not None:
+            box.label(text=f"Render: {timing['without']['best_seconds'] * 1000:.0f} -> {timing['with']['best_seconds'] * 1000:.0f} ms")
+            box.label(text=f"Compile: {timing['compile_seconds'] * 1000:.0f} ms, sample: {timing['sample_ns']:.1f} ns")
+
+        box.operator(NODE_OT_CoordinatesCostTiming.bl_idname, text = "Measure Render")
+        box.operator(NODE_OT_CoordinatesCostExport.bl_idname, text = "Export JSON")
+
+# Operator class
+class NODE_OT_CoordinatesNodes(bpy.types.Operator):
+    # Operator information
+    bl_idname = "nodetree.coordinatesnode"
+    bl_label = "Add corrdinates nodes"
+    bl_desicription = "Add corrdinates nodes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    # Build the nodes of a node group from a template plan
+    def build_node_group(self, group, plan):
+        group.nodes.clear()
+        group.interface.clear()
+        nodes = add_nodes(group, plan, bulk = self.settings.NodeCoordinates_bulk)
+
+        # Group input and output on both sides of the template
+        group_in = group.nodes.new("NodeGroupInput")
+        group_in.location = ((plan.min_x - 1) * NODE_SPACING, -NODE_SPACING)
+        group_out = group.nodes.new("NodeGroupOutput")
+        group_out.location = ((plan.max_x + 1) * NODE_SPACING, 0)
+
+        # Mapping transforms stay editable on each group node
+        for idx, (name, node_idx, input_idx, default) in enumerate(plan.group_inputs):
+            socket = group.interface.new_socket(name=name, in_out='INPUT', socket_type='NodeSocketVector')
+            socket.default_value = default
+            group.links.new(group_in.outputs[idx], nodes[node_idx].inputs[input_idx])
+
+        group.interface.new_socket(name="Vector", in_out='OUTPUT', socket_type='NodeSocketVector')
+        group.links.new(nodes[plan.output].outputs[GROUP_OUTPUT[1]], group_out.inputs[0])
+
+    # Get the node group of a template, build it only when the template is changed
+    def get_node_group(self, template, plan):
+        coord_type = template.coord_type
 
-    # Add nodes 
-    def add_nodes(self, node_tree, node_list, link_list):
-        # Create new nodes
-        nodes = {}
-        org = (0, 0)
-        scale = (200, 200)
-        for node_data in node_list:
-            new_node = node_tree.nodes.new(node_data["Node"])
-            nodes[node_data["ID"]] = new_node
-            
-            if "Location" in node_data:
-                loc = node_data["Location"]
-                new_node.location = (loc[0] * scale[0] + org[0], loc[1] * scale[1] + org[1])
- 
-            # Set data to each node
-            node_name = node_data["Node"]                            
-            if   node_name == "ShaderNodeTexCoord":
-                pass
-                        
-            elif node_name == "ShaderNodeSeparateXYZ":
-                pass
-                        
-            elif node_name == "ShaderNodeCombineXYZ":
-                pass
-            
-            elif node_name == "ShaderNodeMath":
-                new_node.operation = node_data["Operation"]
-            
-            # Set default values
-            if "Inputs" in node_data:
-                if len(node_data["Inputs"]) > 0:
-                    for idx in list(range(len(node_data["Inputs"]))):
-                        inp = node_data["Inputs"][idx]
-                        if inp is not None:
-                            new_node.inputs[idx].default_value = inp
-
-        # Create new links
-        links = node_tree.links
-        for linker in link_list:
-            from_id = linker["From"][0]
-            to_id = linker["To"][0]
-            if from_id in nodes and to_id in nodes:
-                from_node = nodes[from_id]
-                to_node = nodes[to_id]
-                links.new(from_node.outputs[linker["From"][1]], to_node.inputs[linker["To"][1]])
+        # Cached name first, the group can be renamed or removed
+        group = bpy.data.node_groups.get(node_group_names.get(coord_type, ""))
+        if group is None or group.get(GROUP_TYPE_PROP) != coord_type:
+            group = None
+            for node_group in bpy.data.node_groups:
+                if node_group.bl_idname == 'ShaderNodeTree' and node_group.get(GROUP_TYPE_PROP) == coord_type:
+                    group = node_group
+                    break
+
+        if group is None:
+            group = bpy.data.node_groups.new(f"{template.label} Coordinates", 'ShaderNodeTree')
+            group[GROUP_TYPE_PROP] = coord_type
+
+        # Rebuilt in place, group nodes in all materials follow
+        if group.get(GROUP_KEY_PROP) != plan.key:
+            self.build_node_group(group, plan)
+            group[GROUP_KEY_PROP] = plan.key
+
+        node_group_names[coord_type] = group.name
+        return group
+
+    # Add a group node of the coordinates node group
+    def add_group_node(self, node_tree, group, location = (0, 0)):
+        group_node = node_tree.nodes.new("ShaderNodeGroup")
+        group_node.node_tree = group
+        group_node.location = location
+        return group_node
+
+    # Plan of a template, compiled when the template was loaded
+    def template_plan(self, template):
+        plan = template.plans[self.settings.NodeCoordinates_optimize]
+        if plan.stats is not None:
+            stats = plan.stats
+            self.report({'INFO'}, f"{template.label}: {stats['nodes_before']} -> {stats['nodes_after']} nodes, "
+                        f"{stats['links_before']} -> {stats['links_after']} links, {stats['invalid_links']} invalid links")
+        return plan
+
+    # Inserted nodes of a template in a node tree: (output node index, names of the inserted nodes or None).
+    # The indexed nodes first, then any node with the fingerprint of a plan of the template.
+    def find_nodes(self, graph, node_tree, template, plan):
+        known = {other.fingerprint for other in template.plans.values()}
+        index = node_tree.get(INDEX_PROP)
+        names = index.get(template.coord_type) if index is not None else None
+        if names:
+            inserted = node_tree.get(INDEX_FINGERPRINT_PROP, {}).get(template.coord_type)
+            idx = graph.find(names[0])
+            node = graph.nodes[idx] if idx is not None else None
+            # Blender reuses the names of deleted nodes: the indexed output is still ours when it has the
+            # fingerprint of a plan or the one it had when inserted, or when it is an output node marked as
+            # inserted (edited nodes). A group node also keeps a coordinates node group, or none.
+            group = getattr(node, "node_tree", None)
+            marked = node is not None and node.bl_idname in (plan.node_types[plan.output], 'ShaderNodeGroup') \
+                and node.get(GROUP_TYPE_PROP) == template.coord_type
+            if node is not None and (graph.fingerprints[idx] in known | {inserted} or marked) \
+                    and (group is None or group.get(GROUP_TYPE_PROP) == template.coord_type):
+                return idx, set(names)
+            self.unindex_nodes(node_tree, template)
+
+        for idx, fingerprint in enumerate(graph.fingerprints):
+            if fingerprint in known:
+                return idx, None
+        return None, None
+
+    # Keep the names of the inserted nodes in the node tree, the output node first, and its fingerprint
+    def index_nodes(self, node_tree, template, names, fingerprint):
+        for prop, value in [(INDEX_PROP, names), (INDEX_FINGERPRINT_PROP, fingerprint)]:
+            if node_tree.get(prop) is None:
+                node_tree[prop] = {}
+            node_tree[prop][template.coord_type] = value
+
+    # Drop a stale index entry
+    def unindex_nodes(self, node_tree, template):
+        for prop in [INDEX_PROP, INDEX_FINGERPRINT_PROP]:
+            index = node_tree.get(prop)
+            if index is not None and template.coord_type in index:
+                del index[template.coord_type]
+
+    # Insert a template into a node tree once: reuse the same nodes, replace older or edited ones in place
+    def insert_template(self, node_tree, template, plan, group):
+        # Group nodes follow their node group
+        if group is not None:
+            for node in node_tree.nodes:
+                if node.bl_idname == 'ShaderNodeGroup' and node.node_tree is not None \
+                        and node.node_tree.get(GROUP_TYPE_PROP) == template.coord_type:
+                    return 'REUSED'
+
+        graph = TreeGraph(node_tree)
+        output_idx, names = self.find_nodes(graph, node_tree, template, plan)
+        location = (0, 0)
+        outgoing = []
+        result = 'ADDED'
+        if output_idx is not None:
+            if group is None and graph.fingerprints[output_idx] == plan.fingerprint:
+                if names is None:
+                    subgraph = graph.subgraph(output_idx)
+                    others = [graph.nodes[idx].name for idx in subgraph if idx != output_idx]
+                    self.index_nodes(node_tree, template, [graph.nodes[output_idx].name] + others, plan.fingerprint)
+                    graph.nodes[output_idx][GROUP_TYPE_PROP] = template.coord_type
+                return 'REUSED'
+
+            # Another template version or optimize setting, or edited: only inserted nodes are removed
+            subgraph = graph.subgraph(output_idx)
+            if names is not None:
+                subgraph = {idx for idx in subgraph if graph.nodes[idx].name in names}
+            outgoing = graph.outgoing(output_idx, subgraph)
+            output_location = graph.nodes[output_idx].location
+            location = (output_location[0] - plan.locations[plan.output][0], output_location[1] - plan.locations[plan.output][1])
+            for idx in subgraph:
+                node_tree.nodes.remove(graph.nodes[idx])
+            result = 'UPDATED'
+
+        if group is not None:
+            output = self.add_group_node(node_tree, group, (location[0] + plan.locations[plan.output][0], location[1] + plan.locations[plan.output][1]))
+            names = [output.name]
+            fingerprint = node_fingerprint(output.bl_idname, None, [])
+        else:
+            nodes = add_nodes(node_tree, plan, location, self.settings.NodeCoordinates_bulk)
+            output = nodes[plan.output]
+            output.label = f"{template.label} Coordinates"
+            names = [output.name] + [node.name for node in nodes if node is not output]
+            fingerprint = plan.fingerprint
+
+        # Links from the old output go on from the new one
+        for _, to_node, to_socket in outgoing:
+            node_tree.links.new(output.outputs[GROUP_OUTPUT[1]], to_node.inputs[to_socket])
+        output[GROUP_TYPE_PROP] = template.coord_type
+        self.index_nodes(node_tree, template, names, fingerprint)
+        return result
+
+    # Objects of the target
+    def target_objects(self, context):
+        if self.settings.NodeCoordinates_target == 'ALL':
+            return list(bpy.data.objects)
+        if self.settings.NodeCoordinates_target == 'SELECTED':
+            return list(context.selected_objects)
+        return [context.active_object] if context.active_object else []
+
+    # Each material once even if shared by objects
+    def unique_materials(self, materials):
+        unique = {}
+        for material in materials:
+            # Library materials can not be edited
+            if material is None or material.node_tree is None or material.library is not None:
+                continue
+            unique.setdefault(material.name, material)
+        return list(unique.values())
+
+    # Materials to add the nodes
+    def target_materials(self, context):
+        if self.settings.NodeCoordinates_target == 'ALL':
+            return self.unique_materials(bpy.data.materials)
+        if self.settings.NodeCoordinates_target == 'SELECTED':
+            return self.unique_materials(slot.material for obj in context.selected_objects for slot in obj.material_slots)
+        obj = context.active_object
+        return self.unique_materials([obj.active_material] if obj else [])
+
+    # Bake the coordinates of the vertices into a float color point attribute
+    def bake_mesh(self, mesh, coord_type, name):
+        count = len(mesh.vertices)
+        points = np.empty(count * 3, dtype = np.float32)
+        mesh.vertices.foreach_get("co", points)
+
+        settings = self.settings
+        mapping_in = (settings.NodeCoordinates_in_location, settings.NodeCoordinates_in_rotation, settings.NodeCoordinates_in_scale)
+        mapping_out = (settings.NodeCoordinates_out_location, settings.NodeCoordinates_out_rotation, settings.NodeCoordinates_out_scale)
+        colors = np.ones((count, 4), dtype = np.float32)
+        colors[:, :3] = bake_coordinates(points.reshape(-1, 3), coord_type, mapping_in, mapping_out)
+
+        attribute = mesh.attributes.get(name)
+        if attribute is not None and (attribute.data_type != 'FLOAT_COLOR' or attribute.domain != 'POINT'):
+            mesh.attributes.remove(attribute)
+            attribute = None
+        if attribute is None:
+            attribute = mesh.attributes.new(name, 'FLOAT_COLOR', 'POINT')
+        attribute.data.foreach_set("color", colors.ravel())
+        mesh.update()
+        return count
+
+    # Add an Attribute node reading the baked attribute
+    def add_attribute_node(self, node_tree, label, name):
+        for node in node_tree.nodes:
+            if node.bl_idname == 'ShaderNodeAttribute' and node.attribute_name == name:
+                return False
+        attribute_node = node_tree.nodes.new("ShaderNodeAttribute")
+        attribute_node.attribute_type = 'GEOMETRY'
+        attribute_node.attribute_name = name
+        attribute_node.label = f"{label} Coordinates"
+        attribute_node.location = (0, 0)
+        return True
+
+    # Bake the meshes of the target objects, an Attribute node to their materials
+    def bake(self, context, template):
+        coord_type, label = template.coord_type, template.label
+        if np is None:
+            self.report({'ERROR'}, "Bake needs NumPy")
+            return {'CANCELLED'}
+        if coord_type not in COORDINATES_FUNCTIONS:
+            self.report({'ERROR'}, f"{label} has no bake function")
+            return {'CANCELLED'}
+
+        objs = [obj for obj in self.target_objects(context) if obj is not None and obj.type == 'MESH']
+        meshes = {}
+        for obj in objs:
+            if obj.data.library is None:
+                meshes.setdefault(obj.data.name, obj.data)
+        if len(meshes) == 0:
+            self.report({'WARNING'}, "No meshes to bake")
+            return {'CANCELLED'}
+
+        name = self.settings.NodeCoordinates_attribute or f"coordinates_{coord_type.lower()}"
+        start = time.perf_counter()
+        vertices = sum(self.bake_mesh(mesh, coord_type, name) for mesh in meshes.values())
+        elapsed = time.perf_counter() - start
+
+        materials = self.unique_materials(slot.material for obj in objs for slot in obj.material_slots)
+        added = sum(1 for material in materials if self.add_attribute_node(material.node_tree, label, name))
+
+        self.report({'INFO'}, f"{label}: {vertices} vertices of {len(meshes)} meshes baked to '{name}' in "
+                    f"{elapsed:.3f} sec, {added} Attribute nodes added")
+        return {'FINISHED'}
 
     # Execute class function
     def execute(self, context):
-        # Get an active material object
-        obj = bpy.context.active_object
-        if obj and obj.active_material:
-
-            # Get a current node tree of a current material on the current shader editor
-            node_tree = obj.active_material.node_tree
-            
-            # Add nodes to the node tree
-            scene = context.scene
-            
-            # Cylindrical coordinates
-            if scene.NodeCoordinates_type_prop_enum == 'CYLINDRICAL':
-                self.add_nodes(node_tree, self.node_list_cylindrical, self.link_list_cylindrical)
-
-            # Polar coordinates
-            elif scene.NodeCoordinates_type_prop_enum == 'POLAR':
-                self.add_nodes(node_tree, self.node_list_polar, self.link_list_polar)
+        self.settings = context.scene.NodeCoordinates_settings
+        template = coordinates_templates.get(self.settings.NodeCoordinates_type_prop_enum)
+        if template is None:
+            self.report({'ERROR'}, f"Unknown coordinates type: {self.settings.NodeCoordinates_type_prop_enum}")
+            return {'CANCELLED'}
+        label = template.label
+
+        # Baked attribute instead of the nodes
+        if self.settings.NodeCoordinates_mode == 'BAKE':
+            return self.bake(context, template)
+
+        materials = self.target_materials(context)
+        if len(materials) == 0:
+            self.report({'WARNING'}, "No materials to add the nodes")
+            return {'CANCELLED'}
+
+        # Template plan and node group once for all materials
+        plan = self.template_plan(template)
+        group = None
+        if self.settings.NodeCoordinates_use_node_group:
+            group = self.get_node_group(template, plan)
+
+        # All materials in this operator, one undo step
+        start = time.perf_counter()
+        timings = []
+        results = {'ADDED': 0, 'UPDATED': 0, 'REUSED': 0}
+        for material in materials:
+            material_start = time.perf_counter()
+            result = self.insert_template(material.node_tree, template, plan, group)
+            results[result] += 1
+            if result != 'REUSED':
+                timings.append((material.name, time.perf_counter() - material_start))
+        elapsed = time.perf_counter() - start
+
+        message = f"{label}: {results['ADDED']} added, {results['UPDATED']} updated, {results['REUSED']} reused, {elapsed * 1000:.1f} ms"
+        if len(timings) > 0:
+            name, seconds = max(timings, key = lambda timing: timing[1])
+            message += f" ({elapsed * 1000 / len(timings):.2f} ms/material, slowest {name} {seconds * 1000:.2f} ms)"
+        self.report({'INFO'}, message)
+
+        # Cost of the inserted subgraph, the same in a node group or in the material
+        cost = dict(plan.cost, optimize = self.settings.NodeCoordinates_optimize, node_group = group is not None)
+        cost_results[template.coord_type] = cost
+        self.report({'INFO'}, f"{label}: {cost['nodes']} nodes, {cost['math_ops']} math ops, "
+                    f"~{cost['svm_instructions']} SVM instructions, estimated cost {cost['estimated_cost']}")
+        return {'FINISHED'}
+
+# Operator class: render time of a small Cycles CPU scene with and without the coordinates nodes
+class NODE_OT_CoordinatesCostTiming(bpy.types.Operator):
+    # Operator information
+    bl_idname = "nodetree.coordinatescosttiming"
+    bl_label = "Measure coordinates render cost"
+    bl_desicription = "Render a small Cycles CPU scene with and without the coordinates nodes"
+    bl_options = {"REGISTER"}
+
+    NodeCoordinates_samples : IntProperty(
+        name="Samples",
+        description="Samples per pixel",
+        default=16, min=1, max=4096
+    )
+    NodeCoordinates_resolution : IntProperty(
+        name="Resolution",
+        description="Width and height of the render",
+        default=64, min=4, max=1024
+    )
+    NodeCoordinates_repeat : IntProperty(
+        name="Repeat",
+        description="Renders of each material, the best one is kept",
+        default=3, min=2, max=20
+    )
+
+    # Temporary scene: an orthographic camera over a quad with an emission material
+    def build_scene(self, ids):
+        scene = bpy.data.scenes.new("Coordinates Cost")
+        ids.append(scene)
+        scene.render.engine = 'CYCLES'
+        scene.cycles.device = 'CPU'
+        scene.cycles.samples = self.NodeCoordinates_samples
+        scene.cycles.use_adaptive_sampling = False
+        scene.cycles.use_denoising = False
+        scene.render.resolution_x = self.NodeCoordinates_resolution
+        scene.render.resolution_y = self.NodeCoordinates_resolution
+        scene.render.resolution_percentage = 100
+
+        mesh = bpy.data.meshes.new("Coordinates Cost")
+        ids.append(mesh)
+        mesh.from_pydata([(-1, -1, 0), (1, -1, 0), (1, 1, 0), (-1, 1, 0)], [], [(0, 1, 2, 3)])
+        obj = bpy.data.objects.new("Coordinates Cost", mesh)
+        ids.append(obj)
+        scene.collection.objects.link(obj)
+
+        camera_data = bpy.data.cameras.new("Coordinates Cost")
+        ids.append(camera_data)
+        camera_data.type = 'ORTHO'
+        camera_data.ortho_scale = 2.0
+        camera = bpy.data.objects.new("Coordinates Cost Camera", camera_data)
+        ids.append(camera)
+        camera.location = (0.0, 0.0, 2.0)
+        scene.collection.objects.link(camera)
+        scene.camera = camera
+
+        material = bpy.data.materials.new("Coordinates Cost")
+        ids.append(material)
+        material.use_nodes = True
+        mesh.materials.append(material)
+
+        node_tree = material.node_tree
+        node_tree.nodes.clear()
+        emission = node_tree.nodes.new("ShaderNodeEmission")
+        output = node_tree.nodes.new("ShaderNodeOutputMaterial")
+        output.location = (NODE_SPACING, 0)
+        node_tree.links.new(emission.outputs[0], output.inputs[0])
+        return scene, node_tree, emission
+
+    # Render the scene several times: first render (with the shader compile) and best render
+    def render_times(self, scene):
+        times = []
+        for _ in range(self.NodeCoordinates_repeat):
+            start = time.perf_counter()
+            bpy.ops.render.render(write_still = False, scene = scene.name)
+            times.append(time.perf_counter() - start)
+        return {"first_seconds": times[0], "best_seconds": min(times), "seconds": times}
+
+    # Execute class function, the type and optimize setting of the scene
+    def execute(self, context):
+        settings = context.scene.NodeCoordinates_settings
+        template = coordinates_templates.get(settings.NodeCoordinates_type_prop_enum)
+        if template is None:
+            self.report({'ERROR'}, f"Unknown coordinates type: {settings.NodeCoordinates_type_prop_enum}")
+            return {'CANCELLED'}
+        plan = template.plans[settings.NodeCoordinates_optimize]
+
+        ids = []
+        try:
+            scene, node_tree, emission = self.build_scene(ids)
+            without = self.render_times(scene)
 
+            # The coordinates drive the emission color, unlinked nodes would be removed by Cycles
+            nodes = add_nodes_bulk(node_tree, plan, (-(plan.max_x + 1) * NODE_SPACING, 0))
+            node_tree.links.new(nodes[plan.output].outputs[GROUP_OUTPUT[1]], emission.inputs[0])
+            with_nodes = self.render_times(scene)
+        except (RuntimeError, AttributeError) as e:
+            self.report({'ERROR'}, f"Render failed: {e}")
+            return {'CANCELLED'}
+        finally:
+            bpy.data.batch_remove(ids)
+
+        # Compile time: the first render over the best one, more than without the nodes
+        samples = self.NodeCoordinates_resolution ** 2 * self.NodeCoordinates_samples
+        compile_seconds = (with_nodes["first_seconds"] - with_nodes["best_seconds"]) \
+            - (without["first_seconds"] - without["best_seconds"])
+        sample_seconds = with_nodes["best_seconds"] - without["best_seconds"]
+        result = {
+            "optimize": settings.NodeCoordinates_optimize,
+            "samples": self.NodeCoordinates_samples,
+            "resolution": self.NodeCoordinates_resolution,
+            "without": without,
+            "with": with_nodes,
+            "compile_seconds": max(compile_seconds, 0.0),
+            "sample_ns": max(sample_seconds, 0.0) / samples * 1e9,
+            "cost": plan.cost,
+        }
+        timing_results[template.coord_type] = result
+        self.report({'INFO'}, f"{template.label}: render {without['best_seconds'] * 1000:.1f} -> "
+                    f"{with_nodes['best_seconds'] * 1000:.1f} ms, compile {result['compile_seconds'] * 1000:.1f} ms, "
+                    f"{result['sample_ns']:.2f} ns/sample")
         return {'FINISHED'}
 
+# Operator class: export the costs and the render timings as JSON
+class NODE_OT_CoordinatesCostExport(bpy.types.Operator, ExportHelper):
+    # Operator information
+    bl_idname = "nodetree.coordinatescostexport"
+    bl_label = "Export coordinates cost"
+    bl_desicription = "Export the costs of the coordinates templates and the render timings as JSON"
+    bl_options = {"REGISTER"}
+
+    filename_ext = ".json"
+    filter_glob : StringProperty(default="*.json", options={'HIDDEN'})
+
+    # Execute class function
+    def execute(self, context):
+        data = {
+            "version": list(bl_info["version"]),
+            "template_version": TEMPLATE_VERSION,
+            "templates": {
+                coord_type: {
+                    "label": template.label,
+                    "original": template.plans[False].cost,
+                    "optimized": dict(template.plans[True].cost, stats = template.plans[True].stats),
+                }
+                for coord_type, template in coordinates_templates.items()
+            },
+            "inserted": cost_results,
+            "timings": timing_results,
+        }
+        try:
+            with open(self.filepath, "w", encoding = "utf-8") as f:
+                json.dump(data, f, indent = 2)
+        except OSError as e:
+            self.report({'ERROR'}, f"Export failed: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Coordinates cost exported to {self.filepath}")
+        return {'FINISHED'}
+
+# Presets of the settings
+class NODE_MT_CoordinatesPresets(bpy.types.Menu):
+    bl_label = "Coordinates Presets"
+    preset_subdir = "shader_add_coordinates"
+    preset_operator = "script.execute_preset"
+    draw = bpy.types.Menu.draw_preset
+
+class NODE_OT_CoordinatesAddPreset(AddPresetBase, bpy.types.Operator):
+    bl_idname = "nodetree.coordinates_preset_add"
+    bl_label = "Add Coordinates Preset"
+    bl_description = "Add or remove a preset of the coordinates settings"
+    preset_menu = "NODE_MT_CoordinatesPresets"
+    preset_subdir = "shader_add_coordinates"
+    preset_defines = ["settings = bpy.context.scene.NodeCoordinates_settings"]
+    preset_values = [f"settings.{name}" for name in PRESET_SETTINGS]
+
 # Addon classes
 classes = (
+    NodeCoordinatesSettings,
+    NODE_MT_CoordinatesPresets,
+    NODE_OT_CoordinatesAddPreset,
     NodeCoordinatesNoePanel,
     NODE_OT_CoordinatesNodes,
+    NODE_OT_CoordinatesCostTiming,
+    NODE_OT_CoordinatesCostExport,
 )
 
 # Create properties
 def create_props():
-    scene = bpy.types.Scene
-
-    # Dropdown list items definition for coordinates type
-    scene.NodeCoordinates_type_prop_enum = EnumProperty(
-        name =" Types",
-        description = "Enum Property",
-        items = [
-            # 'Get value', 'Show value', 'Description value'
-            ('CYLINDRICAL', "Cylindrical", "Cylindrical Coordinates"),
-            ('POLAR', "Polar", "Polar Coordinates"),
-        ],
-        default = 'CYLINDRICAL'
-    )
+    bpy.types.Scene.NodeCoordinates_settings = PointerProperty(type=NodeCoordinatesSettings)
 
 # Delete properties
 def delete_props():
-    scene = bpy.types.Scene
-    del scene.NodeCoordinates_type_prop_enum
+    del bpy.types.Scene.NodeCoordinates_settings
 
 # Register the addon classes to Blender
 def register():
+    # Templates compiled once, before the enums read them
+    load_templates()
+
     for cls in classes:
         bpy.utils.register_class(cls)
 
@@ -0,0 +1,251 @@
+##############################################################
+# Benchmark of the node construction of shader_add_coordinates.py
+#   Blender Version: 4.3.2
+#   Functions:
+#     - Tile the templates of the registry to hundreds or thousands of
+#       nodes and time the per-node path (add_nodes_each) against the
+#       bulk path (add_nodes_bulk), in a node group and a material.
+#     - Report nodes/sec and the speedup as JSON.
+#     - Runs in background Blender, or in plain Python with a lightweight
+#       bpy stand-in (times the addon's Python side only, the stand-in
+#       has no real RNA cost and no tree updates).
+#   Author: Shunsuke Ohira
+#   License: GPLv2
+#   Usage:
+#     blender --background --factory-startup --python shader_coordinates_bench.py -- \
+#         --copies 1 10 50 --output bench.json
+#     python shader_coordinates_bench.py --copies 1 10 50
+##############################################################
+import argparse, json, os, sys, time, types
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_COPIES = [1, 10, 50]
+PATHS = ["EACH", "BULK"]
+
+### LIGHTWEIGHT BPY STAND-IN ###
+# Property definitions return their default value
+def stand_in_property(*args, **kwargs):
+    return kwargs.get("default")
+
+# Base of operators and panels: annotations become class attributes
+class StandInStruct:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for base in reversed(cls.__mro__):
+            for name, value in base.__dict__.get("__annotations__", {}).items():
+                setattr(cls, name, value)
+
+    def report(self, level, message):
+        self.reports = getattr(self, "reports", []) + [(level, message)]
+
+class StandInSocket:
+    def __init__(self, node):
+        self.node = node
+        self.default_value = None
+
+class StandInNode:
+    def __init__(self, node_type):
+        self.bl_idname = node_type
+        self.name = node_type
+        self.location = (0.0, 0.0)
+        self.operation = None
+        self.inputs = [StandInSocket(self) for _ in range(4)]
+        self.outputs = [StandInSocket(self) for _ in range(4)]
+
+class StandInNodes(list):
+    def new(self, node_type):
+        node = StandInNode(node_type)
+        self.append(node)
+        return node
+
+    def foreach_get(self, name, buffer):
+        buffer[:] = [value for node in self for value in getattr(node, name)]
+
+    def foreach_set(self, name, buffer):
+        for idx, node in enumerate(self):
+            setattr(node, name, (buffer[idx * 2], buffer[idx * 2 + 1]))
+
+# Links replace the link of the same input when the limits are verified
+class StandInLinks(list):
+    def new(self, output, input, verify_limits = True):
+        if verify_limits:
+            self[:] = [link for link in self if link[1] is not input]
+        self.append((output, input))
+        return self[-1]
+
+class StandInTree:
+    def __init__(self):
+        self.nodes = StandInNodes()
+        self.links = StandInLinks()
+
+    def update_tag(self):
+        pass
+
+# Install the stand-in as bpy, bpy_extras and bl_operators
+def install_stand_in():
+    modules = {name: types.ModuleType(name) for name in ["bpy", "bpy.props", "bpy.types", "bpy.app", "bpy.app.handlers",
+                                                         "bpy_extras", "bpy_extras.io_utils", "bl_operators", "bl_operators.presets"]}
+    for name in ["BoolProperty", "IntProperty", "FloatProperty", "FloatVectorProperty", "EnumProperty",
+                 "StringProperty", "PointerProperty", "CollectionProperty"]:
+        setattr(modules["bpy.props"], name, stand_in_property)
+    for name in ["Operator", "Panel", "Menu", "PropertyGroup", "UIList"]:
+        setattr(modules["bpy.types"], name, type(name, (StandInStruct,), {}))
+    modules["bpy.types"].Menu.draw_preset = lambda self, context: None
+    modules["bpy.types"].Scene = type("Scene", (), {})
+    modules["bpy.app.handlers"].persistent = lambda func: func
+    for name in ["load_post", "depsgraph_update_post"]:
+        setattr(modules["bpy.app.handlers"], name, [])
+    modules["bpy.app"].handlers = modules["bpy.app.handlers"]
+    for name in ["ExportHelper", "ImportHelper"]:
+        setattr(modules["bpy_extras.io_utils"], name, type(name, (), {}))
+    modules["bpy_extras"].io_utils = modules["bpy_extras.io_utils"]
+    modules["bl_operators.presets"].AddPresetBase = type("AddPresetBase", (), {})
+    modules["bl_operators"].presets = modules["bl_operators.presets"]
+
+    bpy = modules["bpy"]
+    bpy.props = modules["bpy.props"]
+    bpy.types = modules["bpy.types"]
+    bpy.app = modules["bpy.app"]
+    bpy.data = types.SimpleNamespace(node_groups = [], materials = [], objects = [])
+    bpy.context = types.SimpleNamespace()
+    sys.modules.update(modules)
+    return bpy
+
+### TARGETS ###
+class StandInTarget:
+    names = ["GROUP"]
+
+    def __init__(self, bpy):
+        self.bpy = bpy
+
+    def new_tree(self, name):
+        return StandInTree()
+
+    def remove_tree(self, name, node_tree):
+        pass
+
+# A new node group or material for each run, removed afterwards
+class BlenderTarget:
+    names = ["GROUP", "MATERIAL"]
+
+    def __init__(self, bpy):
+        self.bpy = bpy
+
+    def new_tree(self, name):
+        if name == "GROUP":
+            return self.bpy.data.node_groups.new("Coordinates Bench", 'ShaderNodeTree')
+        self.material = self.bpy.data.materials.new("Coordinates Bench")
+        self.material.use_nodes = True
+        return self.material.node_tree
+
+    def remove_tree(self, name, node_tree):
+        if name == "GROUP":
+            self.bpy.data.node_groups.remove(node_tree)
+        else:
+            self.bpy.data.materials.remove(self.material)
+
+### BENCHMARK ###
+# Plan of copies of a template side by side, hundreds of nodes like the generated templates
+def tiled_plan(module, template, optimize, copies):
+    plan = template.plans[optimize]
+    height = max(node_data["Location"][1] for node_data in plan.node_list) \
+        - min(node_data["Location"][1] for node_data in plan.node_list) + 2
+    node_list = []
+    link_list = []
+    for copy in range(copies):
+        # The first copy keeps the IDs, its MappingOut is the output of the plan
+        suffix = f".{copy}" if copy > 0 else ""
+        for node_data in plan.node_list:
+            node_data = dict(node_data, ID = node_data["ID"] + suffix)
+            node_data["Location"] = [node_data["Location"][0], node_data["Location"][1] - copy * height]
+            node_list.append(node_data)
+        for linker in plan.link_list:
+            link_list.append({
+                "From": [linker["From"][0] + suffix, linker["From"][1]],
+                "To": [linker["To"][0] + suffix, linker["To"][1]],
+            })
+    return module.TemplatePlan(template.coord_type, node_list, link_list)
+
+# Best time of some runs of one construction path into new node trees
+def bench_path(target, module, plan, target_name, path, repeat):
+    add_nodes = module.add_nodes_bulk if path == "BULK" else module.add_nodes_each
+    times = []
+    for _ in range(repeat):
+        node_tree = target.new_tree(target_name)
+        start = time.perf_counter()
+        add_nodes(node_tree, plan)
+        times.append(time.perf_counter() - start)
+        target.remove_tree(target_name, node_tree)
+    return min(times)
+
+def parse_args(argv):
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = argv[1:] if "bpy" not in sys.modules else []
+
+    parser = argparse.ArgumentParser(description = "Benchmark of the node construction of shader_add_coordinates.py")
+    parser.add_argument("--copies", type = int, nargs = "*", default = DEFAULT_COPIES)
+    parser.add_argument("--types", nargs = "*", help = "coordinates types (default: all)")
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--stand-in", action = "store_true", help = "use the bpy stand-in in Blender too")
+    parser.add_argument("--output", help = "JSON file (default: stdout)")
+    return parser.parse_args(argv)
+
+def main():
+    try:
+        import bpy
+        in_blender = hasattr(bpy, "ops")
+    except ImportError:
+        in_blender = False
+
+    args = parse_args(sys.argv)
+    if not in_blender or args.stand_in:
+        for name in [name for name in sys.modules if name.split(".")[0] in ("bpy", "bpy_extras", "bl_operators")]:
+            del sys.modules[name]
+        target = StandInTarget(install_stand_in())
+    else:
+        target = BlenderTarget(bpy)
+
+    sys.path.insert(0, SCRIPT_DIR)
+    import shader_add_coordinates as module
+    templates = module.load_templates()
+
+    results = []
+    for coord_type, template in templates.items():
+        if args.types and coord_type not in args.types:
+            continue
+        for copies in args.copies:
+            plan = tiled_plan(module, template, True, copies)
+            for target_name in target.names:
+                seconds = {path: bench_path(target, module, plan, target_name, path, args.repeat) for path in PATHS}
+                nodes = len(plan.node_types)
+                results.append({
+                    "type": coord_type,
+                    "target": target_name,
+                    "nodes": nodes,
+                    "links": len(plan.links),
+                    "each_seconds": seconds["EACH"],
+                    "bulk_seconds": seconds["BULK"],
+                    "each_nodes_per_sec": nodes / seconds["EACH"] if seconds["EACH"] > 0 else None,
+                    "bulk_nodes_per_sec": nodes / seconds["BULK"] if seconds["BULK"] > 0 else None,
+                    "speedup": seconds["EACH"] / seconds["BULK"] if seconds["BULK"] > 0 else None,
+                })
+                print(f"{coord_type:>12} {target_name:>8} {nodes:>6} nodes: each {seconds['EACH'] * 1000:.2f} ms, "
+                      f"bulk {seconds['BULK'] * 1000:.2f} ms", file = sys.stderr)
+
+    report = {
+        "addon_version": list(module.bl_info["version"]),
+        "backend": "blender" if isinstance(target, BlenderTarget) else "stand-in",
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    text = json.dumps(report, indent = 2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+##############################################################
+# Reference evaluator of shader_add_coordinates.py templates
+#   Blender Version: 4.3.2
+#   Functions:
+#     - Evaluate the node_list_* / link_list_* templates with NumPy over
+#       millions of points, math nodes as Blender SVM does (safe divide,
+#       safe sqrt, clamped arccosine, ...).
+#     - Compare the original and the compiled templates of the registry
+#       (built-in and JSON) with the closed form coordinates, edge cases (x = y = 0, the negative X axis, the
+#       origin) included.
+#     - Compile the built-in templates with every math node duplicated and
+#       check that the copies are merged back, also with a vector default value.
+#     - Time the templates (points/sec) as a benchmark of the optimizer.
+#     - No Blender needed, a minimal bpy stand-in is installed.
+#   Author: Shunsuke Ohira
+#   License: GPLv2
+#   Usage:
+#     python shader_coordinates_eval.py --points 1000000 --output eval.json
+##############################################################
+import argparse, json, os, sys, time, types
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Tolerance of float32 evaluation (acos near +-1 loses about sqrt(eps))
+ATOL = 2e-3
+
+# Points on the edges of the coordinates, compared one by one
+EDGE_POINTS = [
+    ("origin",          (0.0, 0.0, 0.0)),
+    ("z axis",          (0.0, 0.0, 1.5)),
+    ("negative z axis", (0.0, 0.0, -1.5)),
+    ("positive x axis", (2.0, 0.0, 0.5)),
+    ("negative x axis", (-2.0, 0.0, 0.5)),
+    ("positive y axis", (0.0, 2.0, -0.5)),
+    ("negative y axis", (0.0, -2.0, -0.5)),
+    ("tiny x, y",       (1e-20, -1e-20, 1.0)),
+]
+
+### MINIMAL BPY STAND-IN ###
+# Property definitions return their default value
+def stand_in_property(*args, **kwargs):
+    return kwargs.get("default")
+
+# Install bpy, bpy.props, bpy.types, bpy.app.handlers, bpy_extras and bl_operators enough to import the addon
+def install_stand_in():
+    modules = {name: types.ModuleType(name) for name in ["bpy", "bpy.props", "bpy.types", "bpy.app", "bpy.app.handlers",
+                                                         "bpy_extras", "bpy_extras.io_utils", "bl_operators", "bl_operators.presets"]}
+    for name in ["BoolProperty", "IntProperty", "FloatProperty", "FloatVectorProperty", "EnumProperty",
+                 "StringProperty", "PointerProperty", "CollectionProperty"]:
+        setattr(modules["bpy.props"], name, stand_in_property)
+    for name in ["Operator", "Panel", "Menu", "PropertyGroup", "UIList", "Scene"]:
+        setattr(modules["bpy.types"], name, type(name, (), {}))
+    modules["bpy.types"].Menu.draw_preset = lambda self, context: None
+    modules["bpy.app.handlers"].persistent = lambda func: func
+    for name in ["load_post", "depsgraph_update_post"]:
+        setattr(modules["bpy.app.handlers"], name, [])
+    modules["bpy.app"].handlers = modules["bpy.app.handlers"]
+    for name in ["ExportHelper", "ImportHelper"]:
+        setattr(modules["bpy_extras.io_utils"], name, type(name, (), {}))
+    modules["bpy_extras"].io_utils = modules["bpy_extras.io_utils"]
+    modules["bl_operators.presets"].AddPresetBase = type("AddPresetBase", (), {})
+    modules["bl_operators"].presets = modules["bl_operators.presets"]
+
+    bpy = modules["bpy"]
+    bpy.props = modules["bpy.props"]
+    bpy.types = modules["bpy.types"]
+    bpy.app = modules["bpy.app"]
+    bpy.data = types.SimpleNamespace(node_groups = [], materials = [], objects = [])
+    bpy.context = types.SimpleNamespace()
+    sys.modules.update(modules)
+    return bpy
+
+### NODE SEMANTICS ###
+def safe_divide(a, b):
+    return np.divide(a, b, out = np.zeros_like(a), where = b != 0)
+
+def safe_sqrt(a):
+    return np.sqrt(np.maximum(a, 0))
+
+# Blender safe_powf: 0 for a negative base with a fractional exponent
+def safe_power(a, b):
+    valid = (a >= 0) | (b == np.floor(b))
+    with np.errstate(all = "ignore"):
+        return np.where(valid, np.power(np.where(valid, a, 1), b), 0).astype(a.dtype)
+
+# Blender safe_logf: 0 unless both are positive
+def safe_log(a, b):
+    valid = (a > 0) & (b > 0) & (b != 1)
+    with np.errstate(all = "ignore"):
+        return np.where(valid, np.log(np.where(valid, a, 1)) / np.log(np.where(valid, b, 2)), 0).astype(a.dtype)
+
+# Math node operations on the first two inputs
+MATH_OPERATIONS = {
+    "ADD":         lambda a, b: a + b,
+    "SUBTRACT":    lambda a, b: a - b,
+    "MULTIPLY":    lambda a, b: a * b,
+    "DIVIDE":      safe_divide,
+    "POWER":       safe_power,
+    "LOGARITHM":   safe_log,
+    "SQRT":        lambda a, b: safe_sqrt(a),
+    "ABSOLUTE":    lambda a, b: np.abs(a),
+    "MINIMUM":     np.minimum,
+    "MAXIMUM":     np.maximum,
+    "SIGN":        lambda a, b: np.sign(a),
+    "SINE":        lambda a, b: np.sin(a),
+    "COSINE":      lambda a, b: np.cos(a),
+    "TANGENT":     lambda a, b: np.tan(a),
+    "ARCSINE":     lambda a, b: np.arcsin(np.clip(a, -1, 1)),
+    "ARCCOSINE":   lambda a, b: np.arccos(np.clip(a, -1, 1)),
+    "ARCTANGENT":  lambda a, b: np.arctan(a),
+    "ARCTAN2":     np.arctan2,
+}
+
+# Vector math node operations: (vector output, value output)
+VECTOR_MATH_OPERATIONS = {
+    "ADD":         lambda a, b: (a + b, None),
+    "SUBTRACT":    lambda a, b: (a - b, None),
+    "MULTIPLY":    lambda a, b: (a * b, None),
+    "LENGTH":      lambda a, b: (None, np.sqrt(np.sum(a * a, axis = 1))),
+    "DOT_PRODUCT": lambda a, b: (None, np.sum(a * b, axis = 1)),
+    "NORMALIZE":   lambda a, b: (safe_divide(a, np.sqrt(np.sum(a * a, axis = 1, keepdims = True))), None),
+}
+
+### EVALUATOR ###
+class TemplateEvaluator:
+    # Texture Coordinate outputs are given by output index, 3 (Object) by default
+    def __init__(self, module, node_list, link_list, mappings = None):
+        self.module = module
+        self.nodes = {node_data["ID"]: node_data for node_data in node_list}
+        self.sources = {node_id: {} for node_id in self.nodes}
+        for linker in link_list:
+            from_id, from_idx = linker["From"]
+            to_id, to_idx = linker["To"]
+            # Links to unknown nodes are not created by the addon either
+            if from_id in self.nodes and to_id in self.nodes:
+                self.sources[to_id][to_idx] = (from_id, from_idx)
+        self.mappings = mappings or {}
+
+    # Value of an input: linked output or default value
+    def input(self, node_id, idx, default, n):
+        if idx in self.sources[node_id]:
+            return self.output(*self.sources[node_id][idx])
+        inputs = self.nodes[node_id].get("Inputs", [])
+        value = inputs[idx] if idx < len(inputs) and inputs[idx] is not None else default
+        return np.broadcast_to(np.asarray(value, dtype = np.float32), (n,) + np.shape(value)).copy()
+
+    # Output of a node, evaluated once
+    def output(self, node_id, idx):
+        if (node_id, idx) not in self.values:
+            self.evaluate(node_id)
+        value = self.values.get((node_id, idx))
+        if value is None:
+            raise ValueError(f"Output {idx} of {node_id} has no value")
+        return value
+
+    def evaluate(self, node_id):
+        node_data = self.nodes[node_id]
+        node_type = node_data["Node"]
+        n = self.count
+
+        if node_type == "ShaderNodeTexCoord":
+            for idx, value in self.texture_coordinates.items():
+                self.values[(node_id, idx)] = value
+
+        elif node_type == "ShaderNodeMapping":
+            vector = self.input(node_id, 0, (0.0, 0.0, 0.0), n)
+            location, rotation, scale = self.mappings.get(node_id, ((0, 0, 0), (0, 0, 0), (1, 1, 1)))
+            self.values[(node_id, 0)] = self.module.mapping_point(vector, location, rotation, scale)
+
+        elif node_type == "ShaderNodeSeparateXYZ":
+            vector = self.input(node_id, 0, (0.0, 0.0, 0.0), n)
+            for idx in range(3):
+                self.values[(node_id, idx)] = vector[:, idx]
+
+        elif node_type == "ShaderNodeCombineXYZ":
+            self.values[(node_id, 0)] = np.stack([self.input(node_id, idx, 0.0, n) for idx in range(3)], axis = 1)
+
+        elif node_type == "ShaderNodeMath":
+            a = self.input(node_id, 0, 0.5, n)
+            b = self.input(node_id, 1, 0.5, n)
+            self.values[(node_id, 0)] = MATH_OPERATIONS[node_data["Operation"]](a, b).astype(np.float32)
+
+        elif node_type == "ShaderNodeVectorMath":
+            a = self.input(node_id, 0, (0.0, 0.0, 0.0), n)
+            b = self.input(node_id, 1, (0.0, 0.0, 0.0), n)
+            vector, value = VECTOR_MATH_OPERATIONS[node_data["Operation"]](a, b)
+            self.values[(node_id, 0)] = vector
+            self.values[(node_id, 1)] = value
+
+        else:
+            raise ValueError(f"Unsupported node: {node_type}")
+
+    # (N, 3) output vector of a template for (N, 3) object space points
+    def run(self, points, output = "MappingOut"):
+        self.count = len(points)
+        self.texture_coordinates = {3: points.astype(np.float32)}
+        self.values = {}
+        return self.output(output, 0)
+
+### CHECKS ###
+# Largest difference, angles (first component) also compared across +-pi
+def max_error(values, expected):
+    error = np.abs(values - expected)
+    error[:, 0] = np.minimum(error[:, 0], 2 * np.pi - error[:, 0])
+    return float(np.max(error)) if len(error) > 0 else 0.0
+
+def check_template(module, coord_type, name, node_list, link_list, points, repeat):
+    evaluator = TemplateEvaluator(module, node_list, link_list)
+    expected = module.COORDINATES_FUNCTIONS[coord_type](points)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        values = evaluator.run(points)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    # Edge points one by one
+    edges = []
+    edge_points = np.array([point for _, point in EDGE_POINTS], dtype = np.float32)
+    edge_values = evaluator.run(edge_points)
+    edge_expected = module.COORDINATES_FUNCTIONS[coord_type](edge_points)
+    for (label, point), value, target in zip(EDGE_POINTS, edge_values, edge_expected):
+        error = max_error(value[None], target[None])
+        if error > ATOL:
+            edges.append({"edge": label, "point": point, "value": value.tolist(), "expected": target.tolist()})
+
+    return {
+        "type": coord_type,
+        "template": name,
+        "nodes": len(node_list),
+        "links": len(link_list),
+        "max_error": max_error(values, expected),
+        "edge_mismatches": edges,
+        "seconds": best,
+        "points_per_sec": len(points) / best if best > 0 else None,
+    }
+
+# Template with each math node duplicated, every other link reading the copy
+def duplicated_template(module, data):
+    pure = {node_data["ID"] for node_data in data["Nodes"] if node_data["Node"] in module.PURE_NODES}
+    def copy_id(node_id):
+        return node_id + "'" if node_id in pure else node_id
+
+    nodes = data["Nodes"] + [dict(node_data, ID = copy_id(node_data["ID"])) for node_data in data["Nodes"] if node_data["ID"] in pure]
+    links = []
+    for idx, linker in enumerate(data["Links"]):
+        (from_id, from_idx), (to_id, to_idx) = linker["From"], linker["To"]
+        links.append({"From": [copy_id(from_id) if idx % 2 else from_id, from_idx], "To": [to_id, to_idx]})
+        if to_id in pure:
+            links.append({"From": [copy_id(from_id), from_idx], "To": [copy_id(to_id), to_idx]})
+    return dict(data, Nodes = nodes, Links = links), len(pure)
+
+# Template with a vector math node adding a zero vector (a JSON list default) after MappingIn
+def vector_default_template(data):
+    nodes = data["Nodes"] + [{"ID": "MappingIn+0", "Node": "ShaderNodeVectorMath", "Location": (1, -1),
+                              "Operation": "ADD", "Inputs": [None, [0.0, 0.0, 0.0]]}]
+    links = [{"From": ["MappingIn", 0], "To": ["MappingIn+0", 0]}] + [
+        dict(linker, From = ["MappingIn+0", 0]) if linker["From"] == ["MappingIn", 0] else linker
+        for linker in data["Links"]
+    ]
+    return dict(data, Nodes = nodes, Links = links)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description = "Evaluate shader_add_coordinates.py templates with NumPy")
+    parser.add_argument("--points", type = int, default = 1000000)
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--seed", type = int, default = 1)
+    parser.add_argument("--output", help = "JSON file (default: stdout)")
+    return parser.parse_args(argv[1:])
+
+def main():
+    args = parse_args(sys.argv)
+    if "bpy" not in sys.modules:
+        install_stand_in()
+    sys.path.insert(0, SCRIPT_DIR)
+    import shader_add_coordinates as module
+
+    rng = np.random.default_rng(args.seed)
+    points = rng.normal(size = (args.points, 3)).astype(np.float32)
+    results = []
+    failed = False
+    for coord_type, template in module.load_templates().items():
+        if coord_type not in module.COORDINATES_FUNCTIONS:
+            results.append({"type": coord_type, "skipped": "no closed form"})
+            continue
+
+        # Closed form time for reference
+        start = time.perf_counter()
+        module.COORDINATES_FUNCTIONS[coord_type](points)
+        closed_seconds = time.perf_counter() - start
+
+        for name, optimize in [("original", False), ("compiled", True)]:
+            plan = template.plans[optimize]
+            result = check_template(module, coord_type, name, plan.node_list, plan.link_list, points, args.repeat)
+            result["closed_form_seconds"] = closed_seconds
+            results.append(result)
+
+            # The original SIGN chain gives 0 on the negative X axis, known and only reported
+            failed |= result["max_error"] > ATOL or (name == "compiled" and len(result["edge_mismatches"]) > 0)
+            print(f"{coord_type:>12} {name:>9}: {result['nodes']:>2} nodes, error {result['max_error']:.2e}, "
+                  f"{result['points_per_sec'] / 1e6:.1f} M points/sec", file = sys.stderr)
+
+    # Duplicated subexpressions: the compiled template is the same size as without them
+    variants = [(data, "duplicated", 0) for data in module.BUILTIN_TEMPLATES]
+    variants += [(vector_default_template(data), "vector", 1) for data in module.BUILTIN_TEMPLATES]
+    for data, name, added in variants:
+        coord_type = data["Type"]
+        duplicated, copies = duplicated_template(module, data)
+        plan = module.CoordinatesTemplate(duplicated).plans[True]
+        result = check_template(module, coord_type, name, plan.node_list, plan.link_list, points, args.repeat)
+        result["merged"] = plan.stats["merged"]
+        result["copies"] = copies
+        results.append(result)
+
+        expected_nodes = module.coordinates_templates[coord_type].plans[True].stats["nodes_after"] + added
+        failed |= result["max_error"] > ATOL or len(result["edge_mismatches"]) > 0 \
+            or plan.stats["merged"] < copies or result["nodes"] != expected_nodes
+        print(f"{coord_type:>12} {name:>9}: {result['nodes']:>2} nodes, {plan.stats['merged']} merged, "
+              f"error {result['max_error']:.2e}", file = sys.stderr)
+
+    report = {
+        "addon_version": list(module.bl_info["version"]),
+        "points": args.points,
+        "tolerance": ATOL,
+        "passed": not failed,
+        "results": results,
+    }
+    text = json.dumps(report, indent = 2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+##############################################################
+# Tests of the template compiler of shader_add_coordinates.py
+#   Functions:
+#     - Original and compiled templates against the closed form coordinates
+#       (shader_coordinates_eval.py evaluator), edge cases included.
+#     - Duplicated math nodes merged back, also with a vector default value.
+#     - JSON templates: an unreachable MappingIn and invalid templates.
+#     - No Blender needed, the bpy stand-in of the evaluator is installed.
+#   Usage:
+#     python -m pytest shader
+#     python -m unittest discover -s shader
+##############################################################
+import json, os, sys, tempfile, unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import shader_coordinates_eval as evaluation
+if "bpy" not in sys.modules:
+    evaluation.install_stand_in()
+import shader_add_coordinates as module
+
+# Template of a single Mapping between the texture coordinates and MappingOut, MappingIn linked to nothing
+TEMPLATE_DEAD_INPUT = {
+    "Type": "DEAD_INPUT",
+    "Nodes": [
+        {"ID": "TexCoord",   "Node": "ShaderNodeTexCoord", "Location": (0, 0)},
+        {"ID": "MappingIn",  "Node": "ShaderNodeMapping",  "Location": (1, 1)},
+        {"ID": "MappingOut", "Node": "ShaderNodeMapping",  "Location": (1, 0)},
+    ],
+    "Links": [
+        {"From": ["TexCoord", 3], "To": ["MappingOut", 0]},
+    ],
+}
+
+class TemplateCompilerTest(unittest.TestCase):
+    def setUp(self):
+        self.templates = module.load_templates()
+        self.points = np.random.default_rng(1).normal(size = (1000, 3)).astype(np.float32)
+
+    def tearDown(self):
+        module.load_templates()
+
+    def check(self, coord_type, name, plan, edges = True):
+        result = evaluation.check_template(module, coord_type, name, plan.node_list, plan.link_list, self.points, 1)
+        self.assertLessEqual(result["max_error"], evaluation.ATOL, f"{coord_type} {name}")
+        if edges:
+            self.assertEqual(result["edge_mismatches"], [], f"{coord_type} {name}")
+        return result
+
+    def test_original_and_compiled(self):
+        for coord_type in module.COORDINATES_FUNCTIONS:
+            template = self.templates[coord_type]
+            with self.subTest(coord_type = coord_type):
+                # The original SIGN chain gives 0 on the negative X axis, only the compiled edges are checked
+                self.check(coord_type, "original", template.plans[False], edges = False)
+                self.check(coord_type, "compiled", template.plans[True])
+                self.assertLessEqual(len(template.plans[True].node_list), len(template.plans[False].node_list))
+
+    def test_duplicates_merged(self):
+        for data in module.BUILTIN_TEMPLATES:
+            coord_type = data["Type"]
+            with self.subTest(coord_type = coord_type):
+                duplicated, copies = evaluation.duplicated_template(module, data)
+                plan = module.CoordinatesTemplate(duplicated).plans[True]
+                result = self.check(coord_type, "duplicated", plan)
+                self.assertGreaterEqual(plan.stats["merged"], copies)
+                self.assertEqual(result["nodes"], self.templates[coord_type].plans[True].stats["nodes_after"])
+
+    def test_vector_default_merged(self):
+        for data in module.BUILTIN_TEMPLATES:
+            coord_type = data["Type"]
+            with self.subTest(coord_type = coord_type):
+                duplicated, copies = evaluation.duplicated_template(module, evaluation.vector_default_template(data))
+                plan = module.CoordinatesTemplate(duplicated).plans[True]
+                result = self.check(coord_type, "vector", plan)
+                self.assertGreaterEqual(plan.stats["merged"], copies)
+                self.assertEqual(result["nodes"], self.templates[coord_type].plans[True].stats["nodes_after"] + 1)
+
+    def test_unreachable_group_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "dead_input.json"), "w", encoding = "utf-8") as f:
+                json.dump(TEMPLATE_DEAD_INPUT, f)
+            templates = module.load_templates(directory)
+
+        self.assertIn("DEAD_INPUT", templates)
+        for optimize in [False, True]:
+            node_ids = {node_data["ID"] for node_data in templates["DEAD_INPUT"].plans[optimize].node_list}
+            self.assertIn("MappingIn", node_ids)
+            self.assertIn("MappingOut", node_ids)
+
+    def test_invalid_templates_skipped(self):
+        invalid = [
+            {"Nodes": [], "Links": []},
+            dict(TEMPLATE_DEAD_INPUT, Type = "NO_LOCATION", Nodes = [{"ID": "MappingIn", "Node": "ShaderNodeMapping"}]),
+            dict(TEMPLATE_DEAD_INPUT, Type = "NO_OPERATION",
+                 Nodes = TEMPLATE_DEAD_INPUT["Nodes"] + [{"ID": "Math", "Node": "ShaderNodeMath", "Location": (2, 0)}]),
+            dict(TEMPLATE_DEAD_INPUT, Type = "NO_LINK_END", Links = [{"From": ["TexCoord", 3]}]),
+            "not a template",
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "invalid.json"), "w", encoding = "utf-8") as f:
+                json.dump(invalid, f)
+            with open(os.path.join(directory, "broken.json"), "w", encoding = "utf-8") as f:
+                f.write("{")
+            templates = module.load_templates(directory)
+
+        self.assertEqual(sorted(templates), sorted(data["Type"] for data in module.BUILTIN_TEMPLATES))
+
+if __name__ == "__main__":
+    unittest.main()